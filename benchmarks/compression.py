@@ -0,0 +1,348 @@
+"""Benchmark cereja.hashtools compression strategies, archives and encryption."""
+
+import argparse
+import json
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+if str(REPOSITORY_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPOSITORY_ROOT))
+
+from cereja.hashtools import (  # noqa: E402
+    CompressionStrategy,
+    compress,
+    compress_dir,
+    compress_file,
+    decompress,
+    decompress_dir,
+    decompress_file,
+    decrypt,
+    decrypt_file,
+    encrypt,
+    encrypt_file,
+)
+
+WORDS = (
+    "cache", "payload", "request", "cereja", "matrix", "vector", "stream", "archive", "window",
+    "token", "buffer", "worker", "result", "thread", "record", "index", "value", "sample",
+)
+DIRECTORY_STRATEGIES = ("zlib", "bz2", "lzma")
+PASSWORD = "benchmark-password"
+
+
+def _text_corpus(rng, size):
+    lines = []
+    while sum(map(len, lines)) < size:
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + ".\n")
+    return "".join(lines).encode("utf-8")[:size]
+
+
+def _json_corpus(rng, size):
+    records = []
+    encoded = b"[]"
+    while len(encoded) < size:
+        records.extend(
+            {
+                "id": len(records) + index,
+                "name": rng.choice(WORDS),
+                "score": round(rng.random() * 100, 3),
+                "tags": rng.sample(WORDS, 3),
+                "active": rng.random() > 0.5,
+            }
+            for index in range(256)
+        )
+        encoded = json.dumps(records, indent=2).encode("utf-8")
+    return encoded[:size]
+
+
+def _logs_corpus(rng, size):
+    lines = []
+    timestamp = 1_700_000_000.0
+    while sum(map(len, lines)) < size:
+        timestamp += rng.random()
+        lines.append(
+            "{} {:<7} worker-{} {} {} in {:.2f}ms\n".format(
+                time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp)),
+                rng.choice(("INFO", "DEBUG", "WARNING", "ERROR")),
+                rng.randint(0, 7),
+                rng.choice(WORDS),
+                rng.choice(("done", "started", "retried", "failed")),
+                rng.random() * 250,
+            )
+        )
+    return "".join(lines).encode("utf-8")[:size]
+
+
+def _integers_corpus(rng, size):
+    values = []
+    current = 0
+    for _ in range(size // 4):
+        current += rng.randint(0, 16)
+        values.append(current)
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def _random_corpus(rng, size):
+    return rng.randbytes(size)
+
+
+CORPORA = {
+    "text": _text_corpus,
+    "json": _json_corpus,
+    "logs": _logs_corpus,
+    "integers": _integers_corpus,
+    "random": _random_corpus,
+}
+
+
+def build_corpora(size, *, names=None, seed=0):
+    """Create repeatable in-memory corpora of ``size`` bytes."""
+    return {name: CORPORA[name](random.Random(f"{seed}-{name}"), size) for name in names or CORPORA}
+
+
+def build_directory(root, corpora, *, copies=4):
+    """Create a mixed directory tree with nested, small and duplicated files."""
+    for name, data in corpora.items():
+        folder = root / name
+        folder.mkdir(parents=True)
+        (folder / f"{name}.bin").write_bytes(data)
+        for index in range(copies):
+            start = index * len(data) // copies
+            (folder / f"part-{index}.bin").write_bytes(data[start:start + 4096])
+        (folder / "nested").mkdir()
+        (folder / "nested" / f"copy-of-{name}.bin").write_bytes(data)
+
+
+def _positive_int(value):
+    parsed = int(value)
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError("must be greater than zero")
+    return parsed
+
+
+def _best_time(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _peak_memory(function):
+    """Peak memory traced by Python allocators while running ``function`` once."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _throughput(size, seconds):
+    return size / (1024 * 1024) / seconds if seconds else None
+
+
+def _measure(compress_step, decompress_step, original_size, repeat, memory=True):
+    """Time and trace both directions; ``compress_step`` returns the compressed size."""
+    compress_seconds, compressed_size = _best_time(compress_step, repeat)
+    decompress_seconds, round_trip = _best_time(decompress_step, repeat)
+    return {
+        "original_bytes": original_size,
+        "compressed_bytes": compressed_size,
+        "ratio": original_size / compressed_size if compressed_size else None,
+        "compress_seconds": compress_seconds,
+        "decompress_seconds": decompress_seconds,
+        "compress_mb_per_second": _throughput(original_size, compress_seconds),
+        "decompress_mb_per_second": _throughput(original_size, decompress_seconds),
+        "compress_peak_bytes": _peak_memory(compress_step) if memory else None,
+        "decompress_peak_bytes": _peak_memory(decompress_step) if memory else None,
+        "round_trip": round_trip,
+    }
+
+
+def benchmark_strategies(corpora, strategies, repeat, memory=True):
+    """In-memory ``compress``/``decompress`` for every strategy and corpus."""
+    results = {}
+    for corpus_name, data in corpora.items():
+        results[corpus_name] = {}
+        for strategy in strategies:
+            output = {}
+
+            def compress_step():
+                output["compressed"], output["stats"] = compress(data, strategy)
+                return len(output["compressed"])
+
+            def decompress_step():
+                return decompress(output["compressed"]) == data
+
+            measured = _measure(compress_step, decompress_step, len(data), repeat, memory)
+            measured["selected_strategy"] = output["stats"].strategy.value
+            results[corpus_name][strategy.value] = measured
+    return results
+
+
+def benchmark_files(corpora, root, repeat, memory=True):
+    """``compress_file``/``decompress_file`` with automatic strategy selection."""
+    results = {}
+    for corpus_name, data in corpora.items():
+        source = root / f"{corpus_name}.bin"
+        archive = root / f"{corpus_name}.bin.cjz"
+        restored = root / f"{corpus_name}.restored"
+        source.write_bytes(data)
+        output = {}
+
+        def compress_step():
+            _, output["stats"] = compress_file(str(source), str(archive))
+            return archive.stat().st_size
+
+        def decompress_step():
+            decompress_file(str(archive), str(restored))
+            return restored.read_bytes() == data
+
+        measured = _measure(compress_step, decompress_step, len(data), repeat, memory)
+        measured["selected_strategy"] = output["stats"].strategy.value
+        results[corpus_name] = measured
+    return results
+
+
+def benchmark_directories(corpora, root, repeat, memory=True):
+    """``compress_dir``/``decompress_dir`` of a mixed tree for each directory codec."""
+    source = root / "mixed"
+    build_directory(source, corpora)
+    files = {path.relative_to(source): path.read_bytes() for path in source.rglob("*") if path.is_file()}
+    original_size = sum(map(len, files.values()))
+
+    def restored_equals(output_dir):
+        return all((output_dir / path).read_bytes() == data for path, data in files.items())
+
+    results = {}
+    variants = [(strategy, {"strategy": strategy}) for strategy in DIRECTORY_STRATEGIES]
+    variants.append(("objective_ratio", {"objective": "ratio"}))
+    for name, options in variants:
+        archive = root / f"mixed-{name}.cjz"
+        output_dir = root / f"mixed-{name}"
+
+        def compress_step():
+            compress_dir(str(source), str(archive), **options)
+            return archive.stat().st_size
+
+        def decompress_step():
+            decompress_dir(str(archive), str(output_dir))
+            return restored_equals(output_dir)
+
+        results[name] = _measure(compress_step, decompress_step, original_size, repeat, memory)
+        results[name]["files"] = len(files)
+    return results
+
+
+def benchmark_crypto(data, root, repeat, memory=True):
+    """In-memory and file encryption of one corpus."""
+    source = root / "crypto.bin"
+    encrypted = root / "crypto.bin.enc"
+    restored = root / "crypto.restored"
+    source.write_bytes(data)
+    output = {}
+
+    def encrypt_step():
+        output["token"] = encrypt(data, PASSWORD)
+        return len(output["token"])
+
+    def decrypt_step():
+        return decrypt(output["token"], PASSWORD) == data
+
+    def encrypt_file_step():
+        encrypt_file(str(source), PASSWORD, str(encrypted))
+        return encrypted.stat().st_size
+
+    def decrypt_file_step():
+        decrypt_file(str(encrypted), PASSWORD, str(restored))
+        return restored.read_bytes() == data
+
+    return {
+        "encrypt": _measure(encrypt_step, decrypt_step, len(data), repeat, memory),
+        "encrypt_file": _measure(encrypt_file_step, decrypt_file_step, len(data), repeat, memory),
+    }
+
+
+def _round_trips(section):
+    if "round_trip" in section:
+        yield section["round_trip"]
+        return
+    for value in section.values():
+        if isinstance(value, dict):
+            yield from _round_trips(value)
+
+
+def run_benchmark(*, size, repeat, corpora=None, strategies=None, directories=True, crypto=True, memory=True):
+    """Run the benchmark on generated corpora inside an isolated temporary directory."""
+    data = build_corpora(size, names=corpora)
+    strategies = [CompressionStrategy(strategy) for strategy in strategies or [s.value for s in CompressionStrategy]]
+    payload = {
+        "config": {
+            "corpus_bytes": size,
+            "repeat": repeat,
+            "corpora": list(data),
+            "strategies": [strategy.value for strategy in strategies],
+            "python": sys.version.split()[0],
+            "peak_memory": memory,
+        },
+        "strategies": benchmark_strategies(data, strategies, repeat, memory),
+    }
+    with tempfile.TemporaryDirectory(prefix="cereja-compression-benchmark-") as temp:
+        temp_root = Path(temp)
+        files_root = temp_root / "files"
+        files_root.mkdir()
+        payload["files"] = benchmark_files(data, files_root, repeat, memory)
+        if directories:
+            payload["directories"] = benchmark_directories(data, temp_root / "directories", repeat, memory)
+        if crypto:
+            crypto_root = temp_root / "crypto"
+            crypto_root.mkdir()
+            payload["crypto"] = benchmark_crypto(next(iter(data.values())), crypto_root, repeat, memory)
+    payload["all_round_trips"] = all(_round_trips(payload))
+    return payload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=_positive_int, default=64 * 1024,
+                        help="Bytes per corpus. The pure-Python codecs are slow on large inputs.")
+    parser.add_argument("--repeat", type=_positive_int, default=3, help="Timings keep the best of N runs.")
+    parser.add_argument("--corpus", action="append", choices=sorted(CORPORA), dest="corpora")
+    parser.add_argument("--strategy", action="append", choices=[s.value for s in CompressionStrategy],
+                        dest="strategies")
+    parser.add_argument("--skip-directories", action="store_true")
+    parser.add_argument("--skip-crypto", action="store_true")
+    parser.add_argument("--skip-memory", action="store_true",
+                        help="Do not trace peak memory, the traced runs are several times slower.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this path instead of stdout.")
+    args = parser.parse_args(argv)
+    payload = run_benchmark(
+        size=args.size,
+        repeat=args.repeat,
+        corpora=args.corpora,
+        strategies=args.strategies,
+        directories=not args.skip_directories,
+        crypto=not args.skip_crypto,
+        memory=not args.skip_memory,
+    )
+    report = json.dumps(payload, indent=2, sort_keys=True)
+    if args.output is None:
+        print(report)
+    else:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    return 0 if payload["all_round_trips"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
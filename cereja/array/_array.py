@@ -23,10 +23,13 @@ SOFTWARE.
 import operator
 import random
 import statistics
+import itertools
 import math
+import numbers
+from decimal import Decimal
 from functools import reduce
 from itertools import chain
-from typing import Any, Sequence, Tuple, Union, List, Optional
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple, Union, List, Optional
 import copy
 from cereja.config.cj_types import T_NUMBER, T_SHAPE
 import logging
@@ -36,6 +39,7 @@ __all__ = [
     "array_gen",
     "array_randn",
     "flatten",
+    "iflatten",
     "get_cols",
     "get_shape",
     "is_empty",
@@ -47,6 +51,9 @@ __all__ = [
     "dot",
     "dotproduct",
     "determinant",
+    "lu_decompose",
+    "solve",
+    "inverse",
     "div",
     "sub",
     "prod",
@@ -56,10 +63,26 @@ __all__ = [
 ]
 
 from .. import check_type_on_sequence
+from ._buffer import (_buffer_argmax, _buffer_backend, _buffer_map, _buffer_mean, _buffer_variance, _iter_buffer,
+                      _resolve_backend, numpy, pack_numbers)
 from ..utils import is_iterable, is_sequence, is_numeric_sequence, chunk, dict_to_tuple
 
 logger = logging.getLogger(__name__)
 
+# Columns of the right operand multiplied against every row before moving on, see _blocked_dot.
+_DOT_BLOCK_SIZE = 64
+# Multiply-adds (rows * inner * cols) below which converting to NumPy costs more than it saves.
+_NUMPY_DOT_MIN_SIZE = 32 ** 3
+
+# Types expanded by flatten; other iterables are expanded unless they are _NON_FLATTENABLE.
+_SEQUENCE_TYPES = (list, tuple, set)
+_NON_FLATTENABLE = (str, bytes, bytearray, dict)
+# Leaves that end a full flatten early when return_shapes reports the depths, see _flatten_depths.
+_SCALAR_TYPES = (int, float, str, bool, type(None), complex, bytes)
+# Exact types checked first: runs of these are copied without inspecting each item.
+_LEAF_TYPES = frozenset(_SCALAR_TYPES)
+_REGULAR_TYPES = frozenset((list, tuple))
+
 
 def shape_is_ok(
         sequence: Union[Sequence[Any], Any]
@@ -102,9 +125,15 @@ def get_shape(sequence: Sequence) -> Tuple[Union[int, None], ...]:
         return (None,)
 
     shape = []
-    while is_sequence(sequence) and not is_empty(sequence):
+    while True:
+        if type(sequence) in _REGULAR_TYPES:
+            # Fast path for the common nested lists and tuples.
+            if not sequence:
+                break
+        elif not is_sequence(sequence) or is_empty(sequence):
+            break
         shape.append(len(sequence))
-        sequence = sequence[0] if len(sequence) else None
+        sequence = sequence[0]
 
     return tuple(shape)
 
@@ -164,6 +193,152 @@ def array_gen(
     return v[0]
 
 
+def _walk(sequence,
+          depth: int,
+          shapes: Optional[Dict[int, List[int]]] = None,
+          info: Optional[Dict[str, Any]] = None,
+          run_size: Union[int, float] = math.inf):
+    """
+    Depth-first walk yielding runs of the items of ``sequence`` flattened ``depth`` levels (-1 for all).
+
+    An explicit stack of iterators replaces recursion, so nesting depth is not bounded by the
+    recursion limit. Leaves are gathered in lists of at least ``run_size`` items, or fewer at the
+    end; lists, tuples and sets holding only scalars (or sitting at the last level to expand) are
+    copied into the run at once. Other iterables at the last level are yielded as their own run.
+
+    The length of every expanded sequence is appended to ``shapes[level]`` in the order a
+    breadth-first pass would meet it, and ``info`` receives the deepest level holding a sequence and
+    whether all leaves are scalars, which :func:`flatten` needs to report the same levels as the
+    former level by level algorithm.
+    """
+    limit = math.inf if depth == -1 else depth
+    deepest = -1
+    all_scalar = True
+    pending = []
+    stack = [iter(sequence)]
+    while stack:
+        level = len(stack) - 1
+        for item in stack[-1]:
+            item_type = type(item)
+            if item_type in _LEAF_TYPES:
+                pending.append(item)
+            elif item_type in _SEQUENCE_TYPES or (hasattr(item, '__iter__')
+                                                  and not isinstance(item, _NON_FLATTENABLE)):
+                if level > deepest:
+                    deepest = level
+                if shapes is not None:
+                    shapes.setdefault(level + 1, []).append(len(item))
+                if item_type in _SEQUENCE_TYPES and (level + 1 >= limit or _LEAF_TYPES.issuperset(map(type, item))):
+                    # The children are leaves: the last level to expand, or only scalars.
+                    pending.extend(item)
+                elif level + 1 >= limit:
+                    if pending:
+                        yield pending
+                        pending = []
+                    yield item
+                    continue
+                else:
+                    stack.append(iter(item))
+                    break
+            else:
+                if all_scalar:
+                    all_scalar = isinstance(item, _SCALAR_TYPES)
+                pending.append(item)
+            if len(pending) >= run_size:
+                yield pending
+                pending = []
+        else:
+            stack.pop()
+    if pending:
+        yield pending
+    if info is not None:
+        info.update(deepest=deepest, all_scalar=all_scalar)
+
+
+def _flatten_depths(sequence,
+                    depth: int,
+                    deepest: int,
+                    all_scalar: bool) -> int:
+    """
+    Number of levels the level by level flatten used to walk, which fixes the keys of ``shapes``.
+
+    Every level that still holds a sequence is walked, plus one more that finds none, except that a
+    full flatten stops at ``len(get_shape(sequence)) - 1`` levels when only scalars remain there.
+    ``deepest`` is the deepest level holding a sequence, -1 for none.
+    """
+    if depth != -1:
+        return min(depth, deepest + 2)
+    max_depth = len(get_shape(sequence)) - 1
+    if max_depth >= 1 and deepest == max_depth - 1 and all_scalar:
+        return deepest + 1
+    return deepest + 2
+
+
+def _flatten_levels(sequence: List[Any],
+                    depth: int,
+                    shapes: Optional[Dict[int, List[int]]] = None) -> Tuple[List[Any], int, bool]:
+    """
+    Join the leading levels made only of lists and tuples with one C-level copy per level.
+
+    Up to ``len(get_shape(sequence)) - 1`` levels (or ``depth``) are joined with
+    ``chain.from_iterable`` after checking, also in C, that every item of the level is a list or
+    tuple, and their lengths go to ``shapes``. Regular arrays of scalars are flattened entirely
+    here.
+
+    Returns:
+        The items reached, the number of levels joined and whether the flatten is complete.
+    """
+    levels = len(get_shape(sequence)) - 1
+    if depth != -1:
+        levels = min(levels, depth)
+    items = sequence
+    for level in range(levels):
+        if not _REGULAR_TYPES.issuperset(map(type, items)):
+            return items, level, False
+        if shapes is not None:
+            shapes[level + 1] = list(map(len, items))
+        items = list(chain.from_iterable(items))
+    if levels < 1 or (levels != depth and not _LEAF_TYPES.issuperset(map(type, items))):
+        return items, levels, False
+    if shapes is not None and depth != -1 and depth > levels:
+        # A limited flatten also reports the level past the leaves, which has no sequences.
+        shapes[levels + 1] = []
+    return items, levels, True
+
+
+def _collect(runs) -> List[Any]:
+    """Join the runs of :func:`_walk`; its lists are fresh, so the first one becomes the result."""
+    result = []
+    for run in runs:
+        if not result and type(run) is list:
+            result = run
+        else:
+            result.extend(run)
+    return result
+
+
+def _as_list(sequence) -> List[Any]:
+    if hasattr(sequence, 'tolist'):
+        return sequence.tolist()
+    if hasattr(sequence, 'to_list'):
+        return sequence.to_list()
+    if isinstance(sequence, dict):
+        return list(dict_to_tuple(sequence))
+    if isinstance(sequence, (tuple, set)):
+        return list(sequence)
+    if not isinstance(sequence, list):
+        raise TypeError(f"Invalid value to sequence: {type(sequence)}")
+    return sequence
+
+
+def _check_depth(depth) -> int:
+    if not isinstance(depth, int):
+        raise TypeError(
+                f"Type {type(depth)} is not valid for max depth. Please send integer."
+        )
+    return depth
+
+
 def flatten(
         sequence: Union[Sequence[Any], "Matrix"],
         depth: Optional[int] = -1,
@@ -173,9 +348,10 @@ def flatten(
     """
     Flattens arrays of values regardless of their shape and depth.
 
-    This function recursively flattens nested sequences to a specified depth level,
-    with support for various sequence types including lists, tuples, sets, and custom
-    objects with 'tolist' or 'to_list' methods (like numpy arrays or Matrix objects).
+    This function flattens nested sequences to a specified depth level in a single
+    depth-first pass (see :func:`iflatten`), with support for various sequence types
+    including lists, tuples, sets, and custom objects with 'tolist' or 'to_list'
+    methods (like numpy arrays or Matrix objects).
 
     Args:
         sequence: The sequence of values to be flattened. Can be a nested list, tuple,
@@ -193,9 +369,7 @@ def flatten(
             the flattened list and a dictionary of shapes at each depth level.
 
     Raises:
-        AssertionError: If the sequence is not a valid sequence type.
-        TypeError: If depth is not an integer value.
-        Exception: If the sequence cannot be copied.
+        TypeError: If the sequence is not a valid sequence type or depth is not an integer value.
 
     Examples:
         >>> sequence = [[1, 2, 3], [], [[2, [3], 4], 6]]
@@ -206,74 +380,65 @@ def flatten(
         >>> flatten([[1, 2], [3, 4]], return_shapes=True)
         ([1, 2, 3, 4], {0: [2], 1: [2, 2]})
     """
+    sequence = _as_list(sequence)
+    depth = _check_depth(kwargs.get("max_recursion") or depth)
+
+    shapes = {0: [len(sequence)]} if return_shapes else None
+    # As before, depths other than -1 below one leave the sequence as it is.
+    if depth != -1 and depth < 1:
+        return (sequence.copy(), shapes) if return_shapes else sequence.copy()
+
+    items, joined, complete = _flatten_levels(sequence, depth, shapes)
+    if complete:
+        return (items, shapes) if return_shapes else items
+
+    # The rest is walked depth first from the levels already joined.
+    walk_shapes = {} if return_shapes else None
+    info = {} if return_shapes else None
+    result = _collect(_walk(items, -1 if depth == -1 else depth - joined, walk_shapes, info))
+    if return_shapes:
+        for level, lengths in walk_shapes.items():
+            shapes[joined + level] = lengths
+        deepest = joined + info["deepest"] if info["deepest"] >= 0 else joined - 1
+        for level in range(1, _flatten_depths(sequence, depth, deepest, info["all_scalar"]) + 1):
+            shapes.setdefault(level, [])
+    return (result, shapes) if return_shapes else result
+
+
+def iflatten(sequence: Iterable[Any],
+             depth: int = -1) -> Iterator[Any]:
+    """
+    Lazily yield the items of ``sequence`` flattened ``depth`` levels, -1 (default) for all.
 
-    # Types that should be treated as sequences
-    SEQUENCE_TYPES = (list, tuple, set)
-    # Types that should NOT be flattened
-    NON_FLATTENABLE = (str, bytes, bytearray, dict)
-
-    # Initial type conversion
-    if hasattr(sequence, 'tolist'):
-        sequence = sequence.tolist()
-    elif hasattr(sequence, 'to_list'):
-        sequence = sequence.to_list()
-    elif isinstance(sequence, dict):
-        sequence = list(dict_to_tuple(sequence))
-    elif isinstance(sequence, (tuple, set)):
-        sequence = list(sequence)
-    elif not isinstance(sequence, SEQUENCE_TYPES):
-        raise TypeError(f"Invalid value to sequence: {type(sequence)}")
-
-    try:
-        sequence = sequence.copy()
-    except (AttributeError, TypeError):
-        raise TypeError("Invalid value to sequence")
-
-    depth = kwargs.get("max_recursion") or depth
-
-    if not isinstance(depth, int):
-        raise TypeError(
-                f"Type {type(depth)} is not valid for max depth. Please send integer."
-        )
-
-    deep = 0
-    shapes = {deep: [len(sequence)]} if return_shapes else None
-    depth_ = len(get_shape(sequence)) - 1 if depth == -1 else depth # max depth to flatten
-
-    while deep < depth or depth == -1:
-        result = []
-        len_seqs = [] if return_shapes else None
-        has_nested = False
-        for item in sequence:
-            # Direct type checking - much faster than is_sequence
-            # Checks if it's a valid sequence (not string, bytes, etc)
-            if type(item) in SEQUENCE_TYPES or (
-                    hasattr(item, '__iter__') and
-                    not isinstance(item, NON_FLATTENABLE)
-            ):
-                has_nested = True
-                if return_shapes:
-                    len_seqs.append(len(item))
-                result.extend(item)
-            else:
-                result.append(item)
-
-        sequence = result
-        deep += 1
+    Nested sequences are expanded like :func:`flatten` does, but items are produced one at a
+    time and ``sequence``, or any nested iterable, may be a generator or another one-shot iterator.
 
-        if return_shapes:
-            shapes[deep] = len_seqs
+    e.g:
+    >>> list(iflatten([[1, 2, 3], [], [[2, [3], 4], 6]]))
+    [1, 2, 3, 2, 3, 4, 6]
+    >>> next(iflatten(([i, [i]] for i in itertools.count()), depth=1))
+    0
 
-        if deep == depth_:
-            # Final check to avoid unnecessary iterations
-            if check_type_on_sequence(sequence, (int, float, str, bool, type(None), complex, bytes)):
-                break
+    Args:
+        sequence: Iterable of values, possibly nested.
+        depth: Maximum flattening depth. -1 means completely flatten (default).
 
-        # Stop immediately if there are no nested sequences
-        if not has_nested:
-            break
+    Returns:
+        Iterator: The flattened items.
 
-    return (sequence, shapes) if return_shapes else sequence
+    Raises:
+        TypeError: If the sequence is not iterable, is a string or bytes, or depth is not an integer value.
+    """
+    if hasattr(sequence, 'tolist') or hasattr(sequence, 'to_list'):
+        sequence = _as_list(sequence)
+    elif isinstance(sequence, dict):
+        sequence = dict_to_tuple(sequence)
+    elif not hasattr(sequence, '__iter__') or isinstance(sequence, _NON_FLATTENABLE):
+        raise TypeError(f"Invalid value to sequence: {type(sequence)}")
+    depth = _check_depth(depth)
+    if depth != -1 and depth < 1:
+        return iter(sequence)
+    return itertools.chain.from_iterable(_walk(sequence, depth, run_size=1))
 
 
 def rand_uniform(_from: T_NUMBER,
@@ -457,13 +622,226 @@ def dotproduct(vec1,
     return sum(map(operator.mul, vec1, vec2))
 
 
+def _blocked_dot(rows: Sequence[Sequence[T_NUMBER]],
+                 cols: Sequence[Sequence[T_NUMBER]],
+                 block_size: int = _DOT_BLOCK_SIZE) -> List[List[T_NUMBER]]:
+    """
+    Multiply ``rows`` by the transposed right operand ``cols`` one block of columns at a time.
+
+    Each block of columns stays in cache while every row is multiplied against it, and each
+    product is a ``sum(map(operator.mul, ...))`` run in C. Integers stay exact.
+    """
+    result = [[] for _ in rows]
+    for start in range(0, len(cols), block_size):
+        block = cols[start:start + block_size]
+        for row, out in zip(rows, result):
+            out.extend([sum(map(operator.mul, row, col)) for col in block])
+    return result
+
+
+def _numpy_dot(a, b, shape_a, shape_b):
+    """
+    ``numpy.dot`` for floats, or integers that cannot overflow int64; None when it does not apply.
+
+    Small products and other number types (e.g. ``Fraction``) stay in pure Python. The size is taken from the
+    shapes, so small products never pay for flattening the operands.
+    """
+    if numpy is None:
+        return None
+    inner = shape_a[-1]
+    if shape_a[0] * inner * (shape_b[-1] if len(shape_b) == 2 else 1) < _NUMPY_DOT_MIN_SIZE:
+        return None
+    flat_a, flat_b = flatten(a), flatten(b)
+    if not check_type_on_sequence(flat_a, (int, float)) or not check_type_on_sequence(flat_b, (int, float)):
+        return None
+    if check_type_on_sequence(flat_a, int) and check_type_on_sequence(flat_b, int):
+        bound = max(map(abs, flat_a), default=0) * max(map(abs, flat_b), default=0) * inner
+        if bound >= 2 ** 63:
+            return None
+    return numpy.dot(numpy.array(a), numpy.array(b)).tolist()
+
+
 def dot(a,
         b):
+    """
+    Matrix product of a 2-D sequence with a 2-D or 1-D sequence.
+
+    Large float (or safely bounded integer) products are computed by NumPy when it is importable; otherwise
+    a cache-blocked pure Python product is used, which keeps integer results exact.
+
+    e.g:
+    >>> dot([[1, 2], [3, 4]], [[5, 6], [7, 8]])
+    [[19, 22], [43, 50]]
+    >>> dot([[1, 2], [3, 4]], [1, 1])
+    [3, 7]
+
+    Args:
+        a: Left operand with shape (m, k).
+        b: Right operand with shape (k, n) or (k,).
+
+    Returns:
+        List: Nested list with shape (m, n), or a list with shape (m,) for a 1-D ``b``.
+
+    Raises:
+        ValueError: If the shapes are not aligned.
+    """
+    a, b = (value.to_list() if isinstance(value, Matrix) else value for value in (a, b))
     shape_a = get_shape(a)
     shape_b = get_shape(b)
-    if shape_a[-2] != shape_b[-1]:
+    if len(shape_a) != 2 or len(shape_b) > 2 or shape_a[-1] != shape_b[0]:
         raise ValueError(f"shapes {shape_a} and {shape_b} are not aligned for dot product")
-    return [[dotproduct(line, col) for col in get_cols(b)] for line in a]
+    result = _numpy_dot(a, b, shape_a, shape_b)
+    if result is not None:
+        return result
+    if len(shape_b) == 1:
+        return [dotproduct(line, b) for line in a]
+    return _blocked_dot(a, get_cols(b))
+
+
+def _check_square(sequence) -> int:
+    shape = get_shape(sequence)
+    if not (len(shape) == 2 and shape[0] == shape[1]):
+        raise ValueError(f"Matrix: {sequence} is not (nxn), please provide a square matrix.")
+    return shape[0]
+
+
+def _bareiss_determinant(sequence, divide=operator.floordiv):
+    """
+    Fraction-free (Bareiss) elimination: every division is exact, so integer determinants stay exact.
+
+    ``divide`` is floor division for integers and true division for other exact numbers (``Fraction``,
+    ``Decimal``), whose quotients are exact as well.
+    """
+    rows = [list(row) for row in sequence]
+    n = len(rows)
+    sign, previous = 1, 1
+    for k in range(n - 1):
+        if rows[k][k] == 0:
+            swap = next((i for i in range(k + 1, n) if rows[i][k] != 0), None)
+            if swap is None:
+                return rows[k][k]
+            rows[k], rows[swap] = rows[swap], rows[k]
+            sign = -sign
+        pivot_row = rows[k]
+        pivot = pivot_row[k]
+        for row in rows[k + 1:]:
+            factor = row[k]
+            row[k + 1:] = [divide(value * pivot - factor * pivot_value, previous)
+                           for value, pivot_value in zip(row[k + 1:], pivot_row[k + 1:])]
+        previous = pivot
+    return sign * rows[-1][-1]
+
+
+def lu_decompose(sequence: Sequence[Sequence[T_NUMBER]]) -> Tuple[List[List[float]], List[int], int]:
+    """
+    LU decomposition with partial pivoting (Doolittle), ``P·A = L·U``.
+
+    L and U are packed in one matrix: the entries below the diagonal are L, whose diagonal is all ones,
+    and the diagonal and the entries above it are U.
+
+    e.g:
+    >>> lu_decompose([[1, 2], [3, 4]])
+    ([[3.0, 4.0], [0.3333333333333333, 0.6666666666666667]], [1, 0], -1)
+
+    Args:
+        sequence: Square matrix of numbers.
+
+    Returns:
+        Tuple: The packed LU matrix, the row permutation (row ``i`` of ``P·A`` is row ``permutation[i]``
+        of ``A``) and the permutation sign, ``1`` or ``-1``. A singular matrix has a zero on the diagonal.
+
+    Raises:
+        ValueError: If the matrix is not square.
+    """
+    n = _check_square(sequence)
+    lu = [[float(value) for value in row] for row in sequence]
+    permutation = list(range(n))
+    sign = 1
+    for k in range(n):
+        pivot_index = max(range(k, n), key=lambda i: abs(lu[i][k]))
+        if lu[pivot_index][k] == 0:
+            continue
+        if pivot_index != k:
+            lu[k], lu[pivot_index] = lu[pivot_index], lu[k]
+            permutation[k], permutation[pivot_index] = permutation[pivot_index], permutation[k]
+            sign = -sign
+        pivot_row = lu[k]
+        pivot = pivot_row[k]
+        for row in lu[k + 1:]:
+            factor = row[k] / pivot
+            row[k] = factor
+            if factor:
+                row[k + 1:] = [value - factor * pivot_value
+                               for value, pivot_value in zip(row[k + 1:], pivot_row[k + 1:])]
+    return lu, permutation, sign
+
+
+def _lu_solve(lu, permutation, rhs) -> List[float]:
+    """Forward and back substitution of one right-hand side."""
+    y = [rhs[index] for index in permutation]
+    for i, row in enumerate(lu):
+        y[i] -= sum(map(operator.mul, row[:i], y[:i]))
+    for i in range(len(lu) - 1, -1, -1):
+        row = lu[i]
+        y[i] = (y[i] - sum(map(operator.mul, row[i + 1:], y[i + 1:]))) / row[i]
+    return y
+
+
+def _lu_factor_nonsingular(sequence):
+    lu, permutation, _ = lu_decompose(sequence)
+    if any(row[i] == 0 for i, row in enumerate(lu)):
+        raise ValueError("Matrix is singular.")
+    return lu, permutation
+
+
+def solve(a: Sequence[Sequence[T_NUMBER]],
+          b: Sequence[Union[T_NUMBER, Sequence[T_NUMBER]]]) -> List[Any]:
+    """
+    Solve the linear system ``a·x = b`` through an LU decomposition with partial pivoting.
+
+    e.g:
+    >>> solve([[2, 1], [1, 3]], [3, 5])
+    [0.8, 1.4]
+
+    Args:
+        a: Square matrix of coefficients with shape (n, n).
+        b: Right-hand side with shape (n,), or (n, m) to solve m systems at once.
+
+    Returns:
+        List: ``x`` as floats, with the shape of ``b``.
+
+    Raises:
+        ValueError: If ``a`` is not square, is singular or the shapes are not aligned.
+    """
+    a = a.to_list() if isinstance(a, Matrix) else a
+    b = b.to_list() if isinstance(b, Matrix) else b
+    shape_b = get_shape(b)
+    if shape_b[0] != len(a) or len(shape_b) > 2:
+        raise ValueError(f"shapes {get_shape(a)} and {shape_b} are not aligned to solve")
+    lu, permutation = _lu_factor_nonsingular(a)
+    if len(shape_b) == 1:
+        return _lu_solve(lu, permutation, b)
+    return [list(row) for row in zip(*(_lu_solve(lu, permutation, col) for col in get_cols(b)))]
+
+
+def inverse(sequence: Sequence[Sequence[T_NUMBER]]) -> List[List[float]]:
+    """
+    Inverse of a square matrix, solving one LU system per column of the identity.
+
+    Args:
+        sequence: Square, non-singular matrix.
+
+    Returns:
+        List: The inverse matrix as nested lists of floats.
+
+    Raises:
+        ValueError: If the matrix is not square or is singular.
+    """
+    sequence = sequence.to_list() if isinstance(sequence, Matrix) else sequence
+    lu, permutation = _lu_factor_nonsingular(sequence)
+    n = len(lu)
+    columns = [_lu_solve(lu, permutation, [float(i == j) for i in range(n)]) for j in range(n)]
+    return [list(row) for row in zip(*columns)]
 
 
 def determinant(sequence: Sequence[Union[Sequence[T_NUMBER], "Matrix"]]) -> T_NUMBER:
@@ -473,19 +851,23 @@ def determinant(sequence: Sequence[Union[Sequence[T_NUMBER], "Matrix"]]) -> T_NU
     This function is inteded specifically for use with an (nxn) martix
     and may reject non-square matricies
 
+    Matrices of exact numbers (``int``, ``Fraction``, ``Decimal``) are reduced with fraction-free
+    Bareiss elimination and the result keeps their type and exactness; matrices with floats use
+    :func:`lu_decompose`, and a zero float determinant is returned as ``0.0``. Both are O(n³).
+
     :param matrix: Is an (nxn) matrix of numbers
     :return:
     """
-    shape = get_shape(sequence)
-    if not (len(shape) == 2 and shape[0] == shape[1]):
-        raise ValueError(f"Matrix: {sequence} is not (nxn), please provide a square matrix.")
-    if len(sequence) == 2:
-        return sequence[0][0] * sequence[1][1] - sequence[0][1] * sequence[1][0]
-    det = 0
-    for c in range(len(sequence)):
-        sub_matrix = [row[:c] + row[c + 1:] for row in sequence[1:]]
-        det += ((-1) ** c) * sequence[0][c] * determinant(sub_matrix)
-    return det
+    sequence = sequence.to_list() if isinstance(sequence, Matrix) else sequence
+    _check_square(sequence)
+    if all(check_type_on_sequence(row, int) for row in sequence):
+        return _bareiss_determinant(sequence)
+    if all(check_type_on_sequence(row, (numbers.Rational, Decimal)) for row in sequence):
+        exact = next(value for row in sequence for value in row if not isinstance(value, int))
+        # A singular matrix keeps the number type of its entries, e.g. Fraction(0).
+        return _bareiss_determinant(sequence, operator.truediv) or 0 * abs(exact)
+    lu, _, sign = lu_decompose(sequence)
+    return sign * prod([row[i] for i, row in enumerate(lu)]) or 0.0
 
 
 def get_min_max(values: List[Any]) -> Tuple[Any, ...]:
@@ -567,9 +949,15 @@ class Matrix:
     including arithmetic operations, dot product, reshape and
     determinant calculation.
 
+    With ``backend="array"`` (or ``"numpy"``) the values are kept flat in a
+    compact buffer, see :func:`cereja.array.pack_numbers`, and the
+    element-wise operations and aggregations run over that buffer. Row
+    access and the nested ``values`` are built from it on demand.
+
     Args:
         values: Sequence of values to initialize the matrix. Can be a
                 nested list, tuple, or any iterable sequence.
+        backend: ``"list"`` (default), ``"array"``, ``"numpy"`` or ``"auto"``.
 
     Attributes:
         shape: Tuple representing the matrix dimensions.
@@ -580,25 +968,71 @@ class Matrix:
         (2, 2)
         >>> m.mean()
         2.5
+        >>> Matrix([[1, 2], [3, 4]], backend="array").mean()
+        2.5
     """
 
     # Maximum lines for visual representation
     _MAX_REPR_LINES = 50
 
     def __init__(self,
-                 values):
+                 values,
+                 backend: str = "list"):
         """
         Initialize a new Matrix instance.
 
         Args:
             values: Values to initialize the matrix.
+            backend: Storage of the values. Default is ``"list"``.
 
         Raises:
             ValueError: If the provided values do not form a valid matrix.
         """
-        self._values = self._validate_values(values)
-        self._shape = get_shape(self._values)
+        self._backend = _resolve_backend(backend)
         self._cols = None  # Column cache
+        if self._backend == "list":
+            self._values = self._validate_values(values)
+            self._shape = get_shape(self._values)
+            self._buffer = None
+            return
+        self._values = None
+        if isinstance(values, Matrix) and values._buffer is not None:
+            self._shape = values.shape
+            self._buffer = values._buffer if values.backend == self._backend else pack_numbers(
+                    _iter_buffer(values._buffer), self._backend)
+            return
+        values = self._validate_values(values)
+        self._shape = get_shape(values)
+        self._buffer = pack_numbers(flatten(values), self._backend)
+        if self._shape != (None,) and prod(self._shape) != len(self._buffer):
+            raise ValueError(f"Matrix with shape {self._shape} is not regular, use backend='list'")
+
+    @classmethod
+    def _from_buffer(cls,
+                     buffer,
+                     shape):
+        """Wrap a flat buffer built by :func:`pack_numbers` without copying it."""
+        matrix = cls.__new__(cls)
+        matrix._backend = _buffer_backend(buffer)
+        matrix._buffer = None if matrix._backend == "list" else buffer
+        matrix._values = list(buffer) if matrix._buffer is None else None
+        matrix._shape = tuple(shape) if len(buffer) else (None,)
+        matrix._cols = None
+        if matrix._buffer is None and len(matrix._shape) > 1:
+            matrix._values = reshape(matrix._values, matrix._shape)
+        return matrix
+
+    def _rows(self):
+        """Yield the rows of a buffered matrix as nested lists (scalars for one dimension)."""
+        if len(self._shape) <= 1:
+            yield from _iter_buffer(self._buffer)
+            return
+        stride = len(self._buffer) // self._shape[0]
+        for start in range(0, len(self._buffer), stride):
+            rows = list(_iter_buffer(self._buffer[start:start + stride]))
+            for size in self._shape[:1:-1]:
+                rows = [rows[i:i + size] for i in range(0, len(rows), size)]
+            yield rows
 
     @staticmethod
     def _validate_values(values):
@@ -620,8 +1054,13 @@ class Matrix:
 
     @property
     def values(self):
-        """Return the internal matrix values."""
-        return self._values
+        """Return the matrix values, as nested lists built from the buffer of compact backends."""
+        return self._values if self._buffer is None else list(self._rows())
+
+    @property
+    def backend(self) -> str:
+        """Storage of the values, ``"list"``, ``"array"`` or ``"numpy"``."""
+        return self._backend
 
     @property
     def shape(self):
@@ -638,14 +1077,14 @@ class Matrix:
         """
         if self._cols is None:
             if len(self._shape) > 1:
-                self._cols = get_cols(self._values)
+                self._cols = get_cols(self.values)
             else:
-                self._cols = self._values
+                self._cols = self.values
         return self._cols
 
     def __iter__(self):
         """Allow iteration over the matrix elements."""
-        return iter(self._values)
+        return iter(self._values) if self._buffer is None else self._rows()
 
     def __eq__(self,
                other):
@@ -662,6 +1101,8 @@ class Matrix:
 
     def __len__(self):
         """Return the number of elements in the first dimension."""
+        if self._buffer is not None:
+            return self._shape[0] or 0
         return len(self._values)
 
     def __matmul__(self,
@@ -691,6 +1132,12 @@ class Matrix:
         Raises:
             ValueError: If the matrix shapes are not compatible.
         """
+        if self._buffer is not None:
+            return self._elementwise(operator.add, other, "add")
+        if isinstance(other, (int, float)):
+            # Scalar addition
+            flat_values = [x + other for x in self.flatten()]
+            return Matrix(array_gen(self._shape, flat_values))
         other_shape = get_shape(other)
         if self._shape != other_shape:
             raise ValueError(
@@ -719,6 +1166,8 @@ class Matrix:
         Raises:
             ValueError: If the matrix shapes are not compatible.
         """
+        if self._buffer is not None:
+            return self._elementwise(operator.sub, other, "subtract")
         if is_numeric_sequence(other):
             other_shape = get_shape(other)
             if self._shape != other_shape:
@@ -741,15 +1190,28 @@ class Matrix:
     def __mul__(self,
                 other):
         """
-        Element-wise scalar multiplication.
+        Element-wise multiplication.
 
         Args:
-            other: Scalar value for multiplication.
+            other: Scalar value, Matrix, or sequence.
 
         Returns:
             New Matrix with multiplied values.
+
+        Raises:
+            ValueError: If the shapes are not compatible.
         """
-        flat_values = [x * other for x in self.flatten()]
+        if self._buffer is not None:
+            return self._elementwise(operator.mul, other, "multiply")
+        if isinstance(other, (int, float)):
+            flat_values = [x * other for x in self.flatten()]
+        else:
+            other = other if isinstance(other, Matrix) else Matrix(other)
+            if self._shape != other.shape:
+                raise ValueError(
+                        f"Cannot multiply matrices with shapes {self._shape} and {other.shape}"
+                )
+            flat_values = [x * y for x, y in zip(self.flatten(), other.flatten())]
         return Matrix(array_gen(self._shape, flat_values))
 
     def __rmul__(self,
@@ -775,7 +1237,11 @@ class Matrix:
         if isinstance(other, (float, int)):
             if other == 0:
                 raise ZeroDivisionError("Cannot divide by zero")
+            if self._buffer is not None:
+                return self._elementwise(operator.truediv, other, "divide")
             other = Matrix(array_gen(self._shape, other))
+        elif self._buffer is not None:
+            return self._elementwise(operator.truediv, other, "divide")
 
         other_shape = get_shape(other)
         if self._shape != other_shape:
@@ -804,9 +1270,38 @@ class Matrix:
         Returns:
             New Matrix with summed values.
         """
+        if self._buffer is not None:
+            return self._elementwise(operator.add, other, "add")
         flat_values = [x + other for x in self.flatten()]
         return Matrix(array_gen(self._shape, flat_values))
 
+    def _elementwise(self,
+                     op,
+                     other,
+                     verb: str):
+        """
+        Apply a binary operator between the buffer and a scalar or a matrix of the same shape.
+
+        Args:
+            op: Binary operator, e.g. ``operator.add``.
+            other: Scalar value, Matrix, or sequence.
+            verb: Operation name for the error message.
+
+        Returns:
+            New Matrix with the same backend.
+
+        Raises:
+            ValueError: If the shapes are not compatible.
+        """
+        if not isinstance(other, (int, float)):
+            other = other if isinstance(other, Matrix) else Matrix(other)
+            if self._shape != other.shape:
+                raise ValueError(
+                        f"Cannot {verb} matrices with shapes {self._shape} and {other.shape}"
+                )
+            other = other._buffer if other._buffer is not None else flatten(other.values)
+        return self._from_buffer(_buffer_map(op, self._buffer, other), self._shape)
+
     def __getitem__(self,
                     key):
         """
@@ -818,6 +1313,15 @@ class Matrix:
         Returns:
             Scalar element, Matrix, or sub-matrix.
         """
+        if self._buffer is not None:
+            if not isinstance(key, int):
+                return Matrix(self.values)[key]
+            index = range(len(self))[key]
+            if len(self._shape) == 1:
+                value = self._buffer[index]
+                return value.item() if self._backend == "numpy" else value
+            stride = len(self._buffer) // self._shape[0]
+            return self._from_buffer(self._buffer[index * stride:(index + 1) * stride], self._shape[1:])
         if isinstance(key, int):
             result = self._values[key]
             # Return scalar if it's a number
@@ -848,10 +1352,10 @@ class Matrix:
 
     def __repr__(self):
         """String representation of the matrix."""
-        if len(self._values) >= self._MAX_REPR_LINES:
+        if len(self) >= self._MAX_REPR_LINES:
             preview = self._format_values()
             dots = "\n            .\n            .\n            ."
-            footer = f"\n\n[displaying {self._MAX_REPR_LINES} of {len(self._values)} rows]"
+            footer = f"\n\n[displaying {self._MAX_REPR_LINES} of {len(self)} rows]"
             return f"{self.__class__.__name__}({preview}{dots}){footer}"
 
         preview = self._format_values()
@@ -864,7 +1368,10 @@ class Matrix:
         Returns:
             Formatted string with the matrix values.
         """
-        values = self._values[:self._MAX_REPR_LINES]
+        if self._buffer is None:
+            values = self._values[:self._MAX_REPR_LINES]
+        else:
+            values = list(itertools.islice(self._rows(), self._MAX_REPR_LINES))
         if len(self._shape) <= 1:
             return str(values)
 
@@ -877,7 +1384,7 @@ class Matrix:
         Returns:
             List with the matrix values.
         """
-        return self._values
+        return self.values
 
     def flatten(self):
         """
@@ -886,6 +1393,8 @@ class Matrix:
         Returns:
             New one-dimensional Matrix.
         """
+        if self._buffer is not None:
+            return self._from_buffer(self._buffer, (len(self._buffer),))
         return Matrix(flatten(self._values))
 
     def reshape(self,
@@ -902,6 +1411,10 @@ class Matrix:
         Raises:
             ValueError: If the total number of elements is not compatible.
         """
+        if self._buffer is not None:
+            if prod(shape) != len(self._buffer):
+                raise ValueError(f"cannot reshape array of size {len(self._buffer)} into shape {shape}")
+            return self._from_buffer(self._buffer, shape)
         return Matrix(reshape(self._values, shape))
 
     def dot(self,
@@ -926,17 +1439,38 @@ class Matrix:
                     f"Cannot multiply: columns {self._shape[-1]} != rows {other.shape[n_cols]}"
             )
 
-        if len(other.shape) == 1:
-            return Matrix([
-                dotproduct(line, col)
-                for col in other.cols
-                for line in self
-            ])
+        if self._backend == "numpy":
+            result = numpy.dot(self._buffer.reshape(self._shape), numpy.asarray(other.values))
+            return self._from_buffer(result.ravel(), result.shape)
+        return Matrix(dot(self.values, other.values), backend=self._backend)
 
-        return Matrix([
-            [dotproduct(line, col) for col in other.cols]
-            for line in self
-        ])
+    def solve(self,
+              b):
+        """
+        Solve ``self·x = b`` through an LU decomposition with partial pivoting.
+
+        Args:
+            b: Right-hand side with shape (n,) or (n, m).
+
+        Returns:
+            New Matrix with ``x``.
+
+        Raises:
+            ValueError: If the matrix is not square, is singular or the shapes are not aligned.
+        """
+        return Matrix(solve(self.values, b), backend=self._backend)
+
+    def inverse(self):
+        """
+        Compute the inverse matrix through an LU decomposition with partial pivoting.
+
+        Returns:
+            New Matrix with the inverse.
+
+        Raises:
+            ValueError: If the matrix is not square or is singular.
+        """
+        return Matrix(inverse(self.values), backend=self._backend)
 
     def determinant(self):
         """
@@ -948,7 +1482,7 @@ class Matrix:
         Raises:
             ValueError: If the matrix is not square.
         """
-        return determinant(self._values)
+        return determinant(self.values)
 
     def mean(self):
         """
@@ -957,6 +1491,8 @@ class Matrix:
         Returns:
             Mean value of the elements.
         """
+        if self._buffer is not None:
+            return _buffer_mean(self._buffer)
         flattened = self.flatten()
         return sum(flattened) / len(flattened)
 
@@ -967,6 +1503,8 @@ class Matrix:
         Returns:
             Standard deviation of the elements.
         """
+        if self._buffer is not None:
+            return math.sqrt(_buffer_variance(self._buffer, population=True))
         return statistics.pstdev(self.flatten())
 
     def sqrt(self):
@@ -979,6 +1517,11 @@ class Matrix:
         Raises:
             ValueError: If there are negative values.
         """
+        if self._buffer is not None:
+            if min(_iter_buffer(self._buffer), default=0) < 0:
+                raise ValueError("math domain error")
+            sqrt = numpy.sqrt if self._backend == "numpy" else math.sqrt
+            return self._from_buffer(_buffer_map(sqrt, self._buffer), self._shape)
         sqrt_values = [math.sqrt(x) for x in self.flatten()]
         return Matrix(array_gen(self._shape, sqrt_values))
 
@@ -989,6 +1532,8 @@ class Matrix:
         Returns:
             Index of the maximum element.
         """
+        if self._buffer is not None:
+            return _buffer_argmax(self._buffer)
         flattened = self.flatten()
         return flattened.to_list().index(max(flattened))
 
@@ -1002,12 +1547,14 @@ class Matrix:
         return copy.copy(self)
 
     @staticmethod
-    def arange(*args):
+    def arange(*args,
+               backend: str = "list"):
         """
         Create a matrix from a numeric range.
 
         Args:
             *args: Arguments passed to range() (start, stop, step).
+            backend: Storage of the values. Default is ``"list"``.
 
         Returns:
             New Matrix with sequential values.
@@ -1018,4 +1565,4 @@ class Matrix:
             >>> Matrix.arange(1, 10, 2)
             Matrix([1, 3, 5, 7, 9])
         """
-        return Matrix(list(range(*args)))
+        return Matrix(list(range(*args)), backend=backend)
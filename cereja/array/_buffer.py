@@ -0,0 +1,234 @@
+"""
+Copyright (c) 2019 The Cereja Project
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import math
+import statistics
+from array import array
+import itertools
+from typing import Any, Callable, Iterable, Sequence
+
+from cereja.config.cj_types import T_NUMBER
+
+try:
+    import numpy
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    numpy = None
+
+__all__ = ["NUMERIC_BACKENDS", "pack_numbers"]
+
+NUMERIC_BACKENDS = ("list", "array", "numpy", "auto")
+
+_PACK_CHUNK_SIZE = 4096
+
+
+def _resolve_backend(backend: str) -> str:
+    """
+    Validate a numeric backend name and resolve ``"auto"``.
+
+    Args:
+        backend: One of ``NUMERIC_BACKENDS``. ``"auto"`` is NumPy when it is importable, otherwise ``"array"``.
+
+    Returns:
+        str: ``"list"``, ``"array"`` or ``"numpy"``.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If ``"numpy"`` is requested and NumPy is not installed.
+    """
+    if backend not in NUMERIC_BACKENDS:
+        raise ValueError(f"backend must be one of {NUMERIC_BACKENDS}, got {backend!r}")
+    if backend == "auto":
+        return "array" if numpy is None else "numpy"
+    if backend == "numpy" and numpy is None:
+        raise ImportError("The numpy backend requires numpy to be installed.")
+    return backend
+
+
+def _pack_array(values: Iterable[T_NUMBER]):
+    """Pack numbers into ``array('q')``, widening to ``array('d')`` at the first float."""
+    iterator = iter(values)
+    buffer = array("q")
+    while True:
+        chunk = list(itertools.islice(iterator, _PACK_CHUNK_SIZE))
+        if not chunk:
+            return buffer
+        try:
+            # Building a new array keeps ``buffer`` intact when the chunk does not fit.
+            buffer.extend(array(buffer.typecode, chunk))
+            continue
+        except TypeError:
+            if buffer.typecode == "d":
+                raise
+        except OverflowError:
+            # Integers beyond 64 bits stay boxed so they are not rounded.
+            return [*buffer, *chunk, *iterator]
+        buffer = array("d", buffer)
+        buffer.extend(array("d", chunk))
+
+
+def pack_numbers(values: Iterable[T_NUMBER],
+                 backend: str = "array") -> Sequence[T_NUMBER]:
+    """
+    Store numbers in a compact buffer.
+
+    Integers are packed in a ``array('q')`` and any float widens the whole buffer to ``array('d')``, 8 bytes per
+    value instead of a boxed object per item. The ``"numpy"`` backend wraps the same buffer in an ``ndarray``
+    without copying it. Integers that do not fit in 64 bits are kept in a list.
+
+    e.g:
+    >>> pack_numbers([1, 2, 3])
+    array('q', [1, 2, 3])
+    >>> pack_numbers([1, 2.5])
+    array('d', [1.0, 2.5])
+
+    Args:
+        values: Iterable of ints and floats, read once.
+        backend: ``"array"``, ``"numpy"``, ``"list"`` or ``"auto"``. Default is ``"array"``.
+
+    Returns:
+        Sequence: The packed values.
+
+    Raises:
+        TypeError: If a value is not a number.
+    """
+    backend = _resolve_backend(backend)
+    if backend == "list":
+        return list(values)
+    buffer = _pack_array(values)
+    if backend == "numpy" and isinstance(buffer, array):
+        return numpy.frombuffer(buffer, dtype=buffer.typecode) if len(buffer) else numpy.array([], buffer.typecode)
+    return buffer
+
+
+def _buffer_backend(buffer: Any) -> str:
+    """Name of the backend a buffer built by :func:`pack_numbers` belongs to."""
+    if isinstance(buffer, array):
+        return "array"
+    if numpy is not None and isinstance(buffer, numpy.ndarray):
+        return "numpy"
+    return "list"
+
+
+def _iter_buffer(buffer: Sequence[T_NUMBER]):
+    """Iterate over a buffer yielding Python ints and floats."""
+    if _buffer_backend(buffer) == "numpy":
+        for start in range(0, len(buffer), _PACK_CHUNK_SIZE):
+            yield from buffer[start:start + _PACK_CHUNK_SIZE].tolist()
+        return
+    yield from buffer
+
+
+def _is_float(buffer) -> bool:
+    if isinstance(buffer, array):
+        return buffer.typecode == "d"
+    return buffer.dtype.kind == "f"
+
+
+def _buffer_sum(buffer: Sequence[T_NUMBER]) -> T_NUMBER:
+    """Sum of a buffer; floats are summed with ``math.fsum``."""
+    backend = _buffer_backend(buffer)
+    if backend == "list":
+        return sum(buffer)
+    if backend == "numpy" and not _is_float(buffer):
+        return int(buffer.sum())
+    return math.fsum(buffer)
+
+
+def _buffer_mean(buffer: Sequence[T_NUMBER]) -> float:
+    """Arithmetic mean of a buffer."""
+    if _buffer_backend(buffer) == "list":
+        return statistics.mean(buffer)
+    if not len(buffer):
+        raise statistics.StatisticsError("mean requires at least one data point")
+    return _buffer_sum(buffer) / len(buffer)
+
+
+def _buffer_variance(buffer: Sequence[T_NUMBER],
+                     population: bool = False) -> float:
+    """
+    Sample (or population) variance of a buffer.
+
+    Integer buffers are reduced exactly with ``(n * Σx² - (Σx)²) / (n * (n - ddof))``; float buffers use two
+    ``math.fsum`` passes around the mean.
+    """
+    backend = _buffer_backend(buffer)
+    if backend == "list":
+        return statistics.pvariance(buffer) if population else statistics.variance(buffer)
+    n = len(buffer)
+    ddof = 0 if population else 1
+    if n <= ddof or not n:
+        raise statistics.StatisticsError("variance requires at least two data points")
+    if not _is_float(buffer):
+        values = buffer.tolist() if backend == "numpy" else buffer
+        total = sum(values)
+        return (n * sum(value * value for value in values) - total * total) / (n * (n - ddof))
+    if backend == "numpy":
+        return float(buffer.var(ddof=ddof))
+    mean = math.fsum(buffer) / n
+    return math.fsum((value - mean) ** 2 for value in buffer) / (n - ddof)
+
+
+def _buffer_median(buffer: Sequence[T_NUMBER]) -> T_NUMBER:
+    """Median of a buffer, the mean of the two middle values for even sizes."""
+    backend = _buffer_backend(buffer)
+    if backend == "numpy":
+        if not len(buffer):
+            raise statistics.StatisticsError("no median for empty data")
+        ordered = numpy.sort(buffer)
+        n = len(ordered)
+        middle = ordered[n // 2].item()
+        return middle if n % 2 else (ordered[n // 2 - 1].item() + middle) / 2
+    return statistics.median(buffer)
+
+
+def _buffer_argmax(buffer: Sequence[T_NUMBER]) -> int:
+    """Index of the first maximum of a buffer."""
+    if _buffer_backend(buffer) == "numpy":
+        return int(buffer.argmax())
+    return max(range(len(buffer)), key=buffer.__getitem__)
+
+
+def _buffer_map(func: Callable[..., T_NUMBER],
+                buffer: Sequence[T_NUMBER],
+                other: Any = None) -> Sequence[T_NUMBER]:
+    """
+    Apply ``func`` element-wise over a buffer into a new buffer of the same backend.
+
+    Args:
+        func: Unary function, or binary when ``other`` is given. NumPy buffers call it once with the whole
+            arrays, so it must broadcast (e.g. ``operator.add`` or ``numpy.sqrt``).
+        buffer: Buffer built by :func:`pack_numbers`.
+        other: Optional scalar, or sequence of the same length, passed as the second argument.
+
+    Returns:
+        Sequence: The results packed like ``buffer``.
+    """
+    backend = _buffer_backend(buffer)
+    if backend == "numpy":
+        return numpy.asarray(func(buffer) if other is None else func(buffer, other))
+    if other is None:
+        values = map(func, buffer)
+    elif isinstance(other, (int, float)):
+        values = map(func, buffer, itertools.repeat(other, len(buffer)))
+    else:
+        values = map(func, buffer, _iter_buffer(other))
+    return pack_numbers(values, backend)
@@ -19,5 +19,7 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-from ._concurrence import TaskList, sync_to_async, async_to_sync
+from ._concurrence import TaskList, sync_to_async, async_to_sync, AsyncProcessor, amap
+from ._limits import TokenBucket
+from ._metrics import LatencyHistogram, TaskMetrics
 from .process import MultiProcess, Processor
@@ -23,17 +23,19 @@ SOFTWARE.
 
 import asyncio
 import functools
+import inspect
 import os
 import threading
 import time
 from typing import Callable
 from concurrent.futures import Future, ThreadPoolExecutor
 import logging
-from typing import Sequence, Any
+from typing import Sequence, Any, Tuple, Type
 
 from cereja.config.cj_types import T_FUNC
+from ._limits import TokenBucket
 
-__all__ = ["TaskList", "AsyncToSync", "SyncToAsync", "sync_to_async", "async_to_sync"]
+__all__ = ["TaskList", "AsyncToSync", "SyncToAsync", "sync_to_async", "async_to_sync", "AsyncProcessor", "amap"]
 logger = logging.getLogger(__name__)
 
 # intern
@@ -275,5 +277,167 @@ class TaskList:
         return list(map(self.func, self.sequence))
 
 
+class AsyncProcessor:
+    """
+    Bounded-concurrency asyncio pipeline over sync or async iterables.
+
+    At most ``max_concurrency`` calls run at once and input items are pulled
+    lazily, so large or endless sources are never materialized as tasks.
+    Coroutine functions are awaited on the running loop; plain callables run
+    in the loop's default thread executor.
+
+    e.g:
+
+    >>>async def fetch(url):
+    ...    ...
+    >>>async for page in AsyncProcessor(max_concurrency=50, rate=20).map(fetch, urls):
+    ...    print(page)
+
+    Args:
+        max_concurrency: Maximum number of calls in flight.
+        ordered: Yield results in input order (default) or as they complete.
+            In order, completed results waiting for an earlier item count
+            toward ``max_concurrency`` so memory stays bounded.
+        rate: Optional maximum calls started per second, retries included.
+        burst: Calls that may start at once after an idle period (see
+            :class:`TokenBucket`).
+        retries: Extra attempts after a failure matching ``retry_on``.
+        retry_delay: Seconds before the first retry, doubled on each retry.
+        retry_on: Exception types that are retried.
+        return_exceptions: Yield the final exception of a failed item in its
+            place instead of raising it and cancelling pending calls.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int = 100,
+            ordered: bool = True,
+            rate: float = None,
+            burst: float = None,
+            retries: int = 0,
+            retry_delay: float = 0.0,
+            retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+            return_exceptions: bool = False,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than zero")
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        self._max_concurrency = max_concurrency
+        self._ordered = ordered
+        self._rate_limiter = TokenBucket(rate, burst) if rate is not None else None
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._retry_on = retry_on
+        self._return_exceptions = return_exceptions
+
+    async def _call_once(self, func, item, args, kwargs):
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async()
+        if inspect.iscoroutinefunction(func):
+            return await func(item, *args, **kwargs)
+        result = await asyncio.to_thread(func, item, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _call(self, func, item, args, kwargs):
+        delay = self._retry_delay
+        for attempt in range(self._retries + 1):
+            try:
+                return await self._call_once(func, item, args, kwargs)
+            except self._retry_on as err:
+                if attempt == self._retries:
+                    raise
+                logger.warning("Attempt %s failed for item %r: %s", attempt + 1, item, err)
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    @staticmethod
+    async def _iterate(data):
+        if hasattr(data, "__aiter__"):
+            async for item in data:
+                yield item
+        else:
+            for item in data:
+                yield item
+
+    def _result(self, task):
+        if self._return_exceptions and task.exception() is not None:
+            return task.exception()
+        return task.result()
+
+    async def map(self, func, data, *args, **kwargs):
+        """
+        Apply ``func`` to each item of ``data`` and yield the results.
+
+        Args:
+            func: Coroutine function or callable applied to each item.
+            data: Iterable or async iterable of input items.
+            *args: Extra positional arguments passed to ``func``.
+            **kwargs: Extra keyword arguments passed to ``func``.
+
+        Raises:
+            Exception: The first failure, after retries, unless
+                ``return_exceptions`` is set; pending calls are cancelled.
+        """
+        items = self._iterate(data).__aiter__()
+        pending = {}
+        completed = {}
+        next_index = 0
+        next_to_yield = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) + len(completed) < self._max_concurrency:
+                    try:
+                        item = await items.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending[asyncio.ensure_future(self._call(func, item, args, kwargs))] = next_index
+                    next_index += 1
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=pending.get):
+                    index = pending.pop(task)
+                    if not self._ordered:
+                        yield self._result(task)
+                    else:
+                        completed[index] = task
+                while next_to_yield in completed:
+                    yield self._result(completed.pop(next_to_yield))
+                    next_to_yield += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await items.aclose()
+
+    async def run(self, func, data, *args, **kwargs) -> list:
+        """Collect :meth:`map` results into a list."""
+        return [result async for result in self.map(func, data, *args, **kwargs)]
+
+
+def amap(func, data, *args, max_concurrency: int = 100, ordered: bool = True, rate: float = None,
+         burst: float = None, retries: int = 0, retry_delay: float = 0.0,
+         retry_on: Tuple[Type[BaseException], ...] = (Exception,), return_exceptions: bool = False, **kwargs):
+    """
+    Async generator shortcut for ``AsyncProcessor(...).map(func, data, *args, **kwargs)``.
+
+    e.g:
+
+    >>>async for result in amap(fetch, urls, max_concurrency=200, ordered=False):
+    ...    print(result)
+    """
+    processor = AsyncProcessor(max_concurrency=max_concurrency, ordered=ordered, rate=rate, burst=burst,
+                               retries=retries, retry_delay=retry_delay, retry_on=retry_on,
+                               return_exceptions=return_exceptions)
+    return processor.map(func, data, *args, **kwargs)
+
+
 sync_to_async = SyncToAsync
 async_to_sync = AsyncToSync
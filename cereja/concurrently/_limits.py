@@ -0,0 +1,143 @@
+"""
+
+Copyright (c) 2019 The Cereja Project
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import threading
+import time
+
+__all__ = ["TokenBucket"]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at ``rate`` per second up to ``burst``.
+    Each acquisition reserves its tokens immediately, possibly driving the
+    balance negative, and waits for the time it takes to pay that debt; so
+    concurrent callers are spaced exactly at ``rate`` in arrival order and a
+    single bucket can be shared by threads and event loops.
+
+    Args:
+        rate: Tokens added per second.
+        burst: Maximum tokens accumulated while idle. Defaults to ``1``.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        burst = 1 if burst is None else burst
+        if burst < 1:
+            raise ValueError("burst must be at least one")
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """Tokens added per second."""
+        return self._rate
+
+    @property
+    def burst(self):
+        """Maximum number of accumulated tokens."""
+        return self._burst
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take ``tokens`` from the bucket and return the seconds to wait before using them."""
+        if tokens > self._burst:
+            raise ValueError(f"cannot take {tokens} tokens from a bucket with burst {self._burst}")
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            return -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block the calling thread until ``tokens`` are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Await, without blocking the event loop, until ``tokens`` are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class _AIMDController:
+    """
+    Additive-increase/multiplicative-decrease concurrency limit.
+
+    Every healthy completion grows the limit by ``increase / limit`` (about
+    ``increase`` per round of ``limit`` completions). A failure, or a latency
+    above ``target_latency`` (by default ``latency_tolerance`` times the best
+    latency seen), multiplies it by ``decrease``; further decreases wait for
+    a round of completions so a burst of slow results is counted once.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1, increase: float = 1.0,
+                 decrease: float = 0.5, target_latency: float = None, latency_tolerance: float = 2.0):
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self._minimum = minimum
+        self._maximum = max(minimum, maximum)
+        self._limit = float(min(max(initial, minimum), self._maximum))
+        self._increase = increase
+        self._decrease = decrease
+        self._target_latency = target_latency
+        self._latency_tolerance = latency_tolerance
+        self._best_latency = None
+        self._cooldown = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    def _is_congested(self, latency: float) -> bool:
+        if self._target_latency is not None:
+            return latency > self._target_latency
+        if self._best_latency is None or latency < self._best_latency:
+            self._best_latency = latency
+            return False
+        return latency > self._best_latency * self._latency_tolerance
+
+    def record(self, latency: float, failed: bool = False) -> None:
+        """Update the limit with the latency of one completion and whether it failed."""
+        with self._lock:
+            congested = self._is_congested(latency) or failed
+            if self._cooldown > 0:
+                self._cooldown -= 1
+                if congested:
+                    return
+            if congested:
+                self._limit = max(self._minimum, self._limit * self._decrease)
+                self._cooldown = self.limit
+            else:
+                self._limit = min(self._maximum, self._limit + self._increase / self._limit)
@@ -0,0 +1,274 @@
+"""
+
+Copyright (c) 2019 The Cereja Project
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import bisect
+import collections
+import logging
+import math
+import threading
+import time
+
+__all__ = ["LatencyHistogram", "TaskMetrics"]
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Thread-safe histogram of durations in seconds.
+
+    Bucket upper bounds grow geometrically by ``2 ** (1 / 4)`` from one
+    microsecond to about 17 minutes, so quantiles interpolated inside a bucket
+    are within 10% of the observed value. Memory is constant regardless of the
+    number of observations.
+
+    Args:
+        lock: Lock guarding the histogram, to share one with related metrics.
+    """
+
+    _BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(121))
+
+    def __init__(self, lock=None):
+        self._counts = [0] * (len(self._BOUNDS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = 0.0
+        self._lock = threading.Lock() if lock is None else lock
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        with self._lock:
+            self._observe(seconds)
+
+    def _observe(self, seconds):
+        """Record one duration while holding the lock."""
+        self._counts[bisect.bisect_left(self._BOUNDS, seconds)] += 1
+        self._count += 1
+        self._sum += seconds
+        if seconds < self._min:
+            self._min = seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    @property
+    def count(self) -> int:
+        """Number of recorded durations."""
+        return self._count
+
+    def _quantile(self, q, counts, count):
+        rank = q * count
+        seen = 0
+        for bucket, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self._BOUNDS[bucket - 1] if bucket else 0.0
+                upper = self._BOUNDS[bucket] if bucket < len(self._BOUNDS) else self._max
+                value = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(value, self._min), self._max)
+            seen += bucket_count
+        return self._max
+
+    def quantile(self, q: float) -> float:
+        """Estimated ``q`` quantile (``0 <= q <= 1``), ``None`` when empty."""
+        with self._lock:
+            if not self._count:
+                return None
+            return self._quantile(q, list(self._counts), self._count)
+
+    def snapshot(self) -> dict:
+        """
+        Summary of the recorded durations.
+
+        Returns:
+            Dict with ``count``, ``sum``, ``mean``, ``min``, ``max``, ``p50``,
+            ``p95``, ``p99`` and ``buckets``, the cumulative count for each
+            upper bound as Prometheus histograms expect, up to the first bound
+            that holds every observation.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            count, total, minimum, maximum = self._count, self._sum, self._min, self._max
+        if not count:
+            return {"count": 0, "sum": 0.0, "mean": None, "min": None, "max": None,
+                    "p50": None, "p95": None, "p99": None, "buckets": []}
+        buckets = []
+        cumulative = 0
+        for bound, bucket_count in zip(self._BOUNDS, counts):
+            cumulative += bucket_count
+            if cumulative:
+                buckets.append((bound, cumulative))
+            if cumulative == count:
+                break
+        if cumulative < count:
+            buckets.append((math.inf, count))
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count,
+            "min": minimum,
+            "max": maximum,
+            "p50": self._quantile(0.5, counts, count),
+            "p95": self._quantile(0.95, counts, count),
+            "p99": self._quantile(0.99, counts, count),
+            "buckets": buckets,
+        }
+
+
+class TaskMetrics:
+    """
+    Task metrics shared by the concurrency primitives.
+
+    Tracks how long tasks waited for a worker (``queue_wait``) apart from how
+    long they ran (``execution``), so a starved pool can be told from a slow
+    dependency, plus the tasks running now, success/failure counters and the
+    completion throughput over the last ``window`` seconds.
+
+    Args:
+        window: Seconds covered by the sliding throughput.
+    """
+
+    def __init__(self, window: float = 60.0):
+        if window <= 0:
+            raise ValueError("window must be greater than zero")
+        self._window = window
+        self._lock = threading.Lock()
+        self._reporter = None
+        self._stop_reporting = threading.Event()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every metric."""
+        with self._lock:
+            self.queue_wait = LatencyHistogram(self._lock)
+            self.execution = LatencyHistogram(self._lock)
+            self._in_flight = 0
+            self._success = 0
+            self._failure = 0
+            # [second, completions] per second of the sliding window.
+            self._completions = collections.deque()
+            self._started_at = time.monotonic()
+
+    def task_started(self, wait_seconds: float = None) -> None:
+        """Record that one task started after waiting ``wait_seconds`` for a worker."""
+        with self._lock:
+            if wait_seconds is not None:
+                self.queue_wait._observe(max(wait_seconds, 0.0))
+            self._in_flight += 1
+
+    def task_finished(self, seconds: float = None, failed: bool = False, started: bool = True) -> None:
+        """
+        Record that one task ended.
+
+        Args:
+            seconds: Execution time, when the task ran.
+            failed: Whether it raised or could not run.
+            started: Whether :meth:`task_started` was recorded for it.
+        """
+        now = time.monotonic()
+        second = int(now)
+        with self._lock:
+            if seconds is not None:
+                self.execution._observe(seconds)
+            if started:
+                self._in_flight -= 1
+            if failed:
+                self._failure += 1
+            else:
+                self._success += 1
+            if self._completions and self._completions[-1][0] == second:
+                self._completions[-1][1] += 1
+            else:
+                self._completions.append([second, 1])
+                self._prune(now)
+
+    def _prune(self, now):
+        while self._completions and self._completions[0][0] <= now - self._window - 1:
+            self._completions.popleft()
+
+    def snapshot(self, **gauges) -> dict:
+        """
+        Return the current metrics as a dict.
+
+        Args:
+            **gauges: Extra values from the owner, such as queue sizes,
+                merged into the result.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            recent = sum(count for second, count in self._completions if second > now - self._window - 1)
+            span = min(self._window, now - self._started_at)
+            snapshot = {
+                "timestamp": time.time(),
+                "in_flight": self._in_flight,
+                "success": self._success,
+                "failure": self._failure,
+                "throughput": recent / span if span > 0 else 0.0,
+                "throughput_window": self._window,
+            }
+        snapshot["queue_wait"] = self.queue_wait.snapshot()
+        snapshot["execution"] = self.execution.snapshot()
+        snapshot.update(gauges)
+        return snapshot
+
+    def start_reporting(self, callback, interval: float, snapshot=None) -> None:
+        """
+        Call ``callback(snapshot)`` every ``interval`` seconds from a daemon thread.
+
+        Args:
+            callback: Receives each snapshot dict, e.g. to export it.
+            interval: Seconds between calls.
+            snapshot: Optional callable producing the snapshot, defaults to
+                :meth:`snapshot`.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be greater than zero")
+        self.stop_reporting(final=False)
+        snapshot = snapshot or self.snapshot
+        stop = self._stop_reporting = threading.Event()
+
+        def report():
+            while not stop.wait(interval):
+                self._report(callback, snapshot)
+
+        self._reporter = threading.Thread(target=report, daemon=True, name="METRICS_REPORTER")
+        self._reporter.start()
+        self._final_report = (callback, snapshot)
+
+    def stop_reporting(self, final: bool = True) -> None:
+        """Stop the periodic callback, calling it a last time when ``final``."""
+        reporter, self._reporter = self._reporter, None
+        if reporter is None:
+            return
+        self._stop_reporting.set()
+        if reporter is not threading.current_thread():
+            reporter.join()
+        if final:
+            self._report(*self._final_report)
+
+    @staticmethod
+    def _report(callback, snapshot):
+        try:
+            callback(snapshot())
+        except Exception:
+            logger.exception("Metrics callback failed.")
@@ -4,28 +4,34 @@ Thread-based concurrency utilities for batch and queue-driven workloads.
 This module offers three main building blocks:
 
 - ``MultiProcess``: bounded thread execution over an iterable, preserving
-  result order by input index.
+  result order by input index, on a pool of reused worker threads.
 - ``WorkerQueue``: producer/consumer interface that feeds a background queue
   and executes tasks concurrently.
 - ``Processor``: high-throughput processing pipeline based on
   :class:`concurrent.futures.ThreadPoolExecutor`, with optional rate limiting,
-  backpressure and progress reporting.
+  backpressure and progress reporting. ``executor="process"`` runs it on a
+  :class:`concurrent.futures.ProcessPoolExecutor` for CPU-bound functions.
 
 Note:
-    Despite legacy names, these implementations are thread-based and do not
-    spawn operating-system processes.
+    Despite legacy names, ``MultiProcess`` and ``WorkerQueue`` are thread-based
+    and do not spawn operating-system processes.
 """
 
 import abc
+import heapq
+import itertools
 import logging
 import os
 import queue
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from .. import Progress, console
 from ..utils import decorators
+from ._limits import TokenBucket, _AIMDController
+from ._metrics import TaskMetrics
 
 __all__ = ["MultiProcess", "Processor"]
 
@@ -50,17 +56,29 @@ class MultiProcess(_IMultiProcess):
     """
     Execute tasks concurrently using native threads.
 
-    Results are produced in the same order as the input sequence when
-    ``on_result`` is not provided.
+    Tasks are fed through a queue to at most ``max_threads`` long-lived worker
+    threads, started on demand, instead of one thread per item. Results are
+    produced in the same order as the input sequence when ``on_result`` is not
+    provided.
+
+    Queue wait and execution time of every task are recorded in
+    :attr:`metrics`; see :meth:`get_metrics`.
 
     Args:
         max_threads: Maximum number of concurrent worker threads.
         on_result: Optional callback that receives ``(index, result)`` as soon
             as each task completes. When provided, :meth:`map` returns ``None``.
+        metrics_callback: Optional callable receiving :meth:`get_metrics`
+            every ``metrics_interval`` seconds while :meth:`map` runs, and
+            once more when it ends.
+        metrics_interval: Seconds between ``metrics_callback`` calls.
     """
 
-    def __init__(self, max_threads: int, on_result=None):
+    def __init__(self, max_threads: int, on_result=None, metrics_callback=None, metrics_interval=10.0):
         self.max_threads = max_threads
+        self.metrics = TaskMetrics()
+        self._metrics_callback = metrics_callback
+        self._metrics_interval = metrics_interval
         self._active_threads = 0
         self._lock = threading.Lock()
         self._thread_available = threading.Condition(self._lock)
@@ -68,21 +86,49 @@ class MultiProcess(_IMultiProcess):
         self._results = []
         self._exception_err = None
         self._on_result = on_result
+        self._tasks = queue.SimpleQueue()
+        self._workers = []
 
     def _create_task(self, function, value, indx, *args, **kwargs):
-        """Create and start one worker thread after capacity is available."""
+        """Queue one task for the worker threads after capacity is available."""
+        self._submit(indx, self._execute_function_thread, function, value, indx, args, kwargs, time.perf_counter())
+
+    def _submit(self, indx, runner, *runner_args):
+        """Take a worker slot and queue ``runner(*runner_args)``, which must release it."""
         self.wait_for_available_thread()
         if self._terminate:
             self._terminate = False
             raise ChildProcessError(f"Error on task item {indx}: {self._exception_err}")
-        thread = threading.Thread(
-                target=self._execute_function_thread,
-                name=f"Thread-{indx}",
-                args=(function, value, indx, args, kwargs),
-        )
         with self._lock:
             self._active_threads += 1
-        thread.start()
+            # Every queued or running task has a worker; workers only grow up to max_threads.
+            if len(self._workers) < self._active_threads:
+                worker = threading.Thread(
+                        target=self._worker_loop,
+                        name=f"MultiProcess-Worker-{len(self._workers)}",
+                        daemon=True,
+                )
+                self._workers.append(worker)
+                worker.start()
+        self._tasks.put((runner, runner_args))
+
+    def _worker_loop(self):
+        """Run queued tasks until the stop sentinel ``None`` is received."""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            runner, runner_args = task
+            runner(*runner_args)
+
+    def _stop_workers(self):
+        """Stop and join the worker threads once queued tasks are done."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._tasks.put(None)
+        for worker in workers:
+            worker.join()
 
     def _wait_for_all_threads(self):
         """Block until all active worker threads finish."""
@@ -134,16 +180,22 @@ class MultiProcess(_IMultiProcess):
                 worker failure marked execution for termination.
         """
         self._terminate = False
+        if self._metrics_callback is not None:
+            self.metrics.start_reporting(self._metrics_callback, self._metrics_interval, self.get_metrics)
         data = Progress.prog(
                 values,
                 custom_state_func=lambda: f"Threads Running: {self._active_threads}",
         ) if verbose else values
-        for indx, value in enumerate(data):
-            try:
-                self._create_task(function, value, indx, *args, **kwargs)
-            except ChildProcessError:
-                logger.error("Terminating due to an exception in one of the threads. Returning processed data.")
-                break
+        try:
+            for indx, value in enumerate(data):
+                try:
+                    self._create_task(function, value, indx, *args, **kwargs)
+                except ChildProcessError:
+                    logger.error("Terminating due to an exception in one of the threads. Returning processed data.")
+                    break
+        finally:
+            self._stop_workers()
+            self.metrics.stop_reporting()
 
         if self._on_result is None:
             return self._get_response()
@@ -153,25 +205,70 @@ class MultiProcess(_IMultiProcess):
         self._terminate = False
         return None
 
+    def get_metrics(self) -> dict:
+        """
+        Snapshot of :attr:`metrics` plus the worker gauges.
+
+        Returns:
+            Dict with ``queue_wait`` and ``execution`` histogram summaries
+            (``p50``, ``p95``, ``p99``, ``buckets``...), ``in_flight``,
+            ``success``, ``failure``, ``throughput`` (items per second over
+            the last minute), ``active_threads`` and ``max_threads``.
+        """
+        return self.metrics.snapshot(active_threads=self._active_threads, max_threads=self.max_threads)
+
     def wait_for_available_thread(self):
         """Block until there is a free worker slot."""
         with self._thread_available:
             while self._active_threads >= self.max_threads:
                 self._thread_available.wait()
 
-    def _execute_function_thread(self, function, value, indx, args, kwargs):
-        """Run user function in a worker thread and track completion state."""
+    def _run_item(self, function, value, indx, args, kwargs, queued_at):
+        """Run user function for one item; return ``False`` once execution must stop."""
+        if self._terminate:
+            return False
+        started = time.perf_counter()
+        self.metrics.task_started(started - queued_at)
         try:
-            if not self._terminate:
-                self._process_response((indx, function(value, *args, **kwargs)))
+            self._process_response((indx, function(value, *args, **kwargs)))
         except Exception as err:
+            self.metrics.task_finished(time.perf_counter() - started, failed=True)
             logger.exception("Error encountered in worker thread %s", indx)
             self._terminate = True
             self._exception_err = err
+            return False
+        self.metrics.task_finished(time.perf_counter() - started)
+        return True
+
+    def _release_thread(self):
+        with self._thread_available:
+            self._active_threads -= 1
+            self._thread_available.notify_all()
+
+    def _execute_function_thread(self, function, value, indx, args, kwargs, queued_at):
+        """Run user function in a worker thread and track completion state."""
+        try:
+            self._run_item(function, value, indx, args, kwargs, queued_at)
         finally:
-            with self._thread_available:
-                self._active_threads -= 1
-                self._thread_available.notify_all()
+            self._release_thread()
+
+    def _execute_batch_thread(self, function, batch):
+        """
+        Run ``(indx, value, kwargs, queued_at)`` items in one worker slot, each through :meth:`_run_item`.
+
+        Every item of the batch is passed on: after a failure, :class:`MultiProcess` items return without
+        running because the pool is terminating, while :class:`WorkerQueue` only skips the failed item in
+        its reorder buffer and runs the rest of the batch.
+        """
+        try:
+            for indx, value, kwargs, queued_at in batch:
+                self._run_item(function, value, indx, (), kwargs, queued_at)
+        finally:
+            self._release_thread()
+
+
+# Reorder buffer placeholder for items that failed or were never run.
+_SKIPPED = object()
 
 
 class WorkerQueue(MultiProcess):
@@ -179,10 +276,25 @@ class WorkerQueue(MultiProcess):
     Queue-based concurrent worker built on top of :class:`MultiProcess`.
 
     Items are enqueued first and consumed by a dedicated service thread that
-    dispatches them to worker threads.
+    dispatches them to the long-lived worker threads. With ``batch_size``
+    above one, items already waiting in the queue are dispatched together, up
+    to ``batch_size`` per worker task, so batches grow only under load.
+
+    Results are kept in a reorder buffer keyed by input index. :meth:`results`
+    streams them while items are still being put; with
+    ``max_buffered_results`` the dispatcher waits for the consumer, so at most
+    that many items are dispatched and not yet consumed.
+
+    e.g:
+
+    >>>worker = WorkerQueue(parse, max_threads=8, max_buffered_results=1000)
+    >>>producer = threading.Thread(target=lambda: [worker.put(line) for line in lines] and worker.close())
+    >>>for indx, record in worker.results(ordered=True):
+    ...    save(record)
     """
 
-    def __init__(self, func_task, max_threads: int = 1, max_size=-1, on_result=None, **task_kwargs):
+    def __init__(self, func_task, max_threads: int = 1, max_size=-1, on_result=None, batch_size=1,
+                 max_buffered_results=None, metrics_callback=None, metrics_interval=10.0, **task_kwargs):
         """
         Initialize a queue worker.
 
@@ -191,28 +303,151 @@ class WorkerQueue(MultiProcess):
             max_threads: Maximum concurrent worker threads.
             max_size: Maximum queue size (``-1`` means unbounded).
             on_result: Optional callback receiving ``(index, result)``.
+            batch_size: Maximum queued items run by one worker task.
+            max_buffered_results: Optional bound on items dispatched and not
+                yet consumed; only use it when results are consumed while
+                items are put, e.g. with :meth:`results`.
+            metrics_callback: Optional callable receiving :meth:`get_metrics`
+                every ``metrics_interval`` seconds until :meth:`close`.
+            metrics_interval: Seconds between ``metrics_callback`` calls.
             **task_kwargs: Default keyword arguments for each task execution.
         """
-        super().__init__(max_threads, on_result=on_result)
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than zero")
+        if max_buffered_results is not None and max_buffered_results < 1:
+            raise ValueError("max_buffered_results must be greater than zero")
+        super().__init__(max_threads, on_result=on_result, metrics_callback=metrics_callback,
+                         metrics_interval=metrics_interval)
+        self._batch_size = batch_size if max_buffered_results is None else min(batch_size, max_buffered_results)
+        self._max_buffered_results = max_buffered_results
         self._q = queue.Queue(maxsize=max_size)
-        self._results = queue.PriorityQueue()
+        # Reorder buffer: input index -> result (or _SKIPPED), a heap of ready indices and
+        # the count of indices consumed or skipped, which bounds the dispatch window.
+        self._results_ready = threading.Condition()
+        self._buffer = {}
+        self._ready_indices = []
+        self._released = 0
+        self._next_indx = 0
+        self._closed = False
         self._func_task = func_task
         self._task_kwargs = task_kwargs
         self._th_service = threading.Thread(target=self._worker, daemon=True, name="WORKER_QUEUE_SERVICE")
         self._th_service.start()
         self._indx = -1
         self._indx_lock = threading.Lock()
+        if metrics_callback is not None:
+            self.metrics.start_reporting(metrics_callback, metrics_interval, self.get_metrics)
 
     def put(self, item, block=True, timeout=None, **task_kwargs):
         """Enqueue one item for background processing."""
         with self._indx_lock:
+            if self._closed:
+                raise RuntimeError("WorkerQueue is closed")
             self._indx += 1
             indx = self._indx
-        self._q.put((indx, item, task_kwargs if len(task_kwargs) else {}), block=block, timeout=timeout)
+        self._q.put((indx, item, task_kwargs if len(task_kwargs) else {}, time.perf_counter()), block=block,
+                    timeout=timeout)
+
+    def close(self):
+        """Stop accepting items; :meth:`results` ends once every put item is done."""
+        with self._indx_lock, self._results_ready:
+            self._closed = True
+            self._results_ready.notify_all()
+        self.metrics.stop_reporting()
+
+    def get_metrics(self) -> dict:
+        """Snapshot of :attr:`metrics` as in :meth:`MultiProcess.get_metrics`, plus ``queued`` items."""
+        return self.metrics.snapshot(active_threads=self._active_threads, max_threads=self.max_threads,
+                                     queued=self.size)
 
     def _store_response(self, response):
-        """Store responses in a priority queue to preserve index ordering."""
-        self._results.put_nowait(item=response)
+        """Store one response in the reorder buffer and wake waiting consumers."""
+        indx, result = response
+        with self._results_ready:
+            self._buffer[indx] = result
+            heapq.heappush(self._ready_indices, indx)
+            self._results_ready.notify_all()
+
+    def _skip(self, indices):
+        """Mark items that failed or were never run, so ordered results can pass them."""
+        with self._results_ready:
+            for indx in indices:
+                self._buffer[indx] = _SKIPPED
+                self._released += 1
+            self._results_ready.notify_all()
+
+    def _run_item(self, function, value, indx, args, kwargs, queued_at):
+        """Run one item; a failure is logged and skipped without stopping the queue."""
+        started = time.perf_counter()
+        self.metrics.task_started(started - queued_at)
+        try:
+            self._process_response((indx, function(value, *args, **kwargs)))
+        except Exception:
+            self.metrics.task_finished(time.perf_counter() - started, failed=True)
+            logger.exception("Error encountered in worker thread %s", indx)
+            self._skip((indx,))
+            return False
+        self.metrics.task_finished(time.perf_counter() - started)
+        return True
+
+    def _has_pending_work(self):
+        # unfinished_tasks only drops once an item is handed to a worker slot.
+        return self._q.unfinished_tasks > 0 or self._active_threads > 0
+
+    def _pop_ready(self):
+        """Pop the lowest ready result, dropping heap entries already taken in input order. Hold the lock."""
+        while self._ready_indices:
+            indx = heapq.heappop(self._ready_indices)
+            if indx in self._buffer:
+                self._released += 1
+                self._results_ready.notify_all()
+                return indx, self._buffer.pop(indx)
+        return None
+
+    def _pop_next(self):
+        """Pop the result of the next index in input order, if ready. Hold the lock."""
+        if self._next_indx not in self._buffer:
+            return None
+        indx = self._next_indx
+        result = self._buffer.pop(indx)
+        self._next_indx += 1
+        if result is not _SKIPPED:
+            self._released += 1
+            # The heap entry is now stale; drop it while it is on top.
+            while self._ready_indices and self._ready_indices[0] not in self._buffer:
+                heapq.heappop(self._ready_indices)
+        self._results_ready.notify_all()
+        return indx, result
+
+    def results(self, ordered=True, timeout=None):
+        """
+        Iterate over ``(index, result)`` pairs as tasks complete.
+
+        Blocks on a condition variable until results are available and stops
+        after :meth:`close` once every item put has been yielded; failed items
+        are passed over.
+
+        Args:
+            ordered: Yield in input order (default) or as soon as each result
+                is ready.
+            timeout: Optional seconds to wait for the next result before
+                raising :class:`queue.Empty`.
+        """
+        if self._on_result is not None:
+            raise RuntimeError("task results are being sent to the callback defined 'on_result'")
+        pop = self._pop_next if ordered else self._pop_ready
+        while True:
+            with self._results_ready:
+                while True:
+                    ready = pop()
+                    if ready is not None:
+                        break
+                    if self._closed and (self._next_indx if ordered else self._released) > self._indx:
+                        return
+                    if not self._results_ready.wait(timeout):
+                        raise queue.Empty
+            if ready[1] is not _SKIPPED:
+                yield ready
 
     def get_available_response(self, take_indx=False, timeout=30):
         """Return one ready response, waiting up to ``timeout`` seconds."""
@@ -224,28 +459,37 @@ class WorkerQueue(MultiProcess):
         return self.get_available_response(take_indx, timeout=timeout)
 
     def _get(self, take_indx=False, timeout=30):
-        """Internal single-result retrieval helper."""
+        """Internal single-result retrieval helper returning the lowest ready index."""
         if self._on_result is not None:
             raise RuntimeError("task results are being sent to the callback defined 'on_result'")
-        while (self._results.qsize() > 0 or self._active_threads > 0) or not self.is_empty:
-            indx, item = self._results.get(timeout=timeout)
-            self._results.task_done()
-            if take_indx:
-                return indx, item
-            return item
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._results_ready:
+            while True:
+                ready = self._pop_ready()
+                if ready is not None:
+                    return ready if take_indx else ready[1]
+                if not self._has_pending_work():
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._results_ready.wait(remaining)
 
     def _get_response(self, take_indx=False):
         """Wait for queue drain and return all collected responses ordered."""
         if self._on_result is not None:
             raise RuntimeError("task results are being sent to the callback defined 'on_result'")
         self._q.join()
-        self._indx = -1
-        result = []
-        while self._results.qsize() > 0 or self._active_threads > 0:
-            result.append(self._results.get(timeout=1))
-            self._results.task_done()
-        self._results.join()
-        return [val if take_indx else val[-1] for val in sorted(result, key=lambda val: val[0])]
+        self._wait_for_all_threads()
+        with self._results_ready:
+            result = sorted((indx, item) for indx, item in self._buffer.items() if item is not _SKIPPED)
+            self._buffer.clear()
+            self._ready_indices.clear()
+            self._released = 0
+            self._next_indx = 0
+        with self._indx_lock:
+            self._indx = -1
+        return [val if take_indx else val[-1] for val in result]
 
     def get_all_tasks_response(self, take_indx=False):
         """Return all queued task responses after processing completes."""
@@ -258,13 +502,29 @@ class WorkerQueue(MultiProcess):
     def _worker(self):
         """Continuously consume queue items and schedule worker threads."""
         while True:
-            indx, item, kwargs = self._q.get()
+            batch = [self._q.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            indx, item, kwargs, queued_at = batch[0]
             try:
-                self._create_task(self._func_task, item, indx, **kwargs)
+                if self._max_buffered_results is not None:
+                    with self._results_ready:
+                        while batch[-1][0] >= self._released + self._max_buffered_results:
+                            self._results_ready.wait()
+                if len(batch) == 1:
+                    self._submit(indx, self._execute_function_thread, self._func_task, item, indx, (), kwargs,
+                                 queued_at)
+                else:
+                    self._submit(indx, self._execute_batch_thread, self._func_task, batch)
             except ChildProcessError as err:
                 logger.exception("WorkerQueue failed to enqueue item %s: %s", indx, err)
+                self._skip(batch_indx for batch_indx, *_ in batch)
             finally:
-                self._q.task_done()
+                for _ in batch:
+                    self._q.task_done()
 
     @property
     def size(self):
@@ -291,9 +551,47 @@ class WorkerQueue(MultiProcess):
         if isinstance(exc_val, Exception) and not isinstance(exc_val, DeprecationWarning):
             console.error(f"{os.path.basename(exc_tb.tb_frame.f_code.co_filename)}:{exc_tb.tb_lineno}: {exc_val}")
         self._q.join()
+        self.metrics.stop_reporting()
         self._with_context = False
 
 
+# Queued after the last completed future to end the result service.
+_STOP_SERVICE = object()
+
+
+# Adaptive batches aim at this much work per submission.
+_AUTO_BATCH_SECONDS = 0.01
+
+
+def _process_batch(func, items, args, kwargs):
+    """
+    Apply ``func`` to each item of a batch.
+
+    Returns ``(succeeded, result_or_traceback, seconds)`` per item and the wall-clock time the
+    batch started, comparable across processes. Module level so it can be pickled to process pool
+    workers; failures are returned as formatted tracebacks because exceptions are not always
+    picklable.
+    """
+    started_at = time.time()
+    results = []
+    for item in items:
+        started = time.perf_counter()
+        try:
+            results.append((True, func(item, *args, **kwargs), time.perf_counter() - started))
+        except Exception:
+            results.append((False, traceback.format_exc(), time.perf_counter() - started))
+    return results, started_at
+
+
+def _iter_batches(data, get_batch_size):
+    iterator = iter(data)
+    while True:
+        batch = list(itertools.islice(iterator, get_batch_size()))
+        if not batch:
+            return
+        yield batch
+
+
 class Processor:
     """
     Concurrent processing pipeline with bounded in-flight futures.
@@ -303,8 +601,28 @@ class Processor:
     - optional dispatch interval between submissions;
     - optional callback execution on completion;
     - collection of failed input items for retry/inspection.
+
+    With ``executor="process"`` items run in worker processes, so ``func``,
+    its arguments, the items and the results must be picklable, and scripts
+    must guard their entry point with ``if __name__ == "__main__":``. Items
+    are sent in batches to amortize pickling; ``on_result`` still runs in the
+    calling process.
+
+    ``batch_size`` groups items per submission for either executor, which
+    amortizes the future overhead of fine-grained functions; ``"auto"``
+    sizes batches from the measured per-item cost.
+
+    ``rate``/``burst`` (or a shared ``rate_limiter``) cap submissions with a
+    token bucket, and ``adaptive=True`` lets an AIMD controller move the
+    in-flight limit between one item and ``max_in_progress`` following the
+    observed latency and failures.
+
+    Queue wait and execution time of every item are recorded in
+    :attr:`metrics`; see :meth:`get_metrics`.
     """
 
+    _EXECUTORS = ("thread", "process")
+
     def __init__(
             self,
             num_workers=None,
@@ -312,26 +630,79 @@ class Processor:
             interval_seconds=None,
             use_progress=True,
             on_result=None,
+            executor="thread",
+            batch_size=None,
+            rate=None,
+            burst=None,
+            rate_limiter=None,
+            adaptive=False,
+            target_latency=None,
+            metrics_callback=None,
+            metrics_interval=10.0,
     ):
         """
         Initialize a processor instance.
 
         Args:
-            num_workers: Maximum executor workers. Defaults to ``10``.
-            max_in_progress: Upper bound for submitted-not-finished futures.
+            num_workers: Maximum executor workers. Defaults to ``10`` threads
+                or one process per CPU.
+            max_in_progress: Upper bound for submitted-not-finished items.
             interval_seconds: Optional minimum interval between submissions.
             use_progress: Whether to enable ``Progress`` visualization.
             on_result: Optional callback called with each successful result.
+            executor: ``"thread"`` (default) or ``"process"``.
+            batch_size: Items sent to a worker per submission, or ``"auto"``
+                to target about 10 ms of work per batch. Defaults to ``1`` for
+                threads; for processes, enough to keep two batches per worker
+                within ``max_in_progress``.
+            rate: Optional maximum items submitted per second.
+            burst: Items that may be submitted at once after an idle period.
+            rate_limiter: :class:`TokenBucket` shared with other processors,
+                instead of ``rate``/``burst``.
+            adaptive: Adjust the in-flight limit with an AIMD controller,
+                starting from ``num_workers``.
+            target_latency: Per-item seconds above which the adaptive limit
+                shrinks. Defaults to twice the best latency observed.
+            metrics_callback: Optional callable receiving :meth:`get_metrics`
+                every ``metrics_interval`` seconds while :meth:`process`
+                runs, and once more when it stops.
+            metrics_interval: Seconds between ``metrics_callback`` calls.
         """
-        self._num_workers = num_workers if num_workers is not None else 10
+        if executor not in self._EXECUTORS:
+            raise ValueError(f"executor must be one of {self._EXECUTORS}, got {executor!r}")
+        if batch_size is not None and batch_size != "auto" and batch_size < 1:
+            raise ValueError("batch_size must be greater than zero or 'auto'")
+        self._executor_type = executor
+        if num_workers is None:
+            num_workers = 10 if executor == "thread" else os.cpu_count() or 1
+        self._num_workers = num_workers
+        self._auto_batch = batch_size == "auto"
+        self._item_seconds = None
+        if batch_size is None:
+            batch_size = 1 if executor == "thread" else max(1, max_in_progress // (2 * num_workers))
+        self._batch_size = 1 if self._auto_batch else batch_size
         self._on_result = on_result
         self._total_success = 0
         self._max_in_progress = max_in_progress
         self._interval_seconds = 0 if interval_seconds is None else interval_seconds
+        if rate_limiter is None and rate is not None:
+            rate_limiter = TokenBucket(rate, burst)
+        self._rate_limiter = rate_limiter
+        self._adaptive_limit = _AIMDController(
+                initial=num_workers,
+                maximum=max_in_progress,
+                target_latency=target_latency,
+        ) if adaptive else None
         self._process_result_service = None
-        self._future_to_data = set()
+        self._future_to_data = {}
+        self._in_progress_items = 0
         self._future_lock = threading.Lock()
+        # Notified whenever in-flight items are released, wakes the submitting thread.
+        self._capacity_available = threading.Condition(self._future_lock)
         self._metrics_lock = threading.Lock()
+        self.metrics = TaskMetrics()
+        self._metrics_callback = metrics_callback
+        self._metrics_interval = metrics_interval
         self._completed_futures = queue.Queue()
         self._failure_data = []
         self._stopped = False
@@ -347,9 +718,16 @@ class Processor:
 
     @property
     def in_progress_count(self):
-        """Number of futures submitted and not fully handled yet."""
+        """Number of items submitted and not fully handled yet."""
         with self._future_lock:
-            return len(self._future_to_data)
+            return self._in_progress_items
+
+    @property
+    def concurrency_limit(self):
+        """Current in-flight item limit, adjusted over time when ``adaptive``."""
+        if self._adaptive_limit is not None:
+            return self._adaptive_limit.limit
+        return self._max_in_progress
 
     @property
     def total_processed(self):
@@ -371,8 +749,11 @@ class Processor:
         """Create (or recreate) the result-consumer service thread."""
         if self._process_result_service is not None and self._process_result_service.is_alive():
             self._process_result_service.join()
+        # Each service drains its own queue, so a stop sentinel can never reach a later service.
+        self._completed_futures = queue.Queue()
         self._process_result_service = threading.Thread(
                 target=self._process_result,
+                args=(self._completed_futures,),
                 daemon=True,
                 name="PROCESS_RESULT_SERVICE",
         )
@@ -387,40 +768,85 @@ class Processor:
         """Callback attached to each future to queue completion handling."""
         self._completed_futures.put(future)
 
-    def _process_result(self):
-        """Drain completed futures and update metrics/progress state."""
-        while True:
-            if self.stopped and self.in_progress_count == 0 and self._completed_futures.empty():
-                break
-            try:
-                future = self._completed_futures.get(timeout=0.1)
-            except queue.Empty:
+    def _process_result(self, completed_futures):
+        """
+        Drain completed futures and update metrics/progress state.
+
+        Blocks on the completion queue; the stop sentinel ends the service
+        as soon as no submitted item is left in flight.
+        """
+        stopping = False
+        while not stopping or self.in_progress_count > 0:
+            future = completed_futures.get()
+            if future is _STOP_SERVICE:
+                stopping = True
+                completed_futures.task_done()
                 continue
 
+            with self._future_lock:
+                items, submitted_at, submitted_wall = self._future_to_data.get(future, (None, None, None))
+            if items is None:
+                # Submitted before restart_process() reset the in-flight state.
+                completed_futures.task_done()
+                continue
             try:
-                result = future.result()
-                if self._on_result is not None:
-                    self._on_result(result)
-            except Exception:
-                logger.exception("Failed to process future result.")
+                failures = self._handle_batch_result(future, items, submitted_wall)
+                if self._adaptive_limit is not None:
+                    self._adaptive_limit.record((time.monotonic() - submitted_at) / len(items), failures > 0)
             finally:
                 with self._future_lock:
-                    self._future_to_data.discard(future)
+                    del self._future_to_data[future]
+                    self._in_progress_items -= len(items)
+                    self._capacity_available.notify_all()
                 if self._progress is not None:
                     self._progress.show_progress(self.total_processed)
-                self._completed_futures.task_done()
-
-    def _process(self, func, item, *args, **kwargs):
-        """Execute one task, recording success/failure metrics."""
+                completed_futures.task_done()
+
+    def _update_batch_size(self, items, seconds):
+        """Size the next batches so each one takes about ``_AUTO_BATCH_SECONDS``."""
+        item_seconds = seconds / len(items)
+        self._item_seconds = item_seconds if self._item_seconds is None else \
+            0.8 * self._item_seconds + 0.2 * item_seconds
+        # Keep at least two batches in flight and grow at most twofold per batch.
+        limit = max(1, min(self.concurrency_limit // 2, 2 * self._batch_size))
+        self._batch_size = max(1, min(limit, int(_AUTO_BATCH_SECONDS / max(self._item_seconds, 1e-9))))
+
+    def _handle_batch_result(self, future, items, submitted_at):
+        """Record success/failure metrics of one batch, dispatch its results and return its failure count."""
         try:
-            result = func(item, *args, **kwargs)
-            with self._metrics_lock:
-                self._total_success += 1
-            return result
+            outcomes, started_at = future.result()
         except Exception:
-            logger.exception("Failed to process item, storing for review.")
-            with self._metrics_lock:
-                self._failure_data.append(item)
+            # The batch could not run at all, e.g. unpicklable data or a broken process pool.
+            logger.exception("Failed to process a batch of %s items, storing for review.", len(items))
+            for _ in items:
+                self.metrics.task_finished(failed=True, started=False)
+            outcomes = [(False, None, None)] * len(items)
+        else:
+            # Items of a batch also wait for the ones before them.
+            waited = started_at - submitted_at
+            for succeeded, _, seconds in outcomes:
+                self.metrics.task_started(waited)
+                self.metrics.task_finished(seconds, failed=not succeeded)
+                waited += seconds
+            if self._auto_batch:
+                self._update_batch_size(items, sum(seconds for *_, seconds in outcomes))
+
+        failed_items = []
+        for item, (succeeded, value, _) in zip(items, outcomes):
+            if not succeeded:
+                failed_items.append(item)
+                if value is not None:
+                    logger.error("Failed to process item, storing for review.\n%s", value)
+                continue
+            if self._on_result is not None:
+                try:
+                    self._on_result(value)
+                except Exception:
+                    logger.exception("Failed to process future result.")
+        with self._metrics_lock:
+            self._total_success += len(items) - len(failed_items)
+            self._failure_data.extend(failed_items)
+        return len(failed_items)
 
     def get_status(self):
         """Return throughput and counters for progress custom state."""
@@ -431,13 +857,29 @@ class Processor:
             fail = len(self._failure_data)
         processed = success + fail
         return f"{round(processed / elapsed, 2)} items/s " \
-               f"- processing: {self.in_progress_count} " \
+               f"- processing: {self.in_progress_count}/{self.concurrency_limit} " \
                f"- success: {success} " \
                f"- fail: {fail} "
 
+    def get_metrics(self) -> dict:
+        """
+        Snapshot of :attr:`metrics` plus the pipeline gauges.
+
+        Returns:
+            Dict as :meth:`MultiProcess.get_metrics`, where ``in_flight``
+            counts items submitted and not handled yet, plus
+            ``concurrency_limit``, ``batch_size`` and ``num_workers``.
+        """
+        return self.metrics.snapshot(
+                in_flight=self.in_progress_count,
+                concurrency_limit=self.concurrency_limit,
+                batch_size=self._batch_size,
+                num_workers=self._num_workers,
+        )
+
     def process(self, func, data, *args, **kwargs):
         """
-        Process all ``data`` items with bounded thread-pool concurrency.
+        Process all ``data`` items with bounded thread- or process-pool concurrency.
 
         The method blocks until submission and completion handling finish.
         ``on_result`` callbacks are executed by the internal result service
@@ -452,6 +894,8 @@ class Processor:
         self._stopped = False
         self._create_process_result_service().start()
         self._started_at = time.monotonic()
+        if self._metrics_callback is not None:
+            self.metrics.start_reporting(self._metrics_callback, self._metrics_interval, self.get_metrics)
 
         if self._progress is not None:
             try:
@@ -461,27 +905,40 @@ class Processor:
                 pass
             self._progress.start()
 
+        if self._executor_type == "process":
+            executor = ProcessPoolExecutor(max_workers=self._num_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self._num_workers, thread_name_prefix="PROCESS_WORKER")
+
         try:
-            with ThreadPoolExecutor(max_workers=self._num_workers, thread_name_prefix="PROCESS_WORKER") as self._executor:
-                for item in data:
+            with executor as self._executor:
+                for batch in _iter_batches(data, lambda: self._batch_size):
                     start_time = time.monotonic()
-                    future = self._executor.submit(self._process, func, item, *args, **kwargs)
+                    if self._rate_limiter is not None:
+                        for _ in batch:
+                            self._rate_limiter.acquire()
+                    future = self._executor.submit(_process_batch, func, batch, args, kwargs)
                     with self._future_lock:
-                        self._future_to_data.add(future)
+                        self._future_to_data[future] = (batch, time.monotonic(), time.time())
+                        self._in_progress_items += len(batch)
                     future.add_done_callback(self._on_future_done)
 
                     elapsed_time = time.monotonic() - start_time
-                    if elapsed_time < self.interval_seconds:
-                        time.sleep(self.interval_seconds - elapsed_time)
-                    if self.in_progress_count >= self._max_in_progress:
-                        logging.debug(f"In-progress count {self.in_progress_count} exceeds limit {self._max_in_progress}")
-                        while self.in_progress_count >= self._max_in_progress * 0.9:
-                            time.sleep(0.05)
-                            if self.stopped:
-                                break
+                    interval = self.interval_seconds * len(batch)
+                    if elapsed_time < interval:
+                        time.sleep(interval - elapsed_time)
+                    self._wait_for_capacity()
         finally:
             self.stop_process()
 
+    def _wait_for_capacity(self):
+        """Block the submitting thread while the in-flight limit is reached."""
+        with self._capacity_available:
+            if self._in_progress_items >= self.concurrency_limit:
+                logger.debug("In-progress count %s reached limit %s", self._in_progress_items, self.concurrency_limit)
+            while self._in_progress_items >= self.concurrency_limit and not self._stopped:
+                self._capacity_available.wait()
+
     @property
     def stopped(self):
         """Whether the processor has been marked as stopped."""
@@ -490,7 +947,11 @@ class Processor:
     def stop_process(self):
         """Stop result service and progress output, waiting for clean shutdown."""
         self._stopped = True
+        with self._capacity_available:
+            self._capacity_available.notify_all()
         current_thread = threading.current_thread()
+        if self._process_result_service is not None:
+            self._completed_futures.put(_STOP_SERVICE)
         if (
                 self._process_result_service is not None
                 and self._process_result_service.is_alive()
@@ -498,6 +959,7 @@ class Processor:
         ):
             self._process_result_service.join()
         self._process_result_service = None
+        self.metrics.stop_reporting()
         if self._progress is not None:
             self._progress.stop()
 
@@ -509,6 +971,8 @@ class Processor:
         with self._metrics_lock:
             self._failure_data = []
             self._total_success = 0
+        self.metrics.reset()
         with self._future_lock:
             self._future_to_data.clear()
+            self._in_progress_items = 0
         self._create_process_result_service().start()
@@ -1,5 +1,14 @@
+from array import array as _array
 from collections import OrderedDict as _OrderedDict
+from functools import partial as _partial
+import itertools
+import multiprocessing
+import pickle
+from multiprocessing import resource_tracker as _resource_tracker
+from multiprocessing import shared_memory as _shared_memory
+import queue
 import random
+import sys
 
 from cereja.utils import invert_dict, obj_repr
 
@@ -68,54 +77,249 @@ class DictOfList(CJDict):
         super(DictOfList, self).__setitem__(key, value)
 
 
-import cereja as cj
+# Worker-side state set once per process by ``_init_parallel_worker``.
+_worker_function = None
 
 
-class ParallelProcess:
-    _template = """
-from multiprocessing import Pool
-import cereja as cj
+class _SharedPayload:
+    """Reference to a bytes-like item copied into a shared memory segment."""
+
+    __slots__ = ("name", "size", "kind", "typecode")
+
+    def __init__(self, name, size, kind, typecode=None):
+        self.name = name
+        self.size = size
+        self.kind = kind
+        self.typecode = typecode
+
+    def load(self):
+        segment = _shared_memory.SharedMemory(name=self.name)
+        try:
+            data = bytes(segment.buf[:self.size])
+        finally:
+            segment.close()
+        if self.kind == "bytearray":
+            return bytearray(data)
+        if self.kind == "array":
+            return _array(self.typecode, data)
+        return data
+
+
+def _share(value, threshold):
+    """Move large bytes-like ``value`` to shared memory; return ``(payload, segment or None)``."""
+    if isinstance(value, _array):
+        kind, typecode = "array", value.typecode
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        kind, typecode = ("bytearray" if isinstance(value, bytearray) else "bytes"), None
+    else:
+        return value, None
+    view = memoryview(value).cast("B")
+    if view.nbytes < threshold:
+        return value, None
+    segment = _shared_memory.SharedMemory(create=True, size=view.nbytes)
+    segment.buf[:view.nbytes] = view
+    return _SharedPayload(segment.name, view.nbytes, kind, typecode), segment
+
 
-JOB_DIR = cj.Path('{path}')
+def _release_segments(segments):
+    for segment in segments:
+        segment.close()
+        segment.unlink()
 
-globals().update(cj.FileIO.load(JOB_DIR.join('global_scope.pkl')).data)
 
-{func_code}
+def _init_parallel_worker(function, global_scope):
+    global _worker_function
+    if global_scope:
+        function.__globals__.update(global_scope)
+    _worker_function = function
 
-if __name__ == '__main__':
-    with Pool({n_proc}) as p:
-        sequence = cj.FileIO.load(JOB_DIR.join('sequence.pkl')).data
-        result = p.map({func_name}, sequence)
-        cj.FileIO.create(JOB_DIR.join('result.pkl'), result).save(exist_ok=True)
+
+def _put_outcome(done, chunk_indx, ok, value):
+    done.put((chunk_indx, ok, value))
+
+
+def _run_parallel_chunk(chunk):
+    return [_worker_function(item.load() if isinstance(item, _SharedPayload) else item) for item in chunk]
+
+
+class ParallelProcess:
+    """
+    Process pool that maps ``function`` over a sequence.
+
+    Workers are started on first use and reused by every call until
+    :meth:`close`. The input is read lazily in chunks of ``chunk_size`` with at
+    most ``max_pending_chunks`` chunks in flight, so it may be an iterator
+    larger than memory. Bytes-like items (``bytes``, ``bytearray``,
+    ``memoryview`` and ``array.array``) of at least ``shared_memory_threshold``
+    bytes are handed to the workers through shared memory instead of the pool
+    pipe. An exception raised by ``function`` is re-raised by the caller with
+    the worker traceback as its cause.
+
+    ``function`` must be importable by the workers (defined at module level)
+    unless the platform starts them with ``fork``; otherwise lambdas, closures
+    and functions of an interactive ``__main__`` raise ``TypeError`` on
+    creation. ``global_scope`` is merged into the module globals of
+    ``function`` in each worker.
+
+    e.g:
+
+    >>> with ParallelProcess(parse, n_proc=4, chunk_size=64) as pool:
+    ...     for record in pool.imap(open("big.log", "rb")):
+    ...         save(record)
     """
 
-    def __init__(self, function, global_scope: dict = None, n_proc=8):
+    def __init__(self, function, global_scope: dict = None, n_proc=8, chunk_size=1,
+                 max_pending_chunks=None, shared_memory_threshold=1024 * 1024, context=None):
+        if n_proc < 1:
+            raise ValueError("n_proc must be greater than zero")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than zero")
+        if max_pending_chunks is not None and max_pending_chunks < 1:
+            raise ValueError("max_pending_chunks must be greater than zero")
         self.function = function
         self.global_scope = global_scope
         self.n_proc = n_proc
-
-    def run(self, sequence):
-        import sys
-
-        with cj.TempDir() as temp_dir:
-            func_code = cj.Source(self.function)
-            code = self._template.format(
-                    path=temp_dir.path,
-                    func_code=func_code.source_code,
-                    func_name=func_code.name,
-                    n_proc=self.n_proc,
-            )
-            global_scope = (
-                self.global_scope if isinstance(self.global_scope, dict) else {}
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or 2 * n_proc
+        self.shared_memory_threshold = shared_memory_threshold
+        self._context = multiprocessing.get_context(context) if isinstance(context, str) else context
+        self._pool = None
+        self._entered = False
+        if (self._context or multiprocessing.get_context()).get_start_method() != "fork":
+            self._check_importable(function)
+
+    @staticmethod
+    def _check_importable(function):
+        # Without fork the workers unpickle ``function`` by reference, fail on
+        # their own and the pool keeps replacing them, so report it up front.
+        requirement = (f"ParallelProcess needs a function defined at module level to start workers without fork, "
+                       f"not a lambda, a closure or a function of an interactive session; got {function!r}")
+        main = sys.modules.get("__main__")
+        if getattr(function, "__module__", None) == "__main__" and not getattr(main, "__file__", None):
+            raise TypeError(requirement)
+        try:
+            pickle.dumps(function)
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            raise TypeError(requirement) from exc
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Workers must share the parent's resource tracker, otherwise each one
+            # starts its own and reports the attached segments as leaked.
+            _resource_tracker.ensure_running()
+            context = self._context or multiprocessing
+            self._pool = context.Pool(
+                    self.n_proc,
+                    initializer=_init_parallel_worker,
+                    initargs=(self.function, self.global_scope if isinstance(self.global_scope, dict) else {}),
             )
+        return self._pool
+
+    def _chunks(self, sequence):
+        iterator = iter(sequence)
+        while True:
+            chunk = list(itertools.islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def imap(self, sequence, ordered=True):
+        """
+        Lazily yield ``function(item)`` for each item of ``sequence``.
+
+        Args:
+            sequence: Any iterable, consumed as results are yielded.
+            ordered: Yield in input order (default) or chunk by chunk as
+                they complete.
+        """
+        pool = self._get_pool()
+        done = queue.SimpleQueue()
+        chunks = enumerate(self._chunks(sequence))
+        pending = {}
+        completed = {}
+        next_chunk = 0
+        exhausted = False
+        try:
+            while True:
+                # Chunks waiting in the reorder buffer count too, a slow chunk must not let results pile up.
+                while not exhausted and len(pending) + len(completed) < self.max_pending_chunks:
+                    try:
+                        chunk_indx, chunk = next(chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    segments = []
+                    pending[chunk_indx] = segments
+                    payload = []
+                    for item in chunk:
+                        item, segment = _share(item, self.shared_memory_threshold)
+                        payload.append(item)
+                        if segment is not None:
+                            segments.append(segment)
+                    pool.apply_async(
+                            _run_parallel_chunk,
+                            (payload,),
+                            callback=_partial(_put_outcome, done, chunk_indx, True),
+                            error_callback=_partial(_put_outcome, done, chunk_indx, False),
+                    )
+                if not pending:
+                    return
+                chunk_indx, ok, value = done.get()
+                _release_segments(pending.pop(chunk_indx))
+                if not ok:
+                    raise value
+                if not ordered:
+                    yield from value
+                    continue
+                completed[chunk_indx] = value
+                while next_chunk in completed:
+                    yield from completed.pop(next_chunk)
+                    next_chunk += 1
+        finally:
+            # Chunks still running may be reading their segments.
+            while pending:
+                chunk_indx, _, _ = done.get()
+                _release_segments(pending.pop(chunk_indx))
+
+    def map(self, sequence, ordered=True) -> list:
+        """Return ``function(item)`` for every item of ``sequence`` as a list."""
+        return list(self.imap(sequence, ordered=ordered))
 
-            code_path = temp_dir.path.join("code.py")
-            cj.FileIO.create(code_path, code).save()
-            cj.FileIO.create(
-                    temp_dir.path.join("global_scope.pkl"), global_scope
-            ).save()
-            cj.FileIO.create(temp_dir.path.join("sequence.pkl"), sequence).save()
-            cj.run_on_terminal(f"{sys.executable} {code_path.path}")
-            result = cj.FileIO.load(temp_dir.path.join("result.pkl")).data
+    def run(self, sequence):
+        """
+        Alias for :meth:`map` kept for compatibility.
 
-        return result
+        Outside a ``with`` block, workers started by this call are stopped
+        before it returns, as the one-shot API did.
+        """
+        owns_pool = self._pool is None and not self._entered
+        try:
+            return self.map(sequence)
+        finally:
+            if owns_pool:
+                self.close()
+
+    def close(self):
+        """Stop the workers after their current tasks."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        """Stop the workers immediately."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        self._entered = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._entered = False
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
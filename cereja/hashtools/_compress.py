@@ -24,14 +24,16 @@ import bz2
 import lzma
 import struct
 import base64
+import hashlib
 import logging
 from enum import Enum
-from typing import Union, Tuple, Dict, Any, Optional
+from typing import Union, Tuple, Dict, Any, Optional, Sequence, Callable, List
 from collections import Counter
 
 from cereja.hashtools._crypto import CryptoError
+from cereja.hashtools._hash import hash_file
 from cereja.hashtools._crypto import decrypt as _decrypt_data
-from cereja.hashtools._crypto import encrypt as _encrypt_data
+from cereja.hashtools._crypto import _StreamEncryptor, _StreamDecryptor, _replace_file
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ __all__ = [
     "suggest_strategy",
     "get_compression_ratio",
     "CompressionStrategy",
+    "CompressionObjective",
     "CompressionError",
     "CompressionStats",
 ]
@@ -70,6 +73,13 @@ class CompressionStrategy(Enum):
     LZMA = "lzma"          # LZMA
 
 
+class CompressionObjective(Enum):
+    """Objectives used to rank strategies by trial compression of sampled blocks."""
+    RATIO = "ratio"                 # Smallest output
+    SPEED = "speed"                 # Fastest compression (plus writing the output)
+    DECODE_SPEED = "decode_speed"   # Fastest decompression (plus reading the input)
+
+
 class CompressionStats:
     """Statistics about compression operation."""
     
@@ -415,9 +425,44 @@ def _decompress_bitpack(data: bytes) -> bytes:
 # Data Analysis
 # ============================================================================
 
-def analyze_data(data: Union[str, bytes]) -> Dict[str, Any]:
+_DEFAULT_SAMPLE_SIZE = 64 * 1024
+_SAMPLE_BLOCK_COUNT = 8
+# Throughput used to convert output size into time when ranking by speed objectives.
+_REFERENCE_IO_BYTES_PER_SECOND = 100 * 1024 * 1024
+_PURE_PYTHON_TRIAL_FRACTION = 16
+_PURE_PYTHON_STRATEGIES = (
+    CompressionStrategy.DICTIONARY,
+    CompressionStrategy.RLE,
+    CompressionStrategy.DELTA,
+    CompressionStrategy.BITPACK,
+)
+
+
+def _sample_blocks(data: bytes, sample_size: Optional[int] = _DEFAULT_SAMPLE_SIZE) -> List[bytes]:
+    """
+    Return up to ``_SAMPLE_BLOCK_COUNT`` evenly spaced blocks totalling about ``sample_size`` bytes.
+
+    Offsets are aligned to 4 bytes so integer sequences keep their framing. Data smaller than
+    ``sample_size`` (or ``sample_size=None``) is returned whole.
+    """
+    if sample_size is None or len(data) <= sample_size:
+        return [data]
+
+    block_size = max(sample_size // _SAMPLE_BLOCK_COUNT // 4 * 4, 4)
+    block_count = min(_SAMPLE_BLOCK_COUNT, len(data) // block_size)
+    stride = (len(data) - block_size) // max(block_count - 1, 1)
+    offsets = [min(index * stride // 4 * 4, len(data) - block_size) for index in range(block_count)]
+    return [data[offset:offset + block_size] for offset in offsets]
+
+
+def analyze_data(data: Union[str, bytes], sample_size: Optional[int] = _DEFAULT_SAMPLE_SIZE) -> Dict[str, Any]:
     """
     Analyze data characteristics to suggest best compression strategy.
+
+    Args:
+        data: Data to analyze
+        sample_size: Maximum number of bytes inspected. Larger inputs are analyzed through evenly
+                     spaced sampled blocks; None inspects the full input (default: 64 KiB)
     
     Returns:
         Dictionary with analysis results
@@ -428,6 +473,7 @@ def analyze_data(data: Union[str, bytes]) -> Dict[str, Any]:
     if not data:
         return {
             'size': 0,
+            'sample_size': 0,
             'entropy': 0,
             'repetition_ratio': 0,
             'sequential_ratio': 0,
@@ -436,6 +482,8 @@ def analyze_data(data: Union[str, bytes]) -> Dict[str, Any]:
             'suggested_strategy': CompressionStrategy.ZLIB
         }
     
+    total_size = len(data)
+    data = b''.join(_sample_blocks(data, sample_size))
     size = len(data)
     
     # Calculate byte frequency
@@ -466,7 +514,7 @@ def analyze_data(data: Union[str, bytes]) -> Dict[str, Any]:
     
     # Calculate sequential ratio (Delta potential)
     sequential = 0
-    if len(data) >= 8 and len(data) % 4 == 0:
+    if len(data) >= 8 and len(data) % 4 == 0 and total_size % 4 == 0:
         try:
             values = [struct.unpack('>I', data[i:i+4])[0] for i in range(0, len(data), 4)]
             for i in range(1, len(values)):
@@ -482,26 +530,119 @@ def analyze_data(data: Union[str, bytes]) -> Dict[str, Any]:
     unique_ratio = len(freq) / 256
     
     return {
-        'size': size,
+        'size': total_size,
+        'sample_size': size,
         'entropy': entropy,
         'repetition_ratio': repetition_ratio,
         'sequential_ratio': sequential_ratio,
         'unique_ratio': unique_ratio,
-        'max_value': max(data) if data else 0,
+        'max_value': max(freq),
     }
 
 
-def suggest_strategy(data: Union[str, bytes]) -> CompressionStrategy:
+def _get_objective_cost(objective: Union[str, CompressionObjective, Callable[[Dict[str, Any]], float]]
+                        ) -> Callable[[Dict[str, Any]], float]:
+    if callable(objective) and not isinstance(objective, CompressionObjective):
+        return objective
+
+    objective = CompressionObjective(objective)
+    if objective == CompressionObjective.SPEED:
+        return lambda trial: trial['compress_seconds'] + trial['compressed_size'] / _REFERENCE_IO_BYTES_PER_SECOND
+    if objective == CompressionObjective.DECODE_SPEED:
+        return lambda trial: trial['decompress_seconds'] + trial['compressed_size'] / _REFERENCE_IO_BYTES_PER_SECOND
+    return lambda trial: trial['compressed_size']
+
+
+def _get_trial_candidates(analysis: Dict[str, Any]) -> List[CompressionStrategy]:
+    """Strategies worth a trial; the pure Python codecs only run when the analysis suggests they fit."""
+    candidates = [CompressionStrategy.ZLIB, CompressionStrategy.BZ2, CompressionStrategy.LZMA]
+    if analysis['repetition_ratio'] > 0.3:
+        candidates.append(CompressionStrategy.RLE)
+    if analysis['sequential_ratio'] > 0.5:
+        candidates.append(CompressionStrategy.DELTA)
+    if analysis['max_value'] < 128:
+        candidates.append(CompressionStrategy.BITPACK)
+    if analysis['entropy'] < 5:
+        candidates.append(CompressionStrategy.DICTIONARY)
+    return candidates
+
+
+def _trial_strategies(blocks: List[bytes], candidates, level: int = 6) -> List[Dict[str, Any]]:
+    """
+    Compress and decompress the sampled blocks with each candidate, measuring size and time.
+
+    The blocks are joined and compressed in one call so per-stream headers do not dominate the
+    measurement. The pure Python codecs are two orders of magnitude slower than the stdlib ones,
+    so they run on a prefix of each block and their measurements are scaled to the sample size.
+    """
+    import time
+
+    trials = []
+    original_size = sum(len(block) for block in blocks)
+    sample = b''.join(blocks)
+    for strategy in candidates:
+        trial_sample = sample
+        if strategy in _PURE_PYTHON_STRATEGIES:
+            trial_sample = b''.join(block[:max(len(block) // _PURE_PYTHON_TRIAL_FRACTION // 4 * 4, 4)]
+                                    for block in blocks)
+        start = time.perf_counter()
+        compressed, marker = _encode(trial_sample, strategy, level)
+        compress_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        _decode(marker, compressed)
+        decompress_seconds = time.perf_counter() - start
+
+        scale = original_size / len(trial_sample) if trial_sample else 1
+        compressed_size = int((len(compressed) + 1) * scale)
+        trials.append({
+            'strategy': strategy,
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'ratio': original_size / compressed_size if compressed_size else float('inf'),
+            'compress_seconds': compress_seconds * scale,
+            'decompress_seconds': decompress_seconds * scale,
+        })
+    return trials
+
+
+def _select_strategy_by_trial(data: bytes, objective, candidates=None,
+                              sample_size: Optional[int] = _DEFAULT_SAMPLE_SIZE,
+                              level: int = 6) -> CompressionStrategy:
+    cost = _get_objective_cost(objective)
+    blocks = _sample_blocks(data, sample_size)
+    if candidates is None:
+        candidates = _get_trial_candidates(analyze_data(data, sample_size))
+    trials = _trial_strategies(blocks, candidates, level)
+    return min(trials, key=lambda trial: (cost(trial), trial['compress_seconds']))['strategy']
+
+
+def suggest_strategy(data: Union[str, bytes],
+                     objective: Optional[Union[str, CompressionObjective, Callable[[Dict[str, Any]], float]]] = None,
+                     sample_size: Optional[int] = _DEFAULT_SAMPLE_SIZE) -> CompressionStrategy:
     """
     Suggest best compression strategy based on data analysis.
+
+    Only a bounded sample of the input is inspected, so the cost does not grow with the data size.
     
     Args:
         data: Data to analyze
+        objective: None uses the heuristic decision tree over the sample statistics. A
+                   ``CompressionObjective`` (or its value: 'ratio', 'speed', 'decode_speed') runs trial
+                   compressions of the sampled blocks and picks the cheapest strategy. A callable
+                   receives each trial dict (strategy, original_size, compressed_size, ratio,
+                   compress_seconds, decompress_seconds) and returns its cost (default: None)
+        sample_size: Maximum number of bytes inspected; None inspects everything (default: 64 KiB)
     
     Returns:
         Suggested CompressionStrategy
     """
-    analysis = analyze_data(data)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    if objective is not None and data:
+        return _select_strategy_by_trial(data, objective, sample_size=sample_size)
+
+    analysis = analyze_data(data, sample_size)
     
     # Decision tree based on data characteristics
     # Check RLE first for extremely repetitive data
@@ -531,8 +672,61 @@ def suggest_strategy(data: Union[str, bytes]) -> CompressionStrategy:
 # Main Compression Functions
 # ============================================================================
 
+_STRATEGY_MARKERS = {
+    CompressionStrategy.DICTIONARY: b'\x01',
+    CompressionStrategy.RLE: b'\x02',
+    CompressionStrategy.DELTA: b'\x03',
+    CompressionStrategy.BITPACK: b'\x04',
+    CompressionStrategy.ZLIB: b'\x10',
+    CompressionStrategy.BZ2: b'\x11',
+    CompressionStrategy.LZMA: b'\x12',
+}
+
+
+def _encode(data: bytes, strategy: CompressionStrategy, level: int = 6) -> Tuple[bytes, bytes]:
+    """Compress ``data`` with a concrete strategy. Returns ``(compressed, marker)``."""
+    if strategy == CompressionStrategy.DICTIONARY:
+        compressed = _compress_dictionary(data)
+    elif strategy == CompressionStrategy.RLE:
+        compressed = _compress_rle(data)
+    elif strategy == CompressionStrategy.DELTA:
+        compressed = _compress_delta(data)
+    elif strategy == CompressionStrategy.BITPACK:
+        compressed = _compress_bitpack(data)
+    elif strategy == CompressionStrategy.ZLIB:
+        compressed = zlib.compress(data, level=level)
+    elif strategy == CompressionStrategy.BZ2:
+        compressed = bz2.compress(data, compresslevel=level)
+    elif strategy == CompressionStrategy.LZMA:
+        compressed = lzma.compress(data, preset=level)
+    else:
+        raise CompressionError(f"Unknown strategy: {strategy}")
+    return compressed, _STRATEGY_MARKERS[strategy]
+
+
+def _decode(marker: bytes, compressed: bytes) -> bytes:
+    if marker == b'\x01':
+        return _decompress_dictionary(compressed)
+    elif marker == b'\x02':
+        return _decompress_rle(compressed)
+    elif marker == b'\x03':
+        return _decompress_delta(compressed)
+    elif marker == b'\x04':
+        return _decompress_bitpack(compressed)
+    elif marker == b'\x10':
+        return zlib.decompress(compressed)
+    elif marker == b'\x11':
+        return bz2.decompress(compressed)
+    elif marker == b'\x12':
+        return lzma.decompress(compressed)
+    else:
+        raise CompressionError(f"Unknown compression marker: {marker}")
+
+
 def compress(data: Union[str, bytes], strategy: Union[str, CompressionStrategy] = 'auto', 
-             level: int = 6) -> Tuple[bytes, CompressionStats]:
+             level: int = 6,
+             objective: Optional[Union[str, CompressionObjective, Callable[[Dict[str, Any]], float]]] = None
+             ) -> Tuple[bytes, CompressionStats]:
     """
     Compress data using specified or auto-selected strategy.
     
@@ -540,6 +734,8 @@ def compress(data: Union[str, bytes], strategy: Union[str, CompressionStrategy]
         data: Data to compress
         strategy: Compression strategy (default: 'auto')
         level: Compression level 1-9 for stdlib methods (default: 6)
+        objective: Objective or cost callable used by 'auto' to pick the strategy from trial
+                   compressions of sampled blocks, see ``suggest_strategy`` (default: None)
     
     Returns:
         Tuple of (compressed_data, compression_stats)
@@ -566,41 +762,18 @@ def compress(data: Union[str, bytes], strategy: Union[str, CompressionStrategy]
         
         # Auto-select strategy
         if strategy == CompressionStrategy.AUTO:
-            strategy = suggest_strategy(data)
+            strategy = suggest_strategy(data, objective=objective)
+        elif strategy == CompressionStrategy.HYBRID:
+            # Pick among dictionary, RLE and zlib from sampled blocks, then compress once
+            strategy = _select_strategy_by_trial(
+                data,
+                objective if objective is not None else CompressionObjective.RATIO,
+                candidates=(CompressionStrategy.DICTIONARY, CompressionStrategy.RLE, CompressionStrategy.ZLIB),
+                level=level,
+            ) if data else CompressionStrategy.ZLIB
         
         # Compress based on strategy
-        if strategy == CompressionStrategy.DICTIONARY:
-            compressed = _compress_dictionary(data)
-            marker = b'\x01'
-        elif strategy == CompressionStrategy.RLE:
-            compressed = _compress_rle(data)
-            marker = b'\x02'
-        elif strategy == CompressionStrategy.DELTA:
-            compressed = _compress_delta(data)
-            marker = b'\x03'
-        elif strategy == CompressionStrategy.BITPACK:
-            compressed = _compress_bitpack(data)
-            marker = b'\x04'
-        elif strategy == CompressionStrategy.ZLIB:
-            compressed = zlib.compress(data, level=level)
-            marker = b'\x10'
-        elif strategy == CompressionStrategy.BZ2:
-            compressed = bz2.compress(data, compresslevel=level)
-            marker = b'\x11'
-        elif strategy == CompressionStrategy.LZMA:
-            compressed = lzma.compress(data, preset=level)
-            marker = b'\x12'
-        elif strategy == CompressionStrategy.HYBRID:
-            # Try multiple strategies and pick best
-            strategies = [
-                (CompressionStrategy.DICTIONARY, _compress_dictionary(data), b'\x01'),
-                (CompressionStrategy.RLE, _compress_rle(data), b'\x02'),
-                (CompressionStrategy.ZLIB, zlib.compress(data, level=level), b'\x10'),
-            ]
-            best = min(strategies, key=lambda x: len(x[1]))
-            strategy, compressed, marker = best
-        else:
-            raise CompressionError(f"Unknown strategy: {strategy}")
+        compressed, marker = _encode(data, strategy, level)
         
         # Add marker to identify compression method
         result = marker + compressed
@@ -632,47 +805,60 @@ def decompress(data: bytes) -> bytes:
             return b''
         
         # Read marker
-        marker = data[0:1]
-        compressed = data[1:]
-        
-        if marker == b'\x01':
-            return _decompress_dictionary(compressed)
-        elif marker == b'\x02':
-            return _decompress_rle(compressed)
-        elif marker == b'\x03':
-            return _decompress_delta(compressed)
-        elif marker == b'\x04':
-            return _decompress_bitpack(compressed)
-        elif marker == b'\x10':
-            return zlib.decompress(compressed)
-        elif marker == b'\x11':
-            return bz2.decompress(compressed)
-        elif marker == b'\x12':
-            return lzma.decompress(compressed)
-        else:
-            raise CompressionError(f"Unknown compression marker: {marker}")
+        return _decode(data[0:1], data[1:])
     
     except Exception as e:
         raise CompressionError(f"Decompression failed: {str(e)}")
 
 
 _ENCRYPTED_ARCHIVE_MAGIC = b"CJZE\x01\n"
+_ENCRYPTED_STREAM_MAGIC = b"CJZE\x02\n"
+_ENCRYPTED_MAGICS = (_ENCRYPTED_ARCHIVE_MAGIC, _ENCRYPTED_STREAM_MAGIC)
 
 
 def _encrypt_archive_payload(data: bytes, password: Union[str, bytes]) -> bytes:
-    return _ENCRYPTED_ARCHIVE_MAGIC + _encrypt_data(data, password).encode('ascii')
+    import io
 
+    buffer = io.BytesIO()
+    buffer.write(_ENCRYPTED_STREAM_MAGIC)
+    with _StreamEncryptor(buffer, password) as encrypted:
+        encrypted.write(data)
+    return buffer.getvalue()
 
-def _decrypt_archive_payload(data: bytes, password: Optional[Union[str, bytes]]) -> bytes:
-    if not data.startswith(_ENCRYPTED_ARCHIVE_MAGIC):
-        return data
+
+def _open_encrypted_archive(file_obj, password: Optional[Union[str, bytes]]):
+    """
+    Return a reader with the decrypted content of ``file_obj``, positioned after the encrypted marker.
+
+    Archives written with the chunked stream format are decrypted chunk by chunk; the previous
+    single-payload format is still readable.
+    """
+    import io
+
+    magic = file_obj.read(len(_ENCRYPTED_STREAM_MAGIC))
+    if magic not in _ENCRYPTED_MAGICS:
+        raise CompressionError("Invalid encrypted archive marker")
 
     if password is None:
         raise CompressionError("Password is required to decompress encrypted archive")
 
-    encrypted_data = data[len(_ENCRYPTED_ARCHIVE_MAGIC):].decode('ascii')
     try:
-        return _decrypt_data(encrypted_data, password)
+        if magic == _ENCRYPTED_STREAM_MAGIC:
+            return _StreamDecryptor(file_obj, password)
+        return io.BytesIO(_decrypt_data(file_obj.read().decode('ascii'), password))
+    except CryptoError as exc:
+        raise CompressionError(str(exc)) from exc
+
+
+def _decrypt_archive_payload(data: bytes, password: Optional[Union[str, bytes]]) -> bytes:
+    import io
+
+    if not data.startswith(_ENCRYPTED_MAGICS):
+        return data
+
+    reader = _open_encrypted_archive(io.BytesIO(data), password)
+    try:
+        return reader.read()
     except CryptoError as exc:
         raise CompressionError(str(exc)) from exc
 
@@ -680,7 +866,7 @@ def _decrypt_archive_payload(data: bytes, password: Optional[Union[str, bytes]])
 def is_encrypted_archive(file_path: str) -> bool:
     """Return True when file starts with the Cereja encrypted archive marker."""
     with open(file_path, 'rb') as archive:
-        return archive.read(len(_ENCRYPTED_ARCHIVE_MAGIC)) == _ENCRYPTED_ARCHIVE_MAGIC
+        return archive.read(len(_ENCRYPTED_STREAM_MAGIC)) in _ENCRYPTED_MAGICS
 
 
 def compress_file(file_path: str, output_path: str = None,
@@ -812,10 +998,27 @@ def get_compression_ratio(original: Union[str, bytes], compressed: bytes) -> flo
     return len(original) / len(compressed)
 
 
-_DIR_ARCHIVE_MAGIC = b"CJZD\x02"
+_DIR_ARCHIVE_MAGIC_V2 = b"CJZD\x02"
+_DIR_ARCHIVE_MAGIC_V3 = b"CJZD\x03"
+_DIR_ARCHIVE_MAGIC = b"CJZD\x04"
+_DIR_ARCHIVE_MAGICS = (_DIR_ARCHIVE_MAGIC_V2, _DIR_ARCHIVE_MAGIC_V3, _DIR_ARCHIVE_MAGIC)
 _DIR_RECORD_FILE = b"\x01"
+_DIR_RECORD_SOLID = b"\x02"
+# Member whose content is stored elsewhere in the archive or in a base archive, keyed by SHA-256.
+_DIR_RECORD_REF = b"\x03"
+# Trailing zlib compressed JSON: {"base": relative base archive path, "files": {path: [sha256, size, mtime_ns]}}
+_DIR_RECORD_INDEX = b"\x04"
 _DIR_RECORD_END = b"\x00"
 _DIR_CHUNK_SIZE = 1024 * 1024
+# Records whose chunks are independent blocks, each prefixed by its own codec marker.
+_DIR_MARKER_BLOCKS = b'\x20'
+_DIR_BLOCK_STORED = b'\x00'
+# Files up to this size are grouped into solid records of about _DIR_CHUNK_SIZE bytes.
+_DIR_SOLID_FILE_SIZE = 64 * 1024
+_DIR_PROBE_SIZE = 16 * 1024
+_DIR_TRIAL_SIZE = 64 * 1024
+_DIR_STORE_THRESHOLD = 0.95
+_DIR_BLOCK_CANDIDATES = (CompressionStrategy.ZLIB, CompressionStrategy.BZ2, CompressionStrategy.LZMA)
 _DIR_STREAM_MARKERS = {
     CompressionStrategy.ZLIB: b'\x10',
     CompressionStrategy.BZ2: b'\x11',
@@ -845,10 +1048,6 @@ def _iter_directory_files(dir_path: str, exclude_path: str = None, exclude_paths
             yield file_path, rel_path
 
 
-def _get_directory_file_count(dir_path: str, exclude_path: str = None, exclude_paths=None) -> int:
-    return sum(1 for _ in _iter_directory_files(dir_path, exclude_path=exclude_path, exclude_paths=exclude_paths))
-
-
 def _create_progress(enabled: bool, name: str, max_value: Optional[int] = None):
     if not enabled:
         return None
@@ -871,12 +1070,55 @@ def _normalize_dir_strategy(strategy: Union[str, CompressionStrategy]) -> Compre
     return CompressionStrategy.ZLIB
 
 
-def _create_dir_compressor(strategy: CompressionStrategy, level: int = 6):
-    if strategy == CompressionStrategy.BZ2:
-        return bz2.BZ2Compressor(level)
-    if strategy == CompressionStrategy.LZMA:
-        return lzma.LZMACompressor(preset=level)
-    return zlib.compressobj(level)
+def _is_incompressible(block: bytes) -> bool:
+    """Cheap probe: fast zlib over a small sample of the block."""
+    sample = b''.join(_sample_blocks(block, _DIR_PROBE_SIZE))
+    return len(zlib.compress(sample, 1)) >= len(sample) * _DIR_STORE_THRESHOLD
+
+
+def _write_dir_block(archive, block: bytes, strategy: CompressionStrategy,
+                     objective=None, level: int = 6) -> int:
+    """
+    Write one independently decodable block chunk, choosing its codec.
+
+    Blocks the probe finds incompressible, or that do not shrink, are stored raw. With an objective
+    the codec is chosen per block from trial compressions of a small sample.
+    Returns the number of bytes written.
+    """
+    marker, payload = _DIR_BLOCK_STORED, block
+    if block and not _is_incompressible(block):
+        if objective is not None:
+            strategy = _select_strategy_by_trial(block, objective, candidates=_DIR_BLOCK_CANDIDATES,
+                                                 sample_size=_DIR_TRIAL_SIZE, level=level)
+        compressed, compressed_marker = _encode(block, strategy, level)
+        if len(compressed) < len(block):
+            marker, payload = compressed_marker, compressed
+
+    archive.write(struct.pack('>I', len(payload) + 1))
+    archive.write(marker)
+    archive.write(payload)
+    return len(payload) + 5
+
+
+def _write_dir_solid_record(archive, members, strategy: CompressionStrategy, objective=None) -> None:
+    """Write small files ``[(rel_path, data)]`` as one solid record compressed as a single block."""
+    if not members:
+        return
+
+    archive.write(_DIR_RECORD_SOLID)
+    archive.write(struct.pack('>I', len(members)))
+    for rel_path, data in members:
+        _write_dir_member_header(archive, rel_path, len(data))
+    archive.write(_DIR_MARKER_BLOCKS)
+    _write_dir_block(archive, b''.join(data for _, data in members), strategy, objective)
+    archive.write(struct.pack('>I', 0))
+
+
+def _write_dir_member_header(archive, rel_path: str, size: int) -> None:
+    path_bytes = rel_path.encode('utf-8')
+    archive.write(struct.pack('>I', len(path_bytes)))
+    archive.write(path_bytes)
+    archive.write(struct.pack('>Q', size))
 
 
 def _create_dir_decompressor(strategy: CompressionStrategy):
@@ -894,12 +1136,6 @@ def _read_exact(file_obj, size: int) -> bytes:
     return data
 
 
-def _write_sized_chunk(file_obj, data: bytes) -> None:
-    if data:
-        file_obj.write(struct.pack('>I', len(data)))
-        file_obj.write(data)
-
-
 def _read_uint32(file_obj) -> int:
     return struct.unpack('>I', _read_exact(file_obj, 4))[0]
 
@@ -908,36 +1144,338 @@ def _read_uint64(file_obj) -> int:
     return struct.unpack('>Q', _read_exact(file_obj, 8))[0]
 
 
-def _count_dir_stream_files(archive_path: str) -> int:
-    file_count = 0
+def _read_dir_member_header(archive) -> Tuple[str, int]:
+    path_length = _read_uint32(archive)
+    path = _read_exact(archive, path_length).decode('utf-8')
+    return path, _read_uint64(archive)
 
-    with open(archive_path, 'rb') as archive:
-        _read_exact(archive, len(_DIR_ARCHIVE_MAGIC))
 
+def _write_dir_index(archive, index: Dict[str, Any]) -> None:
+    import json
+
+    payload = zlib.compress(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    archive.write(_DIR_RECORD_INDEX)
+    archive.write(struct.pack('>I', len(payload)))
+    archive.write(payload)
+
+
+def _iter_dir_stream_records(archive, on_index=None):
+    """
+    Yield ``(record_type, members, marker)`` for each record of a streaming archive.
+
+    ``members`` is a list of ``(path, size)``. A file record holds one member and its whole payload;
+    a solid record holds several small members stored back to back. The archive position is left at
+    the first chunk of the record, the caller must consume the chunks with ``_skip_dir_stream_chunks``
+    or ``_write_dir_record`` before resuming.
+
+    Reference records have no chunks, their ``marker`` is the SHA-256 hex digest of the content.
+    The index record is not yielded; it is passed to ``on_index`` when given.
+    """
+    import json
+
+    _read_exact(archive, len(_DIR_ARCHIVE_MAGIC))
+
+    while True:
+        record_type = _read_exact(archive, 1)
+        if record_type == _DIR_RECORD_END:
+            break
+        if record_type == _DIR_RECORD_REF:
+            members = [_read_dir_member_header(archive)]
+            yield record_type, members, _read_exact(archive, 32).hex()
+            continue
+        if record_type == _DIR_RECORD_INDEX:
+            payload = _read_exact(archive, _read_uint32(archive))
+            if on_index is not None:
+                on_index(json.loads(zlib.decompress(payload).decode('utf-8')))
+            continue
+        if record_type == _DIR_RECORD_FILE:
+            members = [_read_dir_member_header(archive)]
+        elif record_type == _DIR_RECORD_SOLID:
+            members = [_read_dir_member_header(archive) for _ in range(_read_uint32(archive))]
+        else:
+            raise CompressionError(f"Invalid directory archive record: {record_type}")
+
+        marker = _read_exact(archive, 1)
+        if marker != _DIR_MARKER_BLOCKS and marker not in _DIR_STREAM_STRATEGIES:
+            raise CompressionError(f"Unknown directory compression marker: {marker}")
+
+        yield record_type, members, marker
+
+
+def _skip_dir_stream_chunks(archive) -> None:
+    import os
+
+    while True:
+        chunk_size = _read_uint32(archive)
+        if chunk_size == 0:
+            break
+        # Seeking past the end is detected by the next header read.
+        archive.seek(chunk_size, os.SEEK_CUR)
+
+
+def _iter_dir_record_data(archive, marker: bytes):
+    """Yield the decompressed payload of the record whose chunks start at the archive position."""
+    def iter_chunks():
         while True:
-            record_type = _read_exact(archive, 1)
-            if record_type == _DIR_RECORD_END:
+            chunk_size = _read_uint32(archive)
+            if chunk_size == 0:
                 break
-            if record_type != _DIR_RECORD_FILE:
-                raise CompressionError(f"Invalid directory archive record: {record_type}")
+            yield _read_exact(archive, chunk_size)
+
+    if marker == _DIR_MARKER_BLOCKS:
+        for chunk in iter_chunks():
+            block_marker = chunk[:1]
+            if block_marker == _DIR_BLOCK_STORED:
+                yield chunk[1:]
+            elif block_marker in _DIR_STREAM_STRATEGIES:
+                yield _decode(block_marker, chunk[1:])
+            else:
+                raise CompressionError(f"Unknown directory block marker: {block_marker}")
+        return
+
+    decompressor = _create_dir_decompressor(_DIR_STREAM_STRATEGIES[marker])
+    for chunk in iter_chunks():
+        decompressed_chunk = decompressor.decompress(chunk)
+        if decompressed_chunk:
+            yield decompressed_chunk
+
+    flush = getattr(decompressor, "flush", None)
+    if flush is not None:
+        remaining = flush()
+        if remaining:
+            yield remaining
+
+
+def _write_dir_record(archive, record_type: bytes, marker: bytes, outputs) -> None:
+    """
+    Decompress a record into ``outputs``, a list of ``(file_path, size)`` matching its members.
+
+    A None ``file_path`` decodes the member without writing it. File records write the whole
+    payload, solid records split it by the member sizes.
+    """
+    from contextlib import nullcontext
+
+    data = _iter_dir_record_data(archive, marker)
+    if record_type == _DIR_RECORD_FILE:
+        file_path = outputs[0][0]
+        with open(file_path, 'wb') if file_path is not None else nullcontext() as output_file:
+            for piece in data:
+                if output_file is not None:
+                    output_file.write(piece)
+        return
+
+    pending = memoryview(b'')
+    for file_path, size in outputs:
+        with open(file_path, 'wb') if file_path is not None else nullcontext() as output_file:
+            while size > 0:
+                if not pending:
+                    pending = memoryview(next(data, b''))
+                    if not pending:
+                        raise CompressionError("Unexpected end of directory archive")
+                piece = pending[:size]
+                if output_file is not None:
+                    output_file.write(piece)
+                pending = pending[len(piece):]
+                size -= len(piece)
+
+    for _ in data:
+        pass
+
+
+def _extract_dir_stream_record(archive_path: str, offset: int, record_type: bytes, marker: bytes, outputs) -> int:
+    """Decompress one record starting at ``offset``. Runs inside extraction worker processes."""
+    with open(archive_path, 'rb') as archive:
+        archive.seek(offset)
+        _write_dir_record(archive, record_type, marker, outputs)
+    return sum(1 for file_path, _ in outputs if file_path is not None)
 
-            path_length = _read_uint32(archive)
-            _read_exact(archive, path_length)
-            _read_uint64(archive)
-            marker = _read_exact(archive, 1)
 
-            if marker not in _DIR_STREAM_STRATEGIES:
-                raise CompressionError(f"Unknown directory compression marker: {marker}")
+def _count_dir_stream_files(archive_path: str, include=None, exclude=None) -> int:
+    file_count = 0
 
+    with open(archive_path, 'rb') as archive:
+        for record_type, members, _ in _iter_dir_stream_records(archive):
+            if record_type != _DIR_RECORD_REF:
+                _skip_dir_stream_chunks(archive)
+            file_count += sum(1 for path, _ in members if _is_member_selected(path, include, exclude))
+
+    return file_count
+
+
+def _scan_dir_archive(archive_path: str) -> Tuple[Dict[str, Any], Dict[str, tuple]]:
+    """
+    Walk the record headers of a streaming archive.
+
+    Returns ``(index, locations)`` where ``locations`` maps each stored member path to
+    ``(offset, record_type, marker, position, sizes)``, enough to decode it with ``_write_dir_record``.
+    """
+    index = {}
+    locations = {}
+    with open(archive_path, 'rb') as archive:
+        for record_type, members, marker in _iter_dir_stream_records(archive, on_index=index.update):
+            if record_type == _DIR_RECORD_REF:
+                continue
+            offset = archive.tell()
+            _skip_dir_stream_chunks(archive)
+            sizes = [size for _, size in members]
+            for position, (path, _) in enumerate(members):
+                locations[path] = (offset, record_type, marker, position, sizes)
+    return index, locations
+
+
+def _decrypt_archive_to_temp(archive_path: str, password: Optional[Union[str, bytes]]) -> str:
+    """Decrypt an encrypted archive chunk by chunk into a temporary file next to it."""
+    import os
+
+    temp_archive_path = _create_temp_archive_path(os.path.abspath(archive_path))
+    try:
+        with open(archive_path, 'rb') as archive, open(temp_archive_path, 'wb') as decrypted_archive:
+            reader = _open_encrypted_archive(archive, password)
             while True:
-                chunk_size = _read_uint32(archive)
-                if chunk_size == 0:
+                chunk = reader.read(_DIR_CHUNK_SIZE)
+                if not chunk:
                     break
-                _read_exact(archive, chunk_size)
+                decrypted_archive.write(chunk)
+    except BaseException:
+        os.remove(temp_archive_path)
+        raise
+    return temp_archive_path
 
-            file_count += 1
 
-    return file_count
+def _read_dir_archive_index(archive_path: str, password: Optional[Union[str, bytes]] = None) -> Dict[str, Any]:
+    import os
+
+    temp_archive_path = _decrypt_archive_to_temp(archive_path, password) if is_encrypted_archive(archive_path) else None
+    try:
+        index, _ = _scan_dir_archive(temp_archive_path or archive_path)
+    finally:
+        if temp_archive_path is not None:
+            os.remove(temp_archive_path)
+    if 'files' not in index:
+        raise CompressionError(f"Archive has no content index and cannot be used as base: {archive_path}")
+    return index
+
+
+class _DirArchiveContents:
+    """
+    Locate member contents by SHA-256 in a directory archive and the chain of base archives it references.
+
+    ``read_path`` is the (possibly decrypted) file that is read; ``origin_path`` is where the archive
+    lives, used to resolve the relative base path recorded in its index.
+    """
+
+    def __init__(self, read_path: str, origin_path: str, base_archive: Optional[str] = None,
+                 password: Optional[Union[str, bytes]] = None):
+        import os
+
+        self._read_path = read_path
+        self._password = password
+        self._base = None
+        self._temp_paths = []
+        self.index, locations = _scan_dir_archive(read_path)
+        self._by_hash = {}
+        for path, location in locations.items():
+            entry = self.index.get('files', {}).get(path)
+            if entry is not None:
+                self._by_hash.setdefault(entry[0], (path, location))
+
+        self._base_path = base_archive
+        if self._base_path is None and self.index.get('base'):
+            self._base_path = os.path.join(os.path.dirname(os.path.abspath(origin_path)), self.index['base'])
+
+    def _get_base(self) -> '_DirArchiveContents':
+        import os
+
+        if self._base is None:
+            if self._base_path is None or not os.path.exists(self._base_path):
+                raise CompressionError(f"Base archive is required to restore referenced members: {self._base_path}")
+            read_path = self._base_path
+            if is_encrypted_archive(self._base_path):
+                read_path = _decrypt_archive_to_temp(self._base_path, self._password)
+                self._temp_paths.append(read_path)
+            self._base = _DirArchiveContents(read_path, self._base_path, password=self._password)
+        return self._base
+
+    def write_member(self, digest: str, file_path: str, extracted: Dict[str, str] = None) -> None:
+        """Write the content with ``digest`` to ``file_path``, copying it when already ``extracted``."""
+        import shutil
+
+        found = self._by_hash.get(digest)
+        if found is None:
+            self._get_base().write_member(digest, file_path)
+            return
+
+        path, (offset, record_type, marker, position, sizes) = found
+        if extracted and path in extracted:
+            shutil.copyfile(extracted[path], file_path)
+            return
+
+        outputs = [(file_path if index == position else None, size) for index, size in enumerate(sizes)]
+        with open(self._read_path, 'rb') as archive:
+            archive.seek(offset)
+            _write_dir_record(archive, record_type, marker, outputs)
+
+    def close(self) -> None:
+        import os
+
+        if self._base is not None:
+            self._base.close()
+        for temp_path in self._temp_paths:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def _write_dir_references(references, archive_path: str, origin_path: str, extracted: Dict[str, str],
+                          base_archive: Optional[str], password, on_written=None) -> None:
+    """Restore reference members ``[(digest, file_path)]`` once the stored members are extracted."""
+    if not references:
+        return
+
+    contents = _DirArchiveContents(archive_path, origin_path, base_archive=base_archive, password=password)
+    try:
+        for digest, file_path in references:
+            contents.write_member(digest, file_path, extracted)
+            if on_written is not None:
+                on_written()
+    finally:
+        contents.close()
+
+
+def _get_record_outputs(output_dir: str, members, include=None, exclude=None):
+    """Validate member paths and return ``(outputs, selected_count)`` for ``_write_dir_record``."""
+    import os
+
+    outputs = []
+    for path, size in members:
+        file_path = _safe_archive_path(output_dir, path)
+        if _is_member_selected(path, include, exclude):
+            parent_dir = os.path.dirname(file_path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            outputs.append((file_path, size))
+        else:
+            outputs.append((None, size))
+    return outputs, sum(1 for file_path, _ in outputs if file_path is not None)
+
+
+def _is_member_selected(path: str, include=None, exclude=None) -> bool:
+    import fnmatch
+
+    if include and not any(fnmatch.fnmatchcase(path, pattern) for pattern in include):
+        return False
+    if exclude and any(fnmatch.fnmatchcase(path, pattern) for pattern in exclude):
+        return False
+    return True
+
+
+def _normalize_member_patterns(patterns) -> Optional[Tuple[str, ...]]:
+    if patterns is None:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return tuple(pattern.replace('\\', '/') for pattern in patterns)
 
 
 def _safe_archive_path(output_dir: str, archive_file_path: str) -> str:
@@ -976,12 +1514,25 @@ def _create_temp_archive_path(output_path: str) -> str:
 def compress_dir(dir_path: str, output_path: str = None,
                  strategy: Union[str, CompressionStrategy] = 'auto',
                  verbose: bool = False,
-                 password: Optional[Union[str, bytes]] = None) -> Tuple[str, CompressionStats]:
+                 password: Optional[Union[str, bytes]] = None,
+                 objective: Optional[Union[str, CompressionObjective, Callable[[Dict[str, Any]], float]]] = None,
+                 base_archive: Optional[str] = None
+                 ) -> Tuple[str, CompressionStats]:
     """
     Compress entire directory recursively.
     
     Creates a single compressed archive containing all files and subdirectories.
     Preserves directory structure and relative paths.
+
+    Files are compressed in independent blocks of 1 MiB, each carrying its own codec marker:
+    blocks that a quick probe finds incompressible (media, archives) are stored raw and small
+    files are grouped into shared solid blocks.
+
+    Files are deduplicated by SHA-256: repeated contents are stored once and the other members
+    reference them. With ``base_archive`` the archive is incremental, files whose size and
+    modification time match the base index are referenced without being read, and contents
+    already present in the base are not stored again. Extracting an incremental archive needs
+    its base archives at the same relative location.
     
     Args:
         dir_path: Path to directory to compress
@@ -989,6 +1540,9 @@ def compress_dir(dir_path: str, output_path: str = None,
         strategy: Compression strategy (default: 'auto')
         verbose: Whether to show progress while compressing (default: False)
         password: Password used to encrypt the compressed archive (default: None)
+        objective: When set, the codec of each block is chosen among zlib, bz2 and lzma by trial
+                   compression of a sample of the block, see ``suggest_strategy`` (default: None)
+        base_archive: Previous directory archive this archive is built on (default: None)
     
     Returns:
         Tuple of (output_path, compression_stats)
@@ -1008,8 +1562,6 @@ def compress_dir(dir_path: str, output_path: str = None,
     import time
     from contextlib import nullcontext
 
-    temp_archive_path = None
-    
     try:
         if not os.path.exists(dir_path):
             raise FileNotFoundError(f"Directory not found: {dir_path}")
@@ -1020,19 +1572,36 @@ def compress_dir(dir_path: str, output_path: str = None,
         if output_path is None:
             output_path = dir_path.rstrip('/\\') + '.cjz'
         output_path_abs = os.path.abspath(output_path)
-        archive_write_path = output_path_abs
-        if password is not None:
-            temp_archive_path = _create_temp_archive_path(output_path_abs)
-            archive_write_path = temp_archive_path
-        excluded_paths = [output_path_abs, temp_archive_path]
+        excluded_paths = [output_path_abs]
 
         start_time = time.time()
         total_size = 0
         file_count = 0
         effective_strategy = _normalize_dir_strategy(strategy)
-        marker = _DIR_STREAM_MARKERS[effective_strategy]
-        progress_total = max(_get_directory_file_count(dir_path, exclude_paths=excluded_paths), 1) if verbose else None
-        progress = _create_progress(verbose, "Compressing directory", progress_total)
+
+        base_files = {}
+        base_reference = None
+        if base_archive is not None:
+            if os.path.abspath(base_archive) == output_path_abs:
+                raise CompressionError("Incremental archive cannot overwrite its base archive")
+            base_files = _read_dir_archive_index(base_archive, password)['files']
+            base_reference = os.path.relpath(os.path.abspath(base_archive),
+                                             os.path.dirname(output_path_abs)).replace('\\', '/')
+        base_hashes = {entry[0] for entry in base_files.values()}
+        base_sizes = {entry[1] for entry in base_files.values()}
+
+        entries = []
+        for file_path, rel_path in _iter_directory_files(dir_path, exclude_paths=excluded_paths):
+            try:
+                entries.append((file_path, rel_path, os.stat(file_path)))
+            except OSError:
+                logger.warning("Skipping unreadable file during directory compression: %s", file_path, exc_info=True)
+        size_counts = Counter(file_stat.st_size for _, _, file_stat in entries)
+
+        def known_hashes():
+            return stored_hashes if not base_hashes else stored_hashes | base_hashes
+
+        progress = _create_progress(verbose, "Compressing directory", max(len(entries), 1) if verbose else None)
 
         logger.info(
             "Starting directory compression: %s",
@@ -1044,61 +1613,104 @@ def compress_dir(dir_path: str, output_path: str = None,
             },
         )
 
-        with progress if progress is not None else nullcontext() as active_progress:
-            with open(archive_write_path, 'wb') as archive:
-                archive.write(_DIR_ARCHIVE_MAGIC)
-
-                for file_path, rel_path in _iter_directory_files(dir_path, exclude_paths=excluded_paths):
-                    try:
-                        original_size = os.path.getsize(file_path)
-                        source = open(file_path, 'rb')
-                    except OSError:
-                        logger.warning("Skipping unreadable file during directory compression: %s", file_path, exc_info=True)
-                        continue
-
-                    with source:
-                        path_bytes = rel_path.encode('utf-8')
-                        compressor = _create_dir_compressor(effective_strategy)
-
-                        archive.write(_DIR_RECORD_FILE)
-                        archive.write(struct.pack('>I', len(path_bytes)))
-                        archive.write(path_bytes)
-                        archive.write(struct.pack('>Q', original_size))
-                        archive.write(marker)
-
-                        while True:
-                            chunk = source.read(_DIR_CHUNK_SIZE)
-                            if not chunk:
-                                break
-                            total_size += len(chunk)
-                            _write_sized_chunk(archive, compressor.compress(chunk))
-
-                        _write_sized_chunk(archive, compressor.flush())
-                        archive.write(struct.pack('>I', 0))
+        # The archive is written next to its destination and moved there only once it is complete.
+        temp_path = _create_temp_archive_path(output_path_abs)
+        try:
+            with progress if progress is not None else nullcontext() as active_progress:
+                with open(temp_path, 'wb') as output_file:
+                    archive = output_file
+                    if password is not None:
+                        # Chunks are encrypted and authenticated as the compressor emits them.
+                        output_file.write(_ENCRYPTED_STREAM_MAGIC)
+                        archive = _StreamEncryptor(output_file, password)
+                    archive.write(_DIR_ARCHIVE_MAGIC)
+
+                    solid_members = []
+                    solid_size = 0
+                    index_files = {}
+                    stored_hashes = set()
+
+                    def write_reference(rel_path: str, size: int, digest: str) -> None:
+                        archive.write(_DIR_RECORD_REF)
+                        _write_dir_member_header(archive, rel_path, size)
+                        archive.write(bytes.fromhex(digest))
+
+                    for file_path, rel_path, file_stat in entries:
+                        size, mtime_ns = file_stat.st_size, file_stat.st_mtime_ns
+                        base_entry = base_files.get(rel_path)
+                        digest = None
+                        try:
+                            if base_entry is not None and base_entry[1] == size and base_entry[2] == mtime_ns:
+                                # Unchanged since the base archive, the file is not read at all.
+                                digest = base_entry[0]
+                            elif size > _DIR_SOLID_FILE_SIZE and (size_counts[size] > 1 or size in base_sizes):
+                                # Only files that may be duplicates are hashed before being compressed.
+                                digest = hash_file(file_path)
+                            source = open(file_path, 'rb') if digest is None or digest not in known_hashes() else None
+                        except OSError:
+                            logger.warning("Skipping unreadable file during directory compression: %s", file_path, exc_info=True)
+                            continue
+
+                        if source is None:
+                            write_reference(rel_path, size, digest)
+                            total_size += size
+                        else:
+                            with source:
+                                data = source.read(_DIR_SOLID_FILE_SIZE + 1) if size <= _DIR_SOLID_FILE_SIZE else None
+                                if data is not None and len(data) <= _DIR_SOLID_FILE_SIZE:
+                                    size = len(data)
+                                    digest = hashlib.sha256(data).hexdigest()
+                                    if digest in known_hashes():
+                                        write_reference(rel_path, size, digest)
+                                    else:
+                                        # Small files are grouped so they share one compressed block.
+                                        solid_members.append((rel_path, data))
+                                        solid_size += size
+                                        if solid_size >= _DIR_CHUNK_SIZE:
+                                            _write_dir_solid_record(archive, solid_members, effective_strategy, objective)
+                                            solid_members, solid_size = [], 0
+                                else:
+                                    source.seek(0)
+                                    archive.write(_DIR_RECORD_FILE)
+                                    _write_dir_member_header(archive, rel_path, size)
+                                    archive.write(_DIR_MARKER_BLOCKS)
+
+                                    content_hash = hashlib.sha256()
+                                    size = 0
+                                    while True:
+                                        chunk = source.read(_DIR_CHUNK_SIZE)
+                                        if not chunk:
+                                            break
+                                        size += len(chunk)
+                                        content_hash.update(chunk)
+                                        _write_dir_block(archive, chunk, effective_strategy, objective)
+
+                                    archive.write(struct.pack('>I', 0))
+                                    digest = content_hash.hexdigest()
+                                stored_hashes.add(digest)
+                            total_size += size
+
+                        index_files[rel_path] = [digest, size, mtime_ns]
                         file_count += 1
                         if active_progress is not None:
                             active_progress.show_progress(file_count)
 
-                archive.write(_DIR_RECORD_END)
-
-        if file_count == 0:
-            try:
-                os.remove(archive_write_path)
-            except OSError:
-                # Best effort cleanup of an archive created by this failed call.
-                pass
-            raise CompressionError("No files found in directory")
+                    _write_dir_solid_record(archive, solid_members, effective_strategy, objective)
+                    _write_dir_index(archive, {"base": base_reference, "files": index_files})
+                    archive.write(_DIR_RECORD_END)
+                    if password is not None:
+                        archive.close()
 
-        if password is not None:
-            with open(archive_write_path, 'rb') as archive:
-                archive_data = archive.read()
-            with open(output_path_abs, 'wb') as archive:
-                archive.write(_encrypt_archive_payload(archive_data, password))
+            if file_count == 0:
+                raise CompressionError("No files found in directory")
+            _replace_file(temp_path, output_path_abs)
+        except BaseException:
             try:
-                os.remove(archive_write_path)
+                os.remove(temp_path)
             except OSError:
+                # Best effort cleanup of the partial archive of this failed call.
                 pass
-            temp_archive_path = None
+            raise
 
         elapsed_ms = (time.time() - start_time) * 1000
         compressed_size = os.path.getsize(output_path_abs)
@@ -1127,73 +1739,126 @@ def compress_dir(dir_path: str, output_path: str = None,
     except (FileNotFoundError, NotADirectoryError):
         raise
     except Exception as e:
-        if temp_archive_path is not None:
-            try:
-                os.remove(temp_archive_path)
-            except OSError:
-                pass
         raise CompressionError(f"Directory compression failed: {str(e)}") from e
 
 
-def _decompress_dir_stream(archive_path: str, output_dir: str, verbose: bool = False) -> str:
+def _decompress_dir_stream(archive_path: str, output_dir: str, verbose: bool = False,
+                           workers: Optional[int] = None, include=None, exclude=None,
+                           origin_path: str = None, base_archive: Optional[str] = None,
+                           password: Optional[Union[str, bytes]] = None) -> str:
     import os
     from contextlib import nullcontext
 
     os.makedirs(output_dir, exist_ok=True)
-    file_count = _count_dir_stream_files(archive_path) if verbose else None
+    file_count = _count_dir_stream_files(archive_path, include, exclude) if verbose else None
     progress = _create_progress(verbose, "Decompressing directory", max(file_count or 0, 1))
     extracted_count = 0
+    extracted = {}
+    references = []
+
+    if workers is not None and workers > 1:
+        return _decompress_dir_stream_parallel(archive_path, output_dir, progress, workers, include, exclude,
+                                               origin_path, base_archive, password)
 
     with progress if progress is not None else nullcontext() as active_progress:
+        def advance(count: int = 1):
+            nonlocal extracted_count
+            extracted_count += count
+            if active_progress is not None:
+                active_progress.show_progress(extracted_count)
+
         with open(archive_path, 'rb') as archive:
-            _read_exact(archive, len(_DIR_ARCHIVE_MAGIC))
+            for record_type, members, marker in _iter_dir_stream_records(archive):
+                outputs, selected_count = _get_record_outputs(output_dir, members, include, exclude)
+                if record_type == _DIR_RECORD_REF:
+                    if selected_count:
+                        references.append((marker, outputs[0][0]))
+                    continue
+                if not selected_count:
+                    _skip_dir_stream_chunks(archive)
+                    continue
+
+                _write_dir_record(archive, record_type, marker, outputs)
+                extracted.update((path, file_path) for (path, _), (file_path, _) in zip(members, outputs)
+                                 if file_path is not None)
+                advance(selected_count)
+
+        _write_dir_references(references, archive_path, origin_path or archive_path, extracted,
+                              base_archive, password, on_written=advance)
 
-            while True:
-                record_type = _read_exact(archive, 1)
-                if record_type == _DIR_RECORD_END:
-                    break
-                if record_type != _DIR_RECORD_FILE:
-                    raise CompressionError(f"Invalid directory archive record: {record_type}")
-
-                path_length = _read_uint32(archive)
-                path = _read_exact(archive, path_length).decode('utf-8')
-                _read_uint64(archive)
-                marker = _read_exact(archive, 1)
-
-                if marker not in _DIR_STREAM_STRATEGIES:
-                    raise CompressionError(f"Unknown directory compression marker: {marker}")
-
-                file_path = _safe_archive_path(output_dir, path)
-                parent_dir = os.path.dirname(file_path)
-                if parent_dir:
-                    os.makedirs(parent_dir, exist_ok=True)
-
-                decompressor = _create_dir_decompressor(_DIR_STREAM_STRATEGIES[marker])
-                with open(file_path, 'wb') as output_file:
-                    while True:
-                        chunk_size = _read_uint32(archive)
-                        if chunk_size == 0:
-                            break
-
-                        compressed_chunk = _read_exact(archive, chunk_size)
-                        decompressed_chunk = decompressor.decompress(compressed_chunk)
-                        if decompressed_chunk:
-                            output_file.write(decompressed_chunk)
-
-                    flush = getattr(decompressor, "flush", None)
-                    if flush is not None:
-                        remaining = flush()
-                        if remaining:
-                            output_file.write(remaining)
-
-                extracted_count += 1
-                if active_progress is not None:
-                    active_progress.show_progress(extracted_count)
+    return output_dir
+
+
+def _decompress_dir_stream_parallel(archive_path: str, output_dir: str, progress, workers: int,
+                                    include=None, exclude=None, origin_path: str = None,
+                                    base_archive: Optional[str] = None,
+                                    password: Optional[Union[str, bytes]] = None) -> str:
+    """
+    Extract records with a pool of worker processes.
+
+    The main process only walks the record headers (seeking over the chunk data) and validates the
+    member paths; each record with selected members is dispatched as its archive offset, so the
+    compressed payload is read, decompressed and written by the worker without being pickled
+    between processes. Reference members are restored once the pool is done.
+    """
+    from contextlib import nullcontext
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+    extracted_count = 0
+    max_in_flight = workers * 4
+    pending = set()
+    extracted = {}
+    references = []
+
+    with progress if progress is not None else nullcontext() as active_progress:
+        def advance(count: int = 1):
+            nonlocal extracted_count
+            extracted_count += count
+            if active_progress is not None:
+                active_progress.show_progress(extracted_count)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor, open(archive_path, 'rb') as archive:
+            def collect():
+                nonlocal pending
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    advance(future.result())
+
+            try:
+                for record_type, members, marker in _iter_dir_stream_records(archive):
+                    outputs, selected_count = _get_record_outputs(output_dir, members, include, exclude)
+                    if record_type == _DIR_RECORD_REF:
+                        if selected_count:
+                            references.append((marker, outputs[0][0]))
+                        continue
+                    offset = archive.tell()
+                    _skip_dir_stream_chunks(archive)
+                    if not selected_count:
+                        continue
+
+                    extracted.update((path, file_path) for (path, _), (file_path, _) in zip(members, outputs)
+                                     if file_path is not None)
+                    pending.add(executor.submit(
+                        _extract_dir_stream_record, archive_path, offset, record_type, marker, outputs
+                    ))
+                    if len(pending) >= max_in_flight:
+                        collect()
+
+                while pending:
+                    collect()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        _write_dir_references(references, archive_path, origin_path or archive_path, extracted,
+                              base_archive, password, on_written=advance)
 
     return output_dir
 
 
-def _decompress_dir_legacy(archive_path: str, output_dir: str, verbose: bool = False) -> str:
+def _decompress_dir_legacy(archive_path: str, output_dir: str, verbose: bool = False,
+                           include=None, exclude=None) -> str:
     import os
     import json
     from contextlib import nullcontext
@@ -1216,8 +1881,11 @@ def _decompress_dir_legacy(archive_path: str, output_dir: str, verbose: bool = F
             compressed_content = archive_data[offset:offset+compressed_size]
             offset += compressed_size
 
-            decompressed_content = decompress(compressed_content)
             file_path = _safe_archive_path(output_dir, file_info['path'])
+            if not _is_member_selected(file_info['path'].replace('\\', '/'), include, exclude):
+                continue
+
+            decompressed_content = decompress(compressed_content)
             parent_dir = os.path.dirname(file_path)
             if parent_dir:
                 os.makedirs(parent_dir, exist_ok=True)
@@ -1232,7 +1900,11 @@ def _decompress_dir_legacy(archive_path: str, output_dir: str, verbose: bool = F
 
 def decompress_dir(archive_path: str, output_dir: str = None,
                    verbose: bool = False,
-                   password: Optional[Union[str, bytes]] = None) -> str:
+                   password: Optional[Union[str, bytes]] = None,
+                   workers: Optional[int] = None,
+                   include: Optional[Union[str, Sequence[str]]] = None,
+                   exclude: Optional[Union[str, Sequence[str]]] = None,
+                   base_archive: Optional[str] = None) -> str:
     """
     Decompress directory archive.
     
@@ -1243,6 +1915,13 @@ def decompress_dir(archive_path: str, output_dir: str = None,
         output_dir: Path for extracted directory (if None, removes '.cjz' extension)
         verbose: Whether to show progress while decompressing (default: False)
         password: Password used when archive is encrypted (default: None)
+        workers: Number of worker processes used to decompress and write members in parallel.
+                 None or 1 extracts sequentially (default: None)
+        include: Glob pattern(s) matched against the archive relative paths; only matching
+                 members are decompressed (default: None, all members)
+        exclude: Glob pattern(s) of members to skip without decompressing (default: None)
+        base_archive: Archive holding the members an incremental archive references. By default the
+                      base path recorded by ``compress_dir`` is used, relative to the archive (default: None)
     
     Returns:
         Path to extracted directory
@@ -1256,6 +1935,8 @@ def decompress_dir(archive_path: str, output_dir: str = None,
         >>> # Decompress archive
         >>> extracted_dir = cj.hashtools.decompress_dir('./my_project.cjz')
         >>> print(f"Extracted to {extracted_dir}")
+        >>> # Extract only the python sources using 4 processes
+        >>> cj.hashtools.decompress_dir('./my_project.cjz', workers=4, include='*.py')
     """
     import os
 
@@ -1265,6 +1946,11 @@ def decompress_dir(archive_path: str, output_dir: str = None,
         if not os.path.exists(archive_path):
             raise FileNotFoundError(f"Archive not found: {archive_path}")
 
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be a positive integer, got {workers}")
+        include = _normalize_member_patterns(include)
+        exclude = _normalize_member_patterns(exclude)
+
         if output_dir is None:
             output_dir = _get_default_output_dir(archive_path)
 
@@ -1276,21 +1962,20 @@ def decompress_dir(archive_path: str, output_dir: str = None,
 
         archive_read_path = archive_path
         if is_encrypted_archive(archive_path):
-            with open(archive_path, 'rb') as archive:
-                encrypted_archive = archive.read()
-            decrypted_archive = _decrypt_archive_payload(encrypted_archive, password)
-            temp_archive_path = _create_temp_archive_path(os.path.abspath(archive_path))
-            with open(temp_archive_path, 'wb') as archive:
-                archive.write(decrypted_archive)
+            temp_archive_path = _decrypt_archive_to_temp(archive_path, password)
             archive_read_path = temp_archive_path
 
         with open(archive_read_path, 'rb') as archive:
             magic = archive.read(len(_DIR_ARCHIVE_MAGIC))
 
-        if magic == _DIR_ARCHIVE_MAGIC:
-            result = _decompress_dir_stream(archive_read_path, output_dir, verbose=verbose)
+        if magic in _DIR_ARCHIVE_MAGICS:
+            result = _decompress_dir_stream(archive_read_path, output_dir, verbose=verbose,
+                                            workers=workers, include=include, exclude=exclude,
+                                            origin_path=archive_path, base_archive=base_archive,
+                                            password=password)
         else:
-            result = _decompress_dir_legacy(archive_read_path, output_dir, verbose=verbose)
+            result = _decompress_dir_legacy(archive_read_path, output_dir, verbose=verbose,
+                                            include=include, exclude=exclude)
 
         logger.info(
             "Directory decompression finished: %s",
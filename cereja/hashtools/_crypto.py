@@ -23,6 +23,7 @@ import hmac
 import hashlib
 import secrets
 import base64
+import struct
 from typing import Union, Tuple
 
 __all__ = [
@@ -60,29 +61,199 @@ def _unpad(data: bytes) -> bytes:
     return data[:-padding_length]
 
 
+_XOR_BLOCK_SIZE = 1024 * 1024
+# Multiple of the keystream block (32) and of the base64 group (3) so chunked output stays byte compatible.
+_CIPHER_CHUNK_SIZE = 96 * 1024
+_COUNTER = struct.Struct('>I')
+_BASE64_IGNORED = bytes(
+    c for c in range(256)
+    if c not in b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+)
+
+
 def _xor_bytes(a: bytes, b: bytes) -> bytes:
-    """XOR two byte strings."""
-    return bytes(x ^ y for x, y in zip(a, b))
+    """XOR two byte strings, truncated to the shorter one, as big integers block by block."""
+    length = min(len(a), len(b))
+    a, b = memoryview(a), memoryview(b)
+    chunks = []
+    for start in range(0, length, _XOR_BLOCK_SIZE):
+        end = min(start + _XOR_BLOCK_SIZE, length)
+        value = int.from_bytes(a[start:end], 'big') ^ int.from_bytes(b[start:end], 'big')
+        chunks.append(value.to_bytes(end - start, 'big'))
+    return b''.join(chunks)
 
 
-def _generate_keystream(key: bytes, iv: bytes, length: int) -> bytes:
+def _generate_keystream(key: bytes, iv: bytes, length: int, start_block: int = 0) -> bytes:
     """
     Generate keystream using HMAC-based key expansion.
     This creates a cryptographically secure stream cipher.
+
+    Block ``n`` is ``HMAC-SHA256(key, iv + n)``. The HMAC of ``iv`` is computed once and copied for
+    each block instead of keying a new HMAC object per 32 bytes.
+    ``start_block`` allows generating the stream of a later chunk.
+    """
+    if length <= 0:
+        return b''
+
+    mac_copy, pack = hmac.new(key, iv, hashlib.sha256).copy, _COUNTER.pack
+
+    def block(counter: int) -> bytes:
+        mac = mac_copy()
+        mac.update(pack(counter))
+        return mac.digest()
+
+    block_count = (length + 31) // 32
+    keystream = b''.join([block(counter) for counter in range(start_block, start_block + block_count)])
+    return keystream[:length]
+
+
+def _apply_keystream(key: bytes, iv: bytes, data: bytes, offset: int = 0) -> bytes:
+    """
+    Encrypt/decrypt ``data`` located at byte ``offset`` of the stream.
+
+    Work is done chunk by chunk so the keystream never exceeds ``_CIPHER_CHUNK_SIZE``.
     """
+    view = memoryview(data)
     chunks = []
-    counter = 0
-    remaining = length
-    
-    while remaining > 0:
-        # Use HMAC with counter for key expansion
-        h = hmac.new(key, iv + counter.to_bytes(4, 'big'), hashlib.sha256)
-        digest = h.digest()
-        chunks.append(digest)
-        remaining -= len(digest)
-        counter += 1
-    
-    return b''.join(chunks)[:length]
+    position = 0
+    while position < len(data):
+        absolute = offset + position
+        skip = absolute % 32
+        size = min(_CIPHER_CHUNK_SIZE - skip, len(data) - position)
+        keystream = _generate_keystream(key, iv, skip + size, absolute // 32)[skip:]
+        chunks.append(_xor_bytes(view[position:position + size], keystream))
+        position += size
+    return b''.join(chunks)
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+_STREAM_TAG_SIZE = 32
+_STREAM_FLAG_MORE = b'\x00'
+_STREAM_FLAG_FINAL = b'\x01'
+
+
+def _stream_keys(password: Union[str, bytes], salt: bytes = None) -> Tuple[bytes, bytes, bytes]:
+    key, salt = generate_key(password, salt)
+    return key[:16], key[16:], salt
+
+
+class _StreamEncryptor:
+    """
+    Chunked encrypt-then-MAC writer.
+
+    Layout: ``salt(16) iv(16)`` followed by chunks of ``flag(1) length(4) ciphertext tag(32)``.
+    Each chunk is encrypted with the keystream of nonce ``iv + chunk_index`` and authenticated with
+    ``HMAC(iv + chunk_index + flag + length + ciphertext)``, so chunks cannot be reordered, dropped or
+    truncated. The last chunk carries the final flag.
+    """
+
+    def __init__(self, file_obj, password: Union[str, bytes], chunk_size: int = _STREAM_CHUNK_SIZE):
+        self._file = file_obj
+        self._chunk_size = chunk_size
+        self._encryption_key, hmac_key, salt = _stream_keys(password)
+        self._iv = secrets.token_bytes(16)
+        self._mac = hmac.new(hmac_key, self._iv, hashlib.sha256)
+        self._buffer = bytearray()
+        self._index = 0
+        self._closed = False
+        self._file.write(salt + self._iv)
+
+    def _seal(self, data: bytes, flag: bytes) -> None:
+        nonce = self._iv + self._index.to_bytes(8, 'big')
+        ciphertext = _apply_keystream(self._encryption_key, nonce, data)
+        header = flag + len(ciphertext).to_bytes(4, 'big')
+        mac = self._mac.copy()
+        mac.update(self._index.to_bytes(8, 'big') + header)
+        mac.update(ciphertext)
+        self._file.write(header)
+        self._file.write(ciphertext)
+        self._file.write(mac.digest())
+        self._index += 1
+
+    def write(self, data: bytes) -> int:
+        if self._closed:
+            raise CryptoError("Write to a closed encrypted stream")
+        self._buffer.extend(data)
+        while len(self._buffer) > self._chunk_size:
+            chunk = bytes(self._buffer[:self._chunk_size])
+            del self._buffer[:self._chunk_size]
+            self._seal(chunk, _STREAM_FLAG_MORE)
+        return len(data)
+
+    def close(self) -> None:
+        """Seal the buffered data as the final chunk. The underlying file is not closed."""
+        if not self._closed:
+            self._seal(bytes(self._buffer), _STREAM_FLAG_FINAL)
+            self._buffer.clear()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        return False
+
+
+class _StreamDecryptor:
+    """Reader for the ``_StreamEncryptor`` layout. Chunks are released only after their tag is verified."""
+
+    def __init__(self, file_obj, password: Union[str, bytes]):
+        self._file = file_obj
+        header = self._file.read(32)
+        if len(header) != 32:
+            raise CryptoError("Invalid encrypted stream format")
+        salt, self._iv = header[:16], header[16:]
+        self._encryption_key, hmac_key, _ = _stream_keys(password, salt)
+        self._mac = hmac.new(hmac_key, self._iv, hashlib.sha256)
+        self._buffer = b''
+        self._offset = 0
+        self._index = 0
+        self._finished = False
+
+    def _open_next(self) -> None:
+        header = self._file.read(5)
+        if len(header) != 5:
+            raise CryptoError("Encrypted stream is truncated")
+        flag = header[:1]
+        if flag not in (_STREAM_FLAG_MORE, _STREAM_FLAG_FINAL):
+            raise CryptoError("Invalid encrypted stream format")
+        length = int.from_bytes(header[1:], 'big')
+        ciphertext = self._file.read(length)
+        tag = self._file.read(_STREAM_TAG_SIZE)
+        if len(ciphertext) != length or len(tag) != _STREAM_TAG_SIZE:
+            raise CryptoError("Encrypted stream is truncated")
+
+        mac = self._mac.copy()
+        mac.update(self._index.to_bytes(8, 'big') + header)
+        mac.update(ciphertext)
+        if not hmac.compare_digest(tag, mac.digest()):
+            raise CryptoError("Authentication failed: incorrect password or corrupted data")
+
+        nonce = self._iv + self._index.to_bytes(8, 'big')
+        self._buffer = _apply_keystream(self._encryption_key, nonce, ciphertext)
+        self._offset = 0
+        self._index += 1
+        if flag == _STREAM_FLAG_FINAL:
+            if self._file.read(1):
+                raise CryptoError("Unexpected data after end of encrypted stream")
+            self._finished = True
+
+    def read(self, size: int = -1) -> bytes:
+        parts = []
+        while size < 0 or size > 0:
+            if self._offset >= len(self._buffer):
+                if self._finished:
+                    break
+                self._open_next()
+                continue
+            end = len(self._buffer) if size < 0 else min(len(self._buffer), self._offset + size)
+            parts.append(self._buffer[self._offset:end])
+            if size > 0:
+                size -= end - self._offset
+            self._offset = end
+        return b''.join(parts)
 
 
 def generate_key(password: Union[str, bytes], salt: bytes = None, iterations: int = 100000) -> Tuple[bytes, bytes]:
@@ -139,15 +310,15 @@ def encrypt(data: Union[str, bytes, dict, list], password: Union[str, bytes]) ->
         iv = secrets.token_bytes(16)
         
         # Generate keystream and encrypt
-        keystream = _generate_keystream(encryption_key, iv, len(data))
-        ciphertext = _xor_bytes(data, keystream)
+        ciphertext = _apply_keystream(encryption_key, iv, data)
         
         # Calculate HMAC
-        hmac_obj = hmac.new(hmac_key, salt + iv + ciphertext, hashlib.sha256)
+        hmac_obj = hmac.new(hmac_key, salt + iv, hashlib.sha256)
+        hmac_obj.update(ciphertext)
         hmac_digest = hmac_obj.digest()
         
         # Combine: salt:iv:ciphertext:hmac
-        result = salt + iv + ciphertext + hmac_digest
+        result = b''.join((salt, iv, ciphertext, hmac_digest))
         
         # Encode to base64
         return base64.b64encode(result).decode('ascii')
@@ -181,7 +352,7 @@ def decrypt(encrypted_data: str, password: Union[str, bytes]) -> bytes:
         salt = data[:16]
         iv = data[16:32]
         hmac_digest = data[-32:]
-        ciphertext = data[32:-32]
+        ciphertext = memoryview(data)[32:-32]
         
         # Regenerate key
         key, _ = generate_key(password, salt)
@@ -189,13 +360,14 @@ def decrypt(encrypted_data: str, password: Union[str, bytes]) -> bytes:
         hmac_key = key[16:]
         
         # Verify HMAC
-        expected_hmac = hmac.new(hmac_key, salt + iv + ciphertext, hashlib.sha256).digest()
+        expected_hmac = hmac.new(hmac_key, salt + iv, hashlib.sha256)
+        expected_hmac.update(ciphertext)
+        expected_hmac = expected_hmac.digest()
         if not hmac.compare_digest(hmac_digest, expected_hmac):
             raise CryptoError("Authentication failed: incorrect password or corrupted data")
         
         # Decrypt using stream cipher
-        keystream = _generate_keystream(encryption_key, iv, len(ciphertext))
-        plaintext = _xor_bytes(ciphertext, keystream)
+        plaintext = _apply_keystream(encryption_key, iv, ciphertext)
         
         return plaintext
     
@@ -205,9 +377,73 @@ def decrypt(encrypted_data: str, password: Union[str, bytes]) -> bytes:
         raise CryptoError(f"Decryption failed: {str(e)}")
 
 
+def _replace_file(temp_path: str, output_path: str) -> None:
+    """
+    Move a finished temporary file over ``output_path``.
+
+    ``mkstemp`` creates files readable by their owner only, so the temporary file first takes the mode of the
+    file it replaces, or the mode a plain ``open`` would create (``0o666`` less the umask).
+    """
+    import os
+    import stat
+
+    try:
+        mode = stat.S_IMODE(os.stat(output_path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(temp_path, mode)
+    os.replace(temp_path, output_path)
+
+
+def _iter_base64_file(file_path: str):
+    """Decode a base64 text file chunk by chunk, ignoring characters outside the alphabet like ``b64decode``."""
+    carry = b''
+    with open(file_path, 'rb') as f:
+        while True:
+            text = f.read(_CIPHER_CHUNK_SIZE // 3 * 4)
+            if not text:
+                break
+            text = carry + text.translate(None, _BASE64_IGNORED)
+            usable = len(text) - len(text) % 4
+            carry = text[usable:]
+            if usable:
+                yield base64.b64decode(text[:usable])
+    if carry:
+        yield base64.b64decode(carry)
+
+
+def _split_encrypted_file(file_path: str):
+    """
+    Yield the parts of an ``encrypt_file`` output as ``(kind, data)`` tuples.
+
+    Kinds are ``"header"`` (salt + iv), then ``"ciphertext"`` chunks and finally ``"hmac"``.
+    """
+    header = b''
+    tail = b''
+    for chunk in _iter_base64_file(file_path):
+        if len(header) < 32:
+            missing = 32 - len(header)
+            header += chunk[:missing]
+            chunk = chunk[missing:]
+            if len(header) == 32:
+                yield "header", header
+        data = tail + chunk
+        tail = data[-32:]
+        if len(data) > 32:
+            yield "ciphertext", data[:-32]
+
+    if len(header) < 32 or len(tail) < 32:
+        raise CryptoError("Invalid encrypted data format")
+    yield "hmac", tail
+
+
 def encrypt_file(file_path: str, password: Union[str, bytes], output_path: str = None) -> str:
     """
     Encrypt file contents.
+
+    The file is read, encrypted and base64-encoded in chunks, so memory use does not grow with the file size.
     
     Args:
         file_path: Path to file to encrypt
@@ -221,22 +457,44 @@ def encrypt_file(file_path: str, password: Union[str, bytes], output_path: str =
         CryptoError: If encryption fails
         FileNotFoundError: If input file doesn't exist
     """
+    import os
+
     try:
-        # Read file
-        with open(file_path, 'rb') as f:
-            data = f.read()
-        
-        # Encrypt
-        encrypted = encrypt(data, password)
-        
         # Determine output path
         if output_path is None:
             output_path = file_path + '.enc'
-        
-        # Write encrypted file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(encrypted)
-        
+
+        if os.path.abspath(output_path) == os.path.abspath(file_path):
+            # Writing over the input while reading it, encrypt in memory.
+            with open(file_path, 'rb') as f:
+                encrypted = encrypt(f.read(), password)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(encrypted)
+            return output_path
+
+        with open(file_path, 'rb') as source, open(output_path, 'w', encoding='utf-8') as target:
+            key, salt = generate_key(password)
+            encryption_key, hmac_key = key[:16], key[16:]
+            iv = secrets.token_bytes(16)
+            hmac_obj = hmac.new(hmac_key, salt + iv, hashlib.sha256)
+
+            # 32 bytes of header are kept with the following chunks so writes stay aligned to base64 groups.
+            pending = salt + iv
+            offset = 0
+            while True:
+                chunk = source.read(_CIPHER_CHUNK_SIZE)
+                if not chunk:
+                    break
+                ciphertext = _apply_keystream(encryption_key, iv, chunk, offset)
+                offset += len(chunk)
+                hmac_obj.update(ciphertext)
+                pending += ciphertext
+                usable = len(pending) - len(pending) % 3
+                target.write(base64.b64encode(pending[:usable]).decode('ascii'))
+                pending = pending[usable:]
+
+            target.write(base64.b64encode(pending + hmac_obj.digest()).decode('ascii'))
+
         return output_path
     
     except FileNotFoundError:
@@ -248,6 +506,10 @@ def encrypt_file(file_path: str, password: Union[str, bytes], output_path: str =
 def decrypt_file(file_path: str, password: Union[str, bytes], output_path: str = None) -> str:
     """
     Decrypt file contents.
+
+    The file is read once: the plaintext is written to a temporary file next to ``output_path`` while the HMAC
+    is computed, and only replaces ``output_path`` once the HMAC is verified. On any failure the temporary file
+    is removed and ``output_path`` is left untouched.
     
     Args:
         file_path: Path to encrypted file
@@ -261,24 +523,42 @@ def decrypt_file(file_path: str, password: Union[str, bytes], output_path: str =
         CryptoError: If decryption fails
         FileNotFoundError: If input file doesn't exist
     """
+    import os
+    import tempfile
+
     try:
-        # Read encrypted file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            encrypted_data = f.read()
-        
-        # Decrypt
-        decrypted = decrypt(encrypted_data, password)
-        
         # Determine output path
         if output_path is None:
             if file_path.endswith('.enc'):
                 output_path = file_path[:-4]
             else:
                 output_path = file_path + '.dec'
-        
-        # Write decrypted file
-        with open(output_path, 'wb') as f:
-            f.write(decrypted)
+
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(output_path) + '.', suffix='.tmp', dir=output_dir)
+        try:
+            with os.fdopen(fd, 'wb') as target:
+                hmac_obj = None
+                encryption_key = iv = None
+                offset = 0
+                for kind, data in _split_encrypted_file(file_path):
+                    if kind == "header":
+                        key, _ = generate_key(password, data[:16])
+                        encryption_key, iv = key[:16], data[16:]
+                        hmac_obj = hmac.new(key[16:], data, hashlib.sha256)
+                    elif kind == "ciphertext":
+                        hmac_obj.update(data)
+                        target.write(_apply_keystream(encryption_key, iv, data, offset))
+                        offset += len(data)
+                    elif not hmac.compare_digest(data, hmac_obj.digest()):
+                        raise CryptoError("Authentication failed: incorrect password or corrupted data")
+            _replace_file(temp_path, output_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
         
         return output_path
     
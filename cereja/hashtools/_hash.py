@@ -22,13 +22,23 @@ SOFTWARE.
 import binascii
 import hashlib
 import base64 as _b64
+import os
 import secrets
-from typing import Any, Union
+import stat
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
 
 from cereja import string_to_literal
 from cereja.config.cj_types import T_NUMBER
 
-__all__ = ["md5", "base64_encode", "base64_decode", "is_base64", "random_hash"]
+__all__ = ["md5", "base64_encode", "base64_decode", "is_base64", "random_hash", "hash_file", "hash_dir", "hash_object"]
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Object encodings are buffered and fed to the hash in pieces of about this size.
+_OBJECT_BUFFER_SIZE = 64 * 1024
+_PACK_SIZE = struct.Struct('>Q').pack
+_PACK_FLOAT = struct.Struct('>d').pack
 
 
 def md5(o: Union[list, dict, set, str, T_NUMBER]) -> str:
@@ -68,3 +78,258 @@ def is_base64(content: Union[str, bytes]) -> bool:
 def random_hash(n_bytes: int) -> str:
     """Generate a random hex string with n_bytes of randomness."""
     return secrets.token_hex(nbytes=n_bytes)
+
+
+def _new_hash(algorithm: str):
+    try:
+        return hashlib.new(algorithm)
+    except (TypeError, ValueError):
+        raise ValueError(f"Unsupported hash algorithm: {algorithm!r}") from None
+
+
+def _update_from_file(hasher, file_path: str, chunk_size: int = _HASH_CHUNK_SIZE) -> None:
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+
+
+def hash_file(file_path: str, algorithm: str = 'sha256', chunk_size: int = _HASH_CHUNK_SIZE) -> str:
+    """
+    Return the hex digest of a file, read in chunks into a single reused buffer.
+
+    The algorithm is any name accepted by ``hashlib.new``, e.g. 'sha256', 'blake2b' or 'md5'.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than zero")
+    hasher = _new_hash(algorithm)
+    _update_from_file(hasher, file_path, chunk_size)
+    return hasher.hexdigest()
+
+
+def _file_digest(file_path: str, algorithm: str) -> bytes:
+    hasher = _new_hash(algorithm)
+    _update_from_file(hasher, file_path)
+    return hasher.digest()
+
+
+def hash_dir(dir_path: str, algorithm: str = 'sha256', workers: Optional[int] = None) -> str:
+    """
+    Return a Merkle-style hex digest of a directory tree.
+
+    Each file is hashed on its own and each directory hashes the sorted names, kinds and digests
+    of its children, so the result depends on contents and layout but not on file times or the
+    walk order. Empty directories are part of the tree. Symbolic links, to files or directories,
+    are not followed: they are hashed as link entries from their target path. Other entries that
+    are not regular files (FIFOs, sockets, devices) are never opened: they are hashed as typed
+    entries from their file type only.
+
+    With ``workers`` the file digests are computed by a pool of threads; hashlib releases the GIL
+    while hashing large buffers, so reads and digests overlap.
+    """
+    if not os.path.isdir(dir_path):
+        raise NotADirectoryError(f"Path is not a directory: {dir_path}")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be greater than zero")
+    _new_hash(algorithm)
+
+    directories = {}
+    file_paths = []
+    for root, dir_names, names in os.walk(dir_path):
+        # os.walk lists links to directories in dir_names without descending into them
+        links = [name for name in dir_names if os.path.islink(os.path.join(root, name))]
+        dir_names = sorted(name for name in dir_names if name not in links)
+        file_names, others = [], []
+        for name in names:
+            mode = os.lstat(os.path.join(root, name)).st_mode
+            if stat.S_ISREG(mode):
+                file_names.append(name)
+            elif stat.S_ISLNK(mode):
+                links.append(name)
+            else:
+                # opening a FIFO would block and sockets can not be read
+                others.append((name, stat.S_IFMT(mode)))
+        file_names.sort()
+        directories[root] = (dir_names, file_names, links, others)
+        file_paths.extend(os.path.join(root, name) for name in file_names)
+
+    if workers is None or workers == 1:
+        file_digests = {path: _file_digest(path, algorithm) for path in file_paths}
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = executor.map(_file_digest, file_paths, [algorithm] * len(file_paths))
+            file_digests = dict(zip(file_paths, digests))
+
+    def link_digest(path: str) -> bytes:
+        hasher = _new_hash(algorithm)
+        hasher.update(os.fsencode(os.readlink(path)))
+        return hasher.digest()
+
+    def type_digest(file_type: int) -> bytes:
+        hasher = _new_hash(algorithm)
+        hasher.update(struct.pack('>I', file_type))
+        return hasher.digest()
+
+    def directory_digest(root: str) -> bytes:
+        dir_names, file_names, links, others = directories[root]
+        children = [(name, b'f', file_digests[os.path.join(root, name)]) for name in file_names]
+        children.extend((name, b'd', directory_digest(os.path.join(root, name))) for name in dir_names)
+        children.extend((name, b'l', link_digest(os.path.join(root, name))) for name in links)
+        children.extend((name, b'o', type_digest(file_type)) for name, file_type in others)
+        hasher = _new_hash(algorithm)
+        for name, kind, digest in sorted(children):
+            encoded_name = name.encode('utf-8', 'surrogateescape')
+            hasher.update(kind + struct.pack('>I', len(encoded_name)) + encoded_name + digest)
+        return hasher.digest()
+
+    return directory_digest(dir_path).hex()
+
+
+def _first_item(pair):
+    return pair[0]
+
+
+class _BytesSink(bytearray):
+    def update(self, data) -> None:
+        self.extend(data)
+
+
+class _ObjectEncoder:
+    """
+    Canonical, type tagged encoding of Python values written to a hash in buffered pieces.
+
+    The encoding is type sensitive: values of the same type that compare equal produce the same bytes
+    (dict items are ordered by their encoded keys and set elements by their own digests, and the
+    encoding never goes through ``repr``), but each type has its own tag, so ``1``, ``1.0`` and ``True``
+    encode differently, and floats are encoded by their bits, so ``0.0`` and ``-0.0`` differ too.
+    """
+
+    def __init__(self, hasher, algorithm: str):
+        self._hasher = hasher
+        self._algorithm = algorithm
+        self._buffer = bytearray()
+        self._encoders = {
+            type(None): self._encode_none,
+            bool: self._encode_bool,
+            int: self._encode_int,
+            float: self._encode_float,
+            complex: self._encode_complex,
+            str: self._encode_str,
+            bytes: self._encode_bytes,
+            bytearray: self._encode_bytes,
+            memoryview: self._encode_bytes,
+            list: self._encode_sequence,
+            tuple: self._encode_sequence,
+            dict: self._encode_dict,
+            set: self._encode_set,
+            frozenset: self._encode_set,
+        }
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._hasher.update(self._buffer)
+            self._buffer.clear()
+
+    def _write_sized(self, tag: bytes, data) -> None:
+        buffer = self._buffer
+        buffer += tag
+        buffer += _PACK_SIZE(len(data))
+        if len(data) >= _OBJECT_BUFFER_SIZE:
+            self.flush()
+            self._hasher.update(data)
+        else:
+            buffer += data
+            if len(buffer) >= _OBJECT_BUFFER_SIZE:
+                self.flush()
+
+    def _encode_none(self, value) -> None:
+        self._buffer += b'N'
+
+    def _encode_bool(self, value) -> None:
+        self._buffer += b'T' if value else b'F'
+
+    def _encode_int(self, value) -> None:
+        self._write_sized(b'i', value.to_bytes((value.bit_length() + 8) // 8, 'big', signed=True))
+
+    def _encode_float(self, value) -> None:
+        self._buffer += b'd' + _PACK_FLOAT(value)
+
+    def _encode_complex(self, value) -> None:
+        self._buffer += b'c' + _PACK_FLOAT(value.real) + _PACK_FLOAT(value.imag)
+
+    def _encode_str(self, value) -> None:
+        self._write_sized(b's', value.encode('utf-8', 'surrogatepass'))
+
+    def _encode_bytes(self, value) -> None:
+        self._write_sized(b'b', value.cast('B') if isinstance(value, memoryview) else value)
+
+    def _encode_sequence(self, value) -> None:
+        self._buffer += (b'l' if isinstance(value, list) else b't') + _PACK_SIZE(len(value))
+        for item in value:
+            self.encode(item)
+
+    def _encode_key(self, key) -> bytes:
+        if type(key) is str:
+            encoded = key.encode('utf-8', 'surrogatepass')
+            return b's' + _PACK_SIZE(len(encoded)) + encoded
+        encoder = _ObjectEncoder(_BytesSink(), self._algorithm)
+        encoder.encode(key)
+        encoder.flush()
+        return bytes(encoder._hasher)
+
+    def _encode_dict(self, value) -> None:
+        self._buffer += b'm' + _PACK_SIZE(len(value))
+        encode_key = self._encode_key
+        for encoded_key, item in sorted([(encode_key(key), item) for key, item in value.items()],
+                                        key=_first_item):
+            self._buffer += encoded_key
+            self.encode(item)
+
+    def _digest(self, value) -> bytes:
+        encoder = _ObjectEncoder(_new_hash(self._algorithm), self._algorithm)
+        encoder.encode(value)
+        encoder.flush()
+        return encoder._hasher.digest()
+
+    def _encode_set(self, value) -> None:
+        self._buffer += b'S' + _PACK_SIZE(len(value))
+        for digest in sorted(self._digest(item) for item in value):
+            self._buffer += digest
+
+    def encode(self, value) -> None:
+        encoder = self._encoders.get(type(value))
+        if encoder is None:
+            # Subclasses are encoded as their closest supported base type.
+            for base in type(value).__mro__[1:]:
+                encoder = self._encoders.get(base)
+                if encoder is not None:
+                    break
+            else:
+                raise TypeError(f"Cannot hash object of type {type(value).__name__}")
+        encoder(value)
+        if len(self._buffer) >= _OBJECT_BUFFER_SIZE:
+            self.flush()
+
+
+def hash_object(o: Any, algorithm: str = 'sha256') -> str:
+    """
+    Return the hex digest of a canonical encoding of ``o``.
+
+    Supports None, bool, int, float, complex, str, bytes-like values and lists, tuples, dicts,
+    sets and frozensets of them. The encoding is streamed into the hash, so large containers
+    are never rendered as one string, and dicts or sets with the same items hash equally
+    whatever their insertion order. The encoding is type sensitive: ``1``, ``1.0`` and ``True``,
+    or ``0.0`` and ``-0.0``, hash differently although they compare equal.
+
+    Raises:
+        TypeError: If ``o`` contains a value of an unsupported type
+    """
+    hasher = _new_hash(algorithm)
+    encoder = _ObjectEncoder(hasher, algorithm)
+    encoder.encode(o)
+    encoder.flush()
+    return hasher.hexdigest()
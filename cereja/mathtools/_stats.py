@@ -0,0 +1,315 @@
+"""
+Copyright (c) 2019 The Cereja Project
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import math
+from collections import Counter
+from fractions import Fraction
+from typing import Iterable, Optional, Sequence
+
+from cereja.config.cj_types import T_NUMBER
+
+__all__ = ["P2Quantile", "StreamingStats"]
+
+
+def _interpolate(sorted_values: Sequence[T_NUMBER], q: float) -> T_NUMBER:
+    """Linear interpolation between the order statistics around position ``q * (n - 1)``."""
+    position = q * (len(sorted_values) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    if position == lower:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of the ``q`` quantile in constant memory.
+
+    Implements the P² algorithm (Jain & Chlamtac, 1985): five markers track
+    the minimum, the maximum, the quantile and two midpoints, and are moved
+    with a piecewise-parabolic prediction as values arrive. The result is
+    exact for up to five values.
+
+    Args:
+        q: Quantile to estimate, between 0 and 1.
+    """
+
+    def __init__(self, q: float):
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        self.q = q
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        # Desired position of marker i after n values is 1 + (n - 1) * fraction[i].
+        self._fractions = (0, q / 2, q, (1 + q) / 2, 1)
+        self._count = 0
+
+    def add(self, value: T_NUMBER) -> None:
+        """Account for one value."""
+        heights = self._heights
+        self._count += 1
+        if self._count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+        positions = self._positions
+        if value < heights[0]:
+            heights[0] = value
+            first_moved = 1
+        elif value >= heights[4]:
+            heights[4] = value
+            first_moved = 4
+        else:
+            first_moved = 1
+            while value >= heights[first_moved]:
+                first_moved += 1
+        for i in range(first_moved, 5):
+            positions[i] += 1
+        last = self._count - 1
+        fractions = self._fractions
+        for i in (1, 2, 3):
+            delta = 1 + last * fractions[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (delta <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        heights, positions = self._heights, self._positions
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+                (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+                + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[T_NUMBER]:
+        """Current estimate, ``None`` before the first value."""
+        if not self._heights:
+            return None
+        if self._count <= 5:
+            return _interpolate(self._heights, self.q)
+        return self._heights[2]
+
+
+class StreamingStats:
+    """
+    Descriptive statistics computed in a single pass.
+
+    Count, sum, minimum and maximum are running values, so they take constant
+    memory. The mean comes from an exact running sum (an ``int`` for integers,
+    error-free float partials as in ``math.fsum`` otherwise) and has the type
+    ``statistics.mean`` would return; the variance of integers is exact too,
+    from their sum of squares, and other values use Welford's update. The median, the
+    ``quantiles`` and the mode are exact by default, from a counter of the
+    distinct values (memory grows with the number of distinct values, not of
+    values). With ``approximate=True`` they are P² estimates instead and the
+    whole summary runs in constant memory; ``exact_mode=True`` still counts
+    values to report the exact mode.
+
+    e.g:
+
+    >>> stats = StreamingStats(approximate=True, quantiles=(0.95, 0.99))
+    >>> stats.update(readings)
+    >>> stats.summary()
+
+    Args:
+        approximate: Estimate the median and quantiles instead of counting values.
+        quantiles: Extra quantiles, between 0 and 1, to report.
+        exact_mode: Count values for the mode; defaults to ``not approximate``.
+    """
+
+    def __init__(self, approximate: bool = False, quantiles: Sequence[float] = (), exact_mode: bool = None):
+        for q in quantiles:
+            if not 0 <= q <= 1:
+                raise ValueError("quantiles must be between 0 and 1")
+        self._approximate = approximate
+        self._quantiles = tuple(quantiles)
+        self._count = 0
+        self._sum = 0
+        # Exact sums: integers, their squares and the non-overlapping partials of the other values.
+        self._int_sum = 0
+        self._int_squares = 0
+        self._partials = []
+        self._all_int = True
+        self._finite = True
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = None
+        self._max = None
+        exact_mode = not approximate if exact_mode is None else exact_mode
+        self._counter = Counter() if not approximate or exact_mode else None
+        self._estimators = {q: P2Quantile(q) for q in (0.5,) + self._quantiles} if approximate else None
+
+    def add(self, value: T_NUMBER) -> None:
+        """Account for one value."""
+        self.update((value,))
+
+    def update(self, values: Iterable[T_NUMBER]) -> None:
+        """Account for every value of ``values``, consuming it once."""
+        count, total, mean, m2 = self._count, self._sum, self._mean, self._m2
+        int_sum, int_squares, partials = self._int_sum, self._int_squares, self._partials
+        all_int, finite = self._all_int, self._finite
+        minimum, maximum = self._min, self._max
+        counter = self._counter
+        estimators = tuple(self._estimators.values()) if self._estimators else ()
+        for value in values:
+            count += 1
+            total += value
+            if isinstance(value, int):
+                int_sum += value
+                int_squares += value * value
+            else:
+                all_int = False
+                if value - value != 0:
+                    # inf or nan, the mean falls back to the plain sum
+                    finite = False
+                else:
+                    # Shewchuk's error-free summation, the algorithm behind math.fsum
+                    x, i = value, 0
+                    for partial in partials:
+                        if abs(x) < abs(partial):
+                            x, partial = partial, x
+                        high = x + partial
+                        low = partial - (high - x)
+                        if low:
+                            partials[i] = low
+                            i += 1
+                        x = high
+                    partials[i:] = [x]
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            if minimum is None or value < minimum:
+                minimum = value
+            if maximum is None or value > maximum:
+                maximum = value
+            if counter is not None:
+                counter[value] += 1
+            for estimator in estimators:
+                estimator.add(value)
+        self._count, self._sum, self._mean, self._m2 = count, total, mean, m2
+        self._int_sum, self._int_squares = int_sum, int_squares
+        self._all_int, self._finite = all_int, finite
+        self._min, self._max = minimum, maximum
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> T_NUMBER:
+        return self._sum
+
+    @property
+    def min(self) -> Optional[T_NUMBER]:
+        return self._min
+
+    @property
+    def max(self) -> Optional[T_NUMBER]:
+        return self._max
+
+    @property
+    def mean(self) -> Optional[T_NUMBER]:
+        """Exact mean rounded once, an ``int`` when integers divide evenly; ``None`` without values."""
+        count = self._count
+        if not count:
+            return None
+        if self._all_int:
+            quotient, remainder = divmod(self._int_sum, count)
+            return self._int_sum / count if remainder else quotient
+        if not self._finite:
+            return self._sum / count
+        return float((self._int_sum + sum(map(Fraction, self._partials), Fraction(0))) / count)
+
+    @property
+    def variance(self) -> Optional[T_NUMBER]:
+        """Sample variance, exact for integers (an ``int`` when whole); ``None`` with fewer than two values."""
+        count = self._count
+        if count < 2:
+            return None
+        if self._all_int:
+            variance = Fraction(count * self._int_squares - self._int_sum ** 2, count * (count - 1))
+            return variance.numerator if variance.denominator == 1 else float(variance)
+        return self._m2 / (count - 1)
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        """Sample standard deviation, ``None`` with fewer than two values."""
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    @property
+    def mode(self) -> Optional[T_NUMBER]:
+        """Most common value, the first one seen on ties; ``None`` when values are not counted."""
+        if not self._counter:
+            return None
+        return self._counter.most_common(1)[0][0]
+
+    def quantile(self, q: float) -> Optional[T_NUMBER]:
+        """
+        Value below which a ``q`` fraction of the values falls.
+
+        Exact values interpolate linearly between order statistics, so
+        ``quantile(0.5)`` is the median. Approximate stats only know the
+        median and the quantiles given on creation.
+        """
+        if not self._count:
+            return None
+        if self._estimators is not None:
+            if q not in self._estimators:
+                raise ValueError(f"quantile {q} is not tracked, pass it in quantiles")
+            return self._estimators[q].value
+        position = q * (self._count - 1)
+        lower_rank, upper_rank = math.floor(position), math.ceil(position)
+        lower = upper = None
+        seen = 0
+        for value in sorted(self._counter):
+            seen += self._counter[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        return lower if lower == upper else lower + (upper - lower) * (position - lower_rank)
+
+    @property
+    def median(self) -> Optional[T_NUMBER]:
+        return self.quantile(0.5)
+
+    def summary(self) -> dict:
+        """Return count, sum, mean, median, mode, variance, std_dev, min, max and the requested quantiles."""
+        result = {
+            "count":    self.count,
+            "sum":      self.sum,
+            "mean":     self.mean,
+            "median":   self.median,
+            "mode":     self.mode,
+            "variance": self.variance,
+            "std_dev":  self.std_dev,
+            "min":      self.min,
+            "max":      self.max,
+        }
+        if self._quantiles:
+            result["quantiles"] = {q: self.quantile(q) for q in self._quantiles}
+        return result
@@ -19,16 +19,24 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import asyncio
+import collections
 import logging
+import os
+import signal
 import subprocess
 import threading
 import sys
+import time
 import traceback
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
-from typing import List
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
-__all__ = ["memory_of_this", "memory_usage", "run_on_terminal", 'thread_monitor']
+__all__ = ["memory_of_this", "memory_usage", "run_on_terminal", 'thread_monitor', "CommandResult",
+           "run_commands_async", "run_commands_in_parallel"]
 
 logger = logging.getLogger(__name__)
 
@@ -90,14 +98,209 @@ def run_on_terminal(
             return e.stderr
 
 
-def run_commands_in_parallel(commands: List[str], max_workers: int = 6) -> None:
+@dataclass(frozen=True, slots=True)
+class CommandResult:
+    """Outcome of one command run by :func:`run_commands_async`."""
+    index: int
+    command: Union[str, Tuple[str, ...]]
+    returncode: Optional[int]
+    duration: float
+    timed_out: bool = False
+    stdout_tail: Tuple[str, ...] = ()
+    stderr_tail: Tuple[str, ...] = ()
+    stdout_path: Optional[Path] = None
+    stderr_path: Optional[Path] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command started, finished in time and exited with status 0."""
+        return self.returncode == 0 and not self.timed_out
+
+
+# Largest line kept whole; longer output without newlines is split at this size.
+_MAX_LINE_BYTES = 1024 * 1024
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+async def _pump_stream(stream, stream_name, index, on_output, output_file, tail):
+    """Forward a subprocess pipe line by line without holding more than one line in memory."""
+    pending = b""
+    while True:
+        chunk = await stream.read(_READ_CHUNK_BYTES)
+        if output_file is not None and chunk:
+            output_file.write(chunk)
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop() if chunk else b""
+        if len(pending) > _MAX_LINE_BYTES:
+            lines.append(pending)
+            pending = b""
+        for line in lines:
+            if not chunk and not line:
+                continue
+            text = line.decode("utf-8", errors="replace").rstrip("\r")
+            tail.append(text)
+            if on_output is not None:
+                on_output(index, stream_name, text)
+        if not chunk:
+            return
+
+
+def _kill(process):
+    """Kill a command and, on POSIX, the processes it started in its session."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _run_command(index, command, *, timeout, on_output, output_dir, tail_lines, cwd, env):
+    started = time.perf_counter()
+    tails = {"stdout": collections.deque(maxlen=tail_lines), "stderr": collections.deque(maxlen=tail_lines)}
+    paths = {name: None if output_dir is None else Path(output_dir, f"{index}.{name}.log") for name in tails}
+    files = {}
+    timed_out = False
+    returncode = None
+    error = None
+    try:
+        for name, path in paths.items():
+            if path is not None:
+                files[name] = open(path, "wb")
+        options = dict(stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=cwd, env=env,
+                       start_new_session=os.name == "posix")
+        if isinstance(command, str):
+            process = await asyncio.create_subprocess_shell(command, **options)
+        else:
+            process = await asyncio.create_subprocess_exec(*command, **options)
+        pumps = asyncio.gather(
+            _pump_stream(process.stdout, "stdout", index, on_output, files.get("stdout"), tails["stdout"]),
+            _pump_stream(process.stderr, "stderr", index, on_output, files.get("stderr"), tails["stderr"]),
+            process.wait(),
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(pumps), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            _kill(process)
+            pumps.cancel()
+            await asyncio.gather(pumps, return_exceptions=True)
+            await process.wait()
+        except BaseException:
+            _kill(process)
+            pumps.cancel()
+            # The pumps must finish unwinding and the killed process be reaped before re-raising.
+            await asyncio.gather(pumps, return_exceptions=True)
+            await process.wait()
+            raise
+        returncode = process.returncode
+    except OSError as err:
+        logger.error("Failed to run command %s: %s", index, err)
+        error = str(err)
+    finally:
+        for output_file in files.values():
+            output_file.close()
+    return CommandResult(
+        index=index,
+        command=command if isinstance(command, str) else tuple(command),
+        returncode=returncode,
+        duration=time.perf_counter() - started,
+        timed_out=timed_out,
+        stdout_tail=tuple(tails["stdout"]),
+        stderr_tail=tuple(tails["stderr"]),
+        stdout_path=paths["stdout"],
+        stderr_path=paths["stderr"],
+        error=error,
+    )
+
+
+async def run_commands_async(
+        commands: Sequence[Union[str, Sequence[str]]],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_output: Optional[Callable[[int, str, str], None]] = None,
+        on_result: Optional[Callable[[CommandResult], None]] = None,
+        output_dir: Optional[Union[str, Path]] = None,
+        tail_lines: int = 20,
+        cwd: Optional[Union[str, Path]] = None,
+        env: Optional[dict] = None,
+) -> List[CommandResult]:
     """
-    Executes a list of shell commands in parallel using a thread pool.
+    Run commands concurrently with asyncio subprocesses.
+
+    ``max_workers`` workers take the next command as soon as their current one
+    ends, so long commands do not hold back the queue. Output is read line by
+    line while the commands run and is never accumulated: each line goes to
+    ``on_output``, the raw output to ``output_dir`` files, and only the last
+    ``tail_lines`` lines of each stream are kept in the result.
 
     Args:
-        commands (List[str]): A list of commands to be executed.
-        max_workers (int): Maximum number of concurrent commands.
+        commands: Shell command strings, or argument sequences run without a
+            shell.
+        max_workers: Maximum commands running at once. Defaults to the number
+            of CPUs.
+        timeout: Seconds each command may run before it is killed.
+        on_output: Optional callable receiving ``(index, stream, line)`` where
+            ``stream`` is ``"stdout"`` or ``"stderr"``.
+        on_result: Optional callable receiving each :class:`CommandResult`
+            as soon as its command ends.
+        output_dir: Optional existing directory where each command output is
+            written to ``<index>.stdout.log`` and ``<index>.stderr.log``.
+        tail_lines: Last lines of each stream kept in the result.
+        cwd: Working directory of the commands.
+        env: Environment of the commands.
+
+    Returns:
+        One :class:`CommandResult` per command, in input order.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than zero")
+    commands = list(commands)
+    pending = iter(enumerate(commands))
+    results = [None] * len(commands)
+
+    async def worker():
+        for index, command in pending:
+            result = await _run_command(
+                index, command, timeout=timeout, on_output=on_output, output_dir=output_dir,
+                tail_lines=tail_lines, cwd=cwd, env=env,
+            )
+            results[index] = result
+            if not result.ok and result.error is None:
+                logger.error("Command %s failed with status %s: %s", index, result.returncode, command)
+            if on_result is not None:
+                on_result(result)
+
+    await asyncio.gather(*(worker() for _ in range(min(max_workers, len(commands)))))
+    return results
+
+
+def run_commands_in_parallel(commands: List[str], max_workers: Optional[int] = None, **kwargs) -> List[CommandResult]:
     """
+    Executes a list of shell commands in parallel.
+
+    Blocking form of :func:`run_commands_async`, which accepts the same
+    keyword arguments (``timeout``, ``on_output``, ``output_dir``...). Called
+    from a running event loop (Jupyter, async applications) the commands run
+    on an event loop of a worker thread, and the caller blocks until they end.
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        executor.map(run_on_terminal, commands)
+    Args:
+        commands (List[str]): A list of commands to be executed.
+        max_workers (int): Maximum number of concurrent commands, defaults to
+            the number of CPUs.
+
+    Returns:
+        One :class:`CommandResult` per command, in input order.
+    """
+    coroutine = run_commands_async(commands, max_workers=max_workers, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # asyncio.run cannot start a loop inside a running one.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run_commands") as executor:
+        return executor.submit(asyncio.run, coroutine).result()
@@ -25,7 +25,7 @@ import re
 import statistics
 import string
 import threading
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, deque
 from importlib import import_module
 import importlib
 import sys
@@ -71,6 +71,7 @@ __all__ = [
     "list_methods",
     "can_do",
     "chunk",
+    "ichunk",
     "is_iterable",
     "is_indexable",
     "is_sequence",
@@ -247,11 +248,11 @@ def chunk(
         __parser = type(data)
         data = data.items() if isinstance(data, dict) else data
 
-    data = (
-        list(data)
-        if isinstance(data, (set, tuple, str, bytes, bytearray, MappingView))
-        else copy(data)
-    )
+    if isinstance(data, (set, tuple, str, bytes, bytearray, MappingView)):
+        data = list(data)
+    elif is_random:
+        # only shuffling needs a private copy, slicing already copies each batch
+        data = copy(data)
     if not batch_size or batch_size > len(data) or batch_size < 1:
         if isinstance(max_batches, (int, float)) and max_batches > 0:
             batch_size = math.ceil(len(data) / max_batches)
@@ -281,6 +282,72 @@ def chunk(
     return batches
 
 
+def _shuffled(iterator: Iterator,
+              buffer_size: int,
+              rng: random.Random) -> Iterator:
+    """Approximate shuffle of a stream: each item is drawn at random from a buffer of the next ``buffer_size`` items."""
+    buffer = list(itertools.islice(iterator, buffer_size))
+    for item in iterator:
+        index = rng.randrange(len(buffer))
+        yield buffer[index]
+        buffer[index] = item
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def ichunk(data: Iterable,
+           batch_size: int,
+           fill_with: Any = None,
+           shuffle_buffer: int = None,
+           seed: Any = None,
+           max_batches: int = None) -> Iterator[List]:
+    """
+    Lazy version of :func:`chunk` for any iterable, including generators, files and unbounded streams.
+
+    Batches are lists read with ``itertools.islice``, so only one batch (plus the shuffle buffer) is kept in memory.
+
+    e.g:
+    >>> import cereja as cj
+
+    >>> list(cj.ichunk(range(7), batch_size=3, fill_with=0))
+    [[0, 1, 2], [3, 4, 5], [6, 0, 0]]
+
+    >>> with open("corpus.txt") as lines:
+    ...     for batch in cj.ichunk(lines, batch_size=256, shuffle_buffer=10000, seed=42):
+    ...         tokenizer.encode(batch)
+
+    @param data: Iterable data, dicts yield their items
+    @param batch_size: number of items per batch
+    @param fill_with: pads the last batch up to batch_size when it is not None
+    @param shuffle_buffer: sample items at random from a buffer of this size; a buffer as large as the data
+                           is a full shuffle
+    @param seed: seed for the shuffle buffer
+    @param max_batches: limit number of batches
+    @return: iterator of batches
+    """
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f"batch_size must be a positive integer, got {batch_size!r}")
+    if shuffle_buffer is not None and shuffle_buffer < 1:
+        raise ValueError(f"shuffle_buffer must be a positive integer, got {shuffle_buffer!r}")
+    return _ichunk(data, batch_size, fill_with, shuffle_buffer, seed, max_batches)
+
+
+def _ichunk(data, batch_size, fill_with, shuffle_buffer, seed, max_batches):
+    iterator = iter(data.items() if isinstance(data, dict) else data)
+    if shuffle_buffer is not None:
+        iterator = _shuffled(iterator, shuffle_buffer, random.Random(seed))
+    batches = itertools.count() if max_batches is None else range(max_batches)
+    for _ in batches:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        if fill_with is not None and len(batch) < batch_size:
+            batch += [fill_with] * (batch_size - len(batch))
+        yield batch
+        if len(batch) < batch_size:
+            return
+
+
 def _get_tkinter():
     try:
         from tkinter import Tk
@@ -1764,8 +1831,90 @@ def check_type_on_sequence(sequence: Iterable,
     return True
 
 
+# Marks the end of a lazy pipeline when probing for its first item.
+_EMPTY = object()
+
+
+def _is_one_shot(data) -> bool:
+    """Whether iterating ``data`` consumes it; DataIterator keeps its data across passes."""
+    return isinstance(data, Iterator) and not isinstance(data, DataIterator)
+
+
+class _Reiterable:
+    """Iterable that calls ``factory`` for a new iterator on each pass."""
+
+    def __init__(self,
+                 factory: Callable[[], Iterator]):
+        self._factory = factory
+
+    def __iter__(self):
+        return self._factory()
+
+
+_STEP_EXECUTORS = ("thread", "process")
+
+
+def _run_step(is_map: bool,
+              func: Callable,
+              items: list) -> list:
+    """Apply one map or filter step to a list of items; module level so process workers can unpickle it."""
+    return list(map(func, items)) if is_map else list(filter(func, items))
+
+
+def _apply_step(step: tuple,
+                items: list,
+                pools: dict) -> list:
+    """
+    Apply a ``(is_map, func, workers, executor)`` pipeline step to a chunk of items.
+
+    Parallel steps split the chunk in one slice per worker and concatenate the slices back in order. The
+    executors are created on first use and stored in ``pools`` by ``(executor, workers)``, so the steps of one
+    pass share them; the caller shuts them down.
+    """
+    is_map, func, workers, executor = step
+    if not workers or workers < 2 or len(items) < 2:
+        return _run_step(is_map, func, items)
+    pool = pools.get((executor, workers))
+    if pool is None:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        pool = pools[(executor, workers)] = pool_class(max_workers=workers)
+    size = -(-len(items) // workers)
+    futures = [pool.submit(_run_step, is_map, func, items[start:start + size])
+               for start in range(0, len(items), size)]
+    return [item for future in futures for item in future.result()]
+
+
+def _check_workers(workers: Optional[int],
+                   executor: str):
+    if executor not in _STEP_EXECUTORS:
+        raise ValueError(f"executor must be one of {_STEP_EXECUTORS}, got {executor!r}")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be greater than zero")
+
+
 class DataIterator:
+    """
+    Chainable helpers over an iterable.
+
+    By default the data is materialized in a list on first iteration. With
+    ``lazy=True`` (or :meth:`lazy`) chained :meth:`map` and :meth:`filter`
+    calls are fused into one pass that runs chunk by chunk over the source,
+    so nothing is stored until a terminal operation asks for it (``take``,
+    ``reduce``, ``summary``...). A lazy pipeline reads its source again on
+    every pass; pass ``cache=True`` to keep the items produced by the first
+    pass, which one-shot sources such as files or generators need to be
+    iterated more than once; steps chained after a cached stage read from its
+    cache. Without a cache, successive reads of a one-shot source (``take``,
+    ``next``...) continue where the previous one stopped.
+
+    e.g:
+
+    >>> errors = DataIterator(open("app.log"), lazy=True).map(str.strip).filter(lambda line: "ERROR" in line)
+    >>> errors.take(10)
+    """
     _element_type = None
+    _DEFAULT_CHUNK_SIZE = 1024
 
     def __init__(self,
                  data: Union[Iterable, Sequence, 'DataIterator'],
@@ -1779,6 +1928,10 @@ class DataIterator:
 
         Keyword Args:
             original_type (type, optional): The type of the sequence object. If not provided, it is inferred from the data.
+            lazy (bool, optional): Build a lazy pipeline instead of materializing the data. Defaults to the laziness
+                of ``data`` when it is a DataIterator, otherwise False.
+            chunk_size (int, optional): Items processed at a time by a lazy pipeline. Default is 1024.
+            cache (bool, optional): Keep the items produced by a lazy pipeline for later passes. Default is False.
         Raises:
             AssertionError: If the provided data is not iterable.
         """
@@ -1788,10 +1941,28 @@ class DataIterator:
         self._data = None
         self._length = None
         self._first = None
+        lazy = kwargs.get("lazy")
+        self._lazy = bool(data._lazy if lazy is None and isinstance(data, DataIterator) else lazy)
+        if self._lazy:
+            self._chunk_size = kwargs.get("chunk_size", getattr(data, "_chunk_size", self._DEFAULT_CHUNK_SIZE))
+            if self._chunk_size < 1:
+                raise ValueError("chunk_size must be greater than zero")
+            self._cache = kwargs.get("cache", False)
+            self._cached = []
+            self._pipeline_iter = None
+            # Items peeked from a one-shot pipeline, handed out again by the next read.
+            self._peeked = deque()
+            if isinstance(data, DataIterator) and data._lazy and not data._cache:
+                self._source, self._steps = data._source, data._steps
+            else:
+                self._source, self._steps = (data.items() if isinstance(data, dict) else data), ()
+            self._iter = None
+            return
         if self._element_type:
             if not check_type_on_sequence(data, self._element_type):
                 raise TypeError("Data elements are not of the specified type.")
 
+        self._source = data
         self._iter = self._get_data(data) if not isinstance(data, Iterator) else data
 
     def _get_data(self,
@@ -1803,14 +1974,138 @@ class DataIterator:
 
     def __iter__(self):
         if self._data is None:
-            self._data = list(self._iter)
+            if self._lazy:
+                if self._cache:
+                    return self._iter_cached()
+                return self._iter_one_shot() if _is_one_shot(self._source) else self._run_pipeline()
+            self._data = self._materialize(self._iter)
         return iter(self._data)
 
+    def _materialize(self,
+                     items: Iterable) -> Sequence:
+        """Store the items of a data iterator that is read for the first time."""
+        return list(items)
+
+    def _run_pipeline(self):
+        """Run the fused map/filter steps of a lazy pipeline one chunk at a time."""
+        return self._run_steps(iter(self._source), self._steps, self._chunk_size)
+
+    def _run_steps(self,
+                   iterator: Iterator,
+                   steps: tuple,
+                   chunk_size: int):
+        """Yield the items of ``iterator`` through ``steps``, ``chunk_size`` items at a time."""
+        pools = {}
+        try:
+            while True:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if not chunk:
+                    return
+                for step in steps:
+                    chunk = _apply_step(step, chunk, pools)
+                if self._element_type and not all(isinstance(item, self._element_type) for item in chunk):
+                    raise TypeError("Data elements are not of the specified type.")
+                yield from chunk
+        finally:
+            for pool in pools.values():
+                pool.shutdown(cancel_futures=True)
+
+    def _iter_one_shot(self):
+        """Continue the single pass over a one-shot source where the previous read stopped."""
+        if self._pipeline_iter is None:
+            self._pipeline_iter = self._run_pipeline()
+        while True:
+            if self._peeked:
+                yield self._peeked.popleft()
+                continue
+            # Not ``yield from``: closing this reader must not close the shared pipeline and drop its chunk.
+            try:
+                item = next(self._pipeline_iter)
+            except StopIteration:
+                return
+            yield item
+
+    def _peek(self):
+        """The next item without consuming it, or ``_EMPTY``."""
+        item = next(iter(self), _EMPTY)
+        if item is not _EMPTY and self._lazy and not self._cache and _is_one_shot(self._source):
+            self._peeked.appendleft(item)
+        return item
+
+    def _iter_cached(self):
+        """Replay the items cached so far, then keep pulling and caching from the shared pipeline."""
+        if self._pipeline_iter is None:
+            self._pipeline_iter = self._run_pipeline()
+        position = 0
+        while True:
+            if position < len(self._cached):
+                yield self._cached[position]
+                position += 1
+                continue
+            if self._data is not None:
+                return
+            try:
+                self._cached.append(next(self._pipeline_iter))
+            except StopIteration:
+                self._data = self._cached
+                return
+
+    def _add_step(self,
+                  is_map: bool,
+                  func: Callable,
+                  workers: Optional[int] = None,
+                  executor: str = "thread") -> 'DataIterator':
+        _check_workers(workers, executor)
+        if not self._lazy:
+            if not workers or workers < 2:
+                return self.__class__(map(func, self) if is_map else filter(func, self))
+            # Results are gathered first: element type checks would run the steps again over an iterator.
+            return self.__class__(list(self._run_steps(iter(self), ((is_map, func, workers, executor),),
+                                                       self._DEFAULT_CHUNK_SIZE)))
+        pipeline = self.__class__(self, lazy=True)
+        pipeline._steps += ((is_map, func, workers, executor),)
+        return pipeline
+
+    def lazy(self,
+             chunk_size: int = None,
+             cache: bool = False) -> 'DataIterator':
+        """
+        Get a lazy pipeline over this data.
+
+        Args:
+            chunk_size (int, optional): Items processed at a time. Default is 1024.
+            cache (bool, optional): Keep the items produced by the first pass. Default is False.
+
+        Returns:
+            DataIterator: A lazy DataIterator of the same class.
+        """
+        if self._lazy:
+            source = self
+        elif self._data is not None:
+            source = self._data
+        elif not _is_one_shot(self._source):
+            source = self._source
+        else:
+            # A one-shot source not read yet is handed over without a copy.
+            source = self._iter
+        chunk_size = chunk_size or getattr(self, "_chunk_size", self._DEFAULT_CHUNK_SIZE)
+        return self.__class__(source, lazy=True, chunk_size=chunk_size, cache=cache)
+
+    @property
+    def is_lazy(self) -> bool:
+        """Whether operations are chained in a lazy pipeline."""
+        return self._lazy
+
     def __next__(self):
+        if self._iter is None:
+            self._iter = iter(self)
         return next(self._iter)
 
     def __len__(self):
         if self._length is None:
+            if self._lazy and self._data is None and not self._cache and _is_one_shot(self._source):
+                # Counting would consume the source; TypeError also makes list() skip its length hint.
+                raise TypeError("the length of a lazy pipeline over an iterator is unknown, use cache=True")
             self._length = sum(1 for _ in self)
         return self._length
 
@@ -1822,6 +2117,8 @@ class DataIterator:
         Returns:
             bool: True if the iterator is empty, False otherwise.
         """
+        if self._lazy and self._length is None:
+            return self._peek() is _EMPTY
         return len(self) == 0
 
     @property
@@ -1833,7 +2130,8 @@ class DataIterator:
             Any: The first element of the iterator.
         """
         if self._first is None:
-            self._first = next(iter(self), None)
+            first = self._peek()
+            self._first = None if first is _EMPTY else first
         return self._first
 
     @property
@@ -1844,6 +2142,9 @@ class DataIterator:
         Returns:
             Any: The last element of the iterator.
         """
+        if self._lazy and self._data is None:
+            last = deque(self, maxlen=1)
+            return last[0] if last else None
         return self._data[-1] if not self.is_empty else None
 
     @property
@@ -1854,22 +2155,44 @@ class DataIterator:
         Returns:
             Any: The next element of the iterator.
         """
-        return next(self._iter)
+        return next(self)
 
     def batch(self,
               batch_size: int = 1,
-              step: int = None) -> 'DataIterator':
+              step: int = None,
+              fill_with: Any = None,
+              shuffle_buffer: int = None,
+              seed: Any = None) -> 'DataIterator':
         """
         Create batches of data from the iterator.
 
+        Non overlapping batches are streamed with :func:`ichunk`; on a lazy pipeline the result is lazy too, so
+        batches can feed ``Processor.process`` or ``Tokenizer.encode`` without storing the dataset.
+
         Args:
             batch_size (int, optional): The size of each batch. Default is 1.
-            step (int, optional): The step size between batches. Default is 1.
+            step (int, optional): The step size between batches. Default is batch_size.
+            fill_with (Any, optional): Pads the last batch up to batch_size when it is not None.
+            shuffle_buffer (int, optional): Sample items at random from a buffer of this size before batching.
+            seed (Any, optional): Seed for the shuffle buffer.
 
         Returns:
             DataIterator: A new DataIterator instance containing the batches.
         """
-        return DataIterator(get_batch_strides(self, kernel_size=batch_size, strides=step or batch_size))
+        if step is not None and step != batch_size:
+            if fill_with is not None or shuffle_buffer is not None:
+                raise ValueError("fill_with and shuffle_buffer need step equal to batch_size")
+            return DataIterator(get_batch_strides(self, kernel_size=batch_size, strides=step))
+        batches = functools.partial(ichunk, self, batch_size, fill_with=fill_with, shuffle_buffer=shuffle_buffer,
+                                    seed=seed)
+        first_pass = batches()  # validates the arguments now, nothing is read until iteration
+        if not self._lazy:
+            return DataIterator(first_pass)
+        chunk_size = max(1, self._chunk_size // batch_size)
+        if self._cache or not _is_one_shot(self._source):
+            # every pass re-reads this pipeline, as lazy map and filter steps do
+            return DataIterator(_Reiterable(batches), lazy=True, chunk_size=chunk_size)
+        return DataIterator(first_pass, lazy=True, chunk_size=chunk_size)
 
     def cycle(self) -> Any:
         """
@@ -1889,7 +2212,7 @@ class DataIterator:
     def take(self,
              n: int = None) -> list:
         if n is None:
-            data = list(self)
+            data = list(iter(self))
         else:
             data = list(itertools.islice(self, n))
         return data
@@ -1900,6 +2223,9 @@ class DataIterator:
 
     def __getitem__(self,
                     item):
+        if self._data is None:
+            # Random access materializes lazy pipelines.
+            self._data = self._materialize(self)
         return self._data[item]
 
     def random(self) -> 'DataIterator':
@@ -1909,22 +2235,29 @@ class DataIterator:
         Returns:
             DataIterator: A new DataIterator instance containing the shuffled data.
         """
-        data = list(self)
+        data = list(iter(self))
         random.shuffle(data)
         return self.__class__(data)
 
     def filter(self,
-               func: Callable[[Any], bool]) -> 'DataIterator':
+               func: Callable[[Any], bool],
+               workers: int = None,
+               executor: str = "thread") -> 'DataIterator':
         """
         Filter the data using the given function and return a new DataIterator instance with the filtered data.
 
+        With ``workers`` the items are filtered in chunks on a pool of threads or processes and kept in order.
+        The ``"process"`` executor pickles ``func`` and the items, so ``func`` must be defined at module level.
+
         Args:
             func (Callable[[Any], bool]): The function to filter the data.
+            workers (int, optional): Number of parallel workers. Default is None, filtering serially.
+            executor (str, optional): ``"thread"`` (default) or ``"process"``.
 
         Returns:
             DataIterator: A new DataIterator instance containing the filtered data.
         """
-        return self.__class__(filter(func, self))
+        return self._add_step(False, func, workers, executor)
 
     @property
     def str(self) -> 'DataStringIterator':
@@ -1957,17 +2290,30 @@ class DataIterator:
         return DataNumberIterator(self.map(float))
 
     def map(self,
-            func: Callable[[Any], Any]) -> 'DataIterator':
+            func: Callable[[Any], Any],
+            workers: int = None,
+            executor: str = "thread") -> 'DataIterator':
         """
         Map the data using the given function and return a new DataIterator instance with the mapped data.
 
+        With ``workers`` the items are mapped in chunks on a pool of threads or processes and the results keep
+        the order of the data. Threads suit I/O-bound functions; CPU-bound functions need ``"process"``, which
+        pickles ``func`` and the items, so ``func`` must be defined at module level.
+
+        e.g:
+
+        >>> DataIterator(urls).map(fetch, workers=8)
+        >>> DataIterator(texts, lazy=True).map(normalize, workers=4, executor="process").take(100)
+
         Args:
             func (Callable[[Any], Any]): The function to map the data.
+            workers (int, optional): Number of parallel workers. Default is None, mapping serially.
+            executor (str, optional): ``"thread"`` (default) or ``"process"``.
 
         Returns:
             DataIterator: A new DataIterator instance containing the mapped data.
         """
-        return self.__class__(map(func, self))
+        return self._add_step(True, func, workers, executor)
 
     def reduce(self,
                func: Callable[[Any, Any], Any],
@@ -1993,7 +2339,7 @@ class DataIterator:
         Returns:
             DataIterator: A new DataIterator instance containing the sorted data.
         """
-        return self.__class__(sorted(self, key=key, reverse=reverse))
+        return self.__class__(sorted(iter(self), key=key, reverse=reverse))
 
     def enumerate(self,
                   start=0) -> 'DataIterator':
@@ -2058,7 +2404,7 @@ class DataIterator:
             DataIterator: A new DataIterator instance containing the flattened data.
         """
         from ..array import flatten
-        return self.__class__(flatten(list(self)))
+        return self.__class__(flatten(list(iter(self))))
 
     def combinations(self,
                      r: int,
@@ -2133,18 +2479,23 @@ class DataStringIterator(DataIterator):
         return self._freq
 
     def preprocess(self,
-                   is_destructive=False):
+                   is_destructive=False,
+                   workers: int = None,
+                   executor: str = "thread"):
         """
         Preprocess the data by removing any leading or trailing whitespace and converting it to lowercase.
 
         Args:
             is_destructive (bool): Whether to modify the original data or return a new DataStringIterator instance.
+            workers (int, optional): Number of parallel workers, see :meth:`DataIterator.map`.
+            executor (str, optional): ``"thread"`` (default) or ``"process"``, which suits large corpora.
 
         Returns:
             DataStringIterator: A new DataStringIterator instance with the preprocessed data.
         """
         from ..mltools.preprocess import preprocess
-        return self.map(lambda x: preprocess(x, is_destructive=is_destructive))
+        return self.map(functools.partial(preprocess, is_destructive=is_destructive), workers=workers,
+                        executor=executor)
 
     def tokenize(self,
                  preprocess_function=None,
@@ -2321,6 +2672,20 @@ class DataStringIterator(DataIterator):
 
 
 class DataNumberIterator(DataIterator):
+    """
+    Numeric helpers over an iterable of ints and floats.
+
+    With ``backend="array"`` the numbers are materialized in a compact
+    ``array('q')``, or ``array('d')`` once a float shows up, instead of a
+    list of boxed objects, and ``sum``, ``mean``, ``median``, ``variance``
+    and ``std_dev`` run over that buffer. ``backend="numpy"`` wraps the same
+    buffer in an ``ndarray``. Ints are widened to floats in a mixed buffer.
+
+    e.g:
+
+    >>> DataNumberIterator(range(10 ** 6), backend="array").mean()
+    499999.5
+    """
     _element_type = (int, float)
 
     def __init__(self,
@@ -2332,11 +2697,49 @@ class DataNumberIterator(DataIterator):
         Args:
             data (Union[Number, Iterable[Number]]): The data to be iterated over.
 
+        Keyword Args:
+            backend (str, optional): Storage of the materialized numbers, ``"list"``, ``"array"``, ``"numpy"``
+                or ``"auto"``. Defaults to the backend of ``data`` when it is a DataNumberIterator, otherwise
+                ``"list"``.
+
         Raises:
             AssertionError: If the provided data is not a number or an iterable of numbers.
         """
+        from ..array._buffer import _resolve_backend
+        self._backend = _resolve_backend(kwargs.pop("backend", None) or getattr(data, "_backend", "list"))
         super().__init__(data, **kwargs)
 
+    @property
+    def backend(self) -> str:
+        """Storage of the materialized numbers, ``"list"``, ``"array"`` or ``"numpy"``."""
+        return self._backend
+
+    def _materialize(self,
+                     items: Iterable[T_NUMBER]) -> Sequence[T_NUMBER]:
+        if self._backend == "list":
+            return list(items)
+        from ..array._buffer import pack_numbers
+        return pack_numbers(items, self._backend)
+
+    def __iter__(self):
+        iterator = super().__iter__()
+        if self._backend == "numpy" and self._data is not None:
+            from ..array._buffer import _iter_buffer
+            return _iter_buffer(self._data)
+        return iterator
+
+    def _buffer(self) -> Optional[Sequence[T_NUMBER]]:
+        """The compact buffer of the numbers, materializing them, or None for the list backend."""
+        if self._backend == "list" or self._lazy:
+            return None
+        if self._data is None:
+            for _ in self:
+                pass
+        if isinstance(self._data, list):
+            # Integers beyond 64 bits are kept in a list.
+            return None
+        return self._data
+
     def sum(self):
         """
         Calculate the sum of the data iterator.
@@ -2344,6 +2747,10 @@ class DataNumberIterator(DataIterator):
         Returns:
             Number: The sum of the data iterator.
         """
+        buffer = self._buffer()
+        if buffer is not None:
+            from ..array._buffer import _buffer_sum
+            return _buffer_sum(buffer)
         return sum(self)
 
     def mean(self):
@@ -2353,6 +2760,10 @@ class DataNumberIterator(DataIterator):
         Returns:
             float: The mean of the data iterator.
         """
+        buffer = self._buffer()
+        if buffer is not None:
+            from ..array._buffer import _buffer_mean
+            return _buffer_mean(buffer)
         return statistics.mean(self)
 
     def median(self):
@@ -2362,6 +2773,10 @@ class DataNumberIterator(DataIterator):
         Returns:
             float: The median of the data iterator.
         """
+        buffer = self._buffer()
+        if buffer is not None:
+            from ..array._buffer import _buffer_median
+            return _buffer_median(buffer)
         return statistics.median(self)
 
     def mode(self):
@@ -2380,6 +2795,10 @@ class DataNumberIterator(DataIterator):
         Returns:
             float: The variance of the data iterator.
         """
+        buffer = self._buffer()
+        if buffer is not None:
+            from ..array._buffer import _buffer_variance
+            return _buffer_variance(buffer)
         return statistics.variance(self)
 
     def std_dev(self):
@@ -2389,24 +2808,50 @@ class DataNumberIterator(DataIterator):
         Returns:
             float: The standard deviation of the data iterator.
         """
+        buffer = self._buffer()
+        if buffer is not None:
+            from ..array._buffer import _buffer_variance
+            return math.sqrt(_buffer_variance(buffer))
         return statistics.stdev(self)
 
-    def summary(self):
+    def summary(self,
+                approximate: bool = False,
+                quantiles: Sequence[float] = (),
+                exact_mode: bool = None):
         """
-        Generate a descriptive summary of the data iterator.
+        Generate a descriptive summary of the data iterator in a single pass.
+
+        The mean comes from an exact running sum and the variance of integers from their exact sum of
+        squares (other values use Welford's method); the median, mode and quantiles come from a
+        counter of distinct values, so the default exact summary holds every distinct value in memory. With
+        ``approximate=True`` they are constant-memory P² estimates instead.
+        See :class:`cereja.mathtools.StreamingStats`.
+
+        The keys and types of the former ``statistics`` based summary are kept: the mean and variance of
+        integers are ``int`` when they are whole, and fewer than two values raise
+        ``statistics.StatisticsError``. ``min`` and ``max`` are reported as well, and ``quantiles`` when they
+        are requested.
+
+        Args:
+            approximate (bool, optional): Estimate the median and quantiles in constant memory. Default is False.
+            quantiles (Sequence[float], optional): Extra quantiles, between 0 and 1, to report.
+            exact_mode (bool, optional): Count values for the exact mode. Defaults to ``not approximate``.
 
         Returns:
             Dict: A dictionary containing the descriptive summary of the data iterator.
-        """
-        return {
-            "count":    len(self),
-            "sum":      self.sum(),
-            "mean":     self.mean(),
-            "median":   self.median(),
-            "mode":     self.mode(),
-            "variance": self.variance(),
-            "std_dev":  self.std_dev(),
-        }
+
+        Raises:
+            statistics.StatisticsError: If there are fewer than two values.
+        """
+        from ..mathtools import StreamingStats
+        stats = StreamingStats(approximate=approximate, quantiles=quantiles, exact_mode=exact_mode)
+        stats.update(iter(self))
+        if stats.count < 2:
+            raise statistics.StatisticsError(
+                    "variance requires at least two data points" if stats.count else
+                    "mean requires at least one data point"
+            )
+        return stats.summary()
 
 
 class DataAnalyzer:
@@ -226,6 +226,49 @@ class CompressTest(unittest.TestCase):
         strategy = hashtools.suggest_strategy(small)
         self.assertEqual(strategy, hashtools.CompressionStrategy.BITPACK)
     
+    def test_analyze_data_samples_large_input(self):
+        """Test analysis of large inputs is bounded by the sample size."""
+        data = b'sampled analysis data ' * 20000
+
+        analysis = hashtools.analyze_data(data, sample_size=4096)
+
+        self.assertEqual(analysis['size'], len(data))
+        self.assertLessEqual(analysis['sample_size'], 4096)
+        self.assertEqual(hashtools.analyze_data(data, sample_size=None)['sample_size'], len(data))
+
+    def test_suggest_strategy_with_objective(self):
+        """Test objective driven selection from trial compressions of sampled blocks."""
+        data = ('{"event": "login", "user": %d}\n' * 4000 % tuple(range(4000))).encode()
+
+        self.assertIn(
+            hashtools.suggest_strategy(data, objective='ratio'),
+            {hashtools.CompressionStrategy.BZ2, hashtools.CompressionStrategy.LZMA,
+             hashtools.CompressionStrategy.ZLIB},
+        )
+        strategy = hashtools.suggest_strategy(data, objective=hashtools.CompressionObjective.SPEED)
+        compressed, stats = hashtools.compress(data, objective='decode_speed')
+        self.assertIsInstance(strategy, hashtools.CompressionStrategy)
+        self.assertEqual(hashtools.decompress(compressed), data)
+
+        trials = []
+
+        def prefer_bz2(trial):
+            trials.append(trial)
+            return 0 if trial['strategy'] == hashtools.CompressionStrategy.BZ2 else 1
+
+        self.assertEqual(hashtools.suggest_strategy(data, objective=prefer_bz2), hashtools.CompressionStrategy.BZ2)
+        self.assertTrue(all({'ratio', 'compress_seconds', 'decompress_seconds'} <= set(trial) for trial in trials))
+
+    def test_hybrid_compression_compresses_payload_once(self):
+        """Test hybrid selection runs trials on samples instead of the whole payload."""
+        original = b'hybrid sampled payload ' * 20000
+
+        with mock.patch.object(_compress, '_compress_dictionary', wraps=_compress._compress_dictionary) as dictionary:
+            compressed, stats = hashtools.compress(original, strategy='hybrid')
+
+        self.assertEqual(hashtools.decompress(compressed), original)
+        self.assertTrue(all(len(call.args[0]) < len(original) for call in dictionary.call_args_list))
+
     def test_compression_stats(self):
         """Test compression statistics."""
         original = "Test data " * 1000
@@ -436,6 +479,100 @@ class CompressTest(unittest.TestCase):
             with open(os.path.join(output_dir, 'nested', 'child.txt'), 'rb') as f:
                 self.assertEqual(f.read(), b'encrypted child data')
 
+    def test_decompress_dir_reads_single_payload_encrypted_archive(self):
+        """Test encrypted archives written before the chunked stream format still decompress."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            output_dir = os.path.join(temp_dir, 'output')
+            os.makedirs(source_dir)
+            plain_archive = os.path.join(temp_dir, 'plain.cjz')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            with open(os.path.join(source_dir, 'data.txt'), 'wb') as f:
+                f.write(b'single payload data' * 10)
+            hashtools.compress_dir(source_dir, plain_archive)
+
+            with open(plain_archive, 'rb') as f:
+                encrypted = hashtools.encrypt(f.read(), 'password')
+            with open(archive_path, 'wb') as f:
+                f.write(_compress._ENCRYPTED_ARCHIVE_MAGIC + encrypted.encode('ascii'))
+
+            self.assertTrue(hashtools.is_encrypted_archive(archive_path))
+            hashtools.decompress_dir(archive_path, output_dir, password='password')
+
+            with open(os.path.join(output_dir, 'data.txt'), 'rb') as f:
+                self.assertEqual(f.read(), b'single payload data' * 10)
+
+    def test_compress_dir_with_password_streams_into_one_temp_archive(self):
+        """Test encrypted directory compression encrypts while writing, with no plaintext temp archive."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            output_dir = os.path.join(temp_dir, 'output')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(source_dir)
+            data = os.urandom(300 * 1024)
+            with open(os.path.join(source_dir, 'random.bin'), 'wb') as f:
+                f.write(data)
+
+            with mock.patch.object(_compress, '_create_temp_archive_path',
+                                   wraps=_compress._create_temp_archive_path) as create_temp:
+                hashtools.compress_dir(source_dir, archive_path, password='password')
+            create_temp.assert_called_once_with(os.path.abspath(archive_path))
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['archive.cjz', 'source'])
+
+            with open(archive_path, 'rb') as f:
+                self.assertTrue(f.read().startswith(_compress._ENCRYPTED_STREAM_MAGIC))
+            hashtools.decompress_dir(archive_path, output_dir, password='password')
+            with open(os.path.join(output_dir, 'random.bin'), 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+    @unittest.skipUnless(os.name == 'posix', 'file modes are POSIX only')
+    def test_compress_dir_archive_mode_follows_umask_or_replaced_file(self):
+        """Test archives get the default mode, or keep the mode of the archive they replace."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(source_dir)
+            with open(os.path.join(source_dir, 'data.txt'), 'wb') as f:
+                f.write(b'data' * 100)
+
+            previous_umask = os.umask(0o022)
+            try:
+                for password in (None, 'password'):
+                    with self.subTest(password=password):
+                        if os.path.exists(archive_path):
+                            os.remove(archive_path)
+                        hashtools.compress_dir(source_dir, archive_path, password=password)
+                        self.assertEqual(os.stat(archive_path).st_mode & 0o777, 0o644)
+                os.chmod(archive_path, 0o600)
+                hashtools.compress_dir(source_dir, archive_path)
+                self.assertEqual(os.stat(archive_path).st_mode & 0o777, 0o600)
+            finally:
+                os.umask(previous_umask)
+
+    def test_compress_dir_failure_leaves_no_partial_archive(self):
+        """Test a failure while writing neither creates nor replaces the output archive."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(source_dir)
+            with open(os.path.join(source_dir, 'data.bin'), 'wb') as f:
+                f.write(os.urandom(300 * 1024))
+
+            for password in (None, 'password'):
+                with self.subTest(password=password):
+                    with mock.patch.object(_compress, '_write_dir_index', side_effect=OSError("disk full")):
+                        with self.assertRaises(hashtools.CompressionError):
+                            hashtools.compress_dir(source_dir, archive_path, password=password)
+                    self.assertEqual(os.listdir(temp_dir), ['source'])
+
+            with open(archive_path, 'wb') as f:
+                f.write(b'previous archive')
+            with mock.patch.object(_compress, '_write_dir_index', side_effect=OSError("disk full")):
+                with self.assertRaises(hashtools.CompressionError):
+                    hashtools.compress_dir(source_dir, archive_path, password='password')
+            with open(archive_path, 'rb') as f:
+                self.assertEqual(f.read(), b'previous archive')
+
     def test_compress_dir_supports_streaming_and_mapped_strategies(self):
         """Test directory compression with streaming-compatible strategy mapping."""
         strategies = ('auto', 'zlib', 'bz2', 'lzma', 'rle')
@@ -552,6 +689,255 @@ class CompressTest(unittest.TestCase):
             with self.assertRaises(hashtools.CompressionError):
                 hashtools.decompress_dir(archive_path, os.path.join(temp_dir, 'output'))
 
+    def test_decompress_dir_parallel_workers_restore_all_files(self):
+        """Test parallel directory extraction with worker processes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            output_dir = os.path.join(temp_dir, 'output')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            expected = {}
+            for index in range(12):
+                rel_path = os.path.join(f'dir{index % 3}', f'file{index}.txt')
+                expected[rel_path] = f'parallel member {index}\n'.encode() * (index + 1) * 100
+                os.makedirs(os.path.join(source_dir, os.path.dirname(rel_path)), exist_ok=True)
+                with open(os.path.join(source_dir, rel_path), 'wb') as f:
+                    f.write(expected[rel_path])
+
+            hashtools.compress_dir(source_dir, archive_path)
+            hashtools.decompress_dir(archive_path, output_dir, workers=2)
+
+            for rel_path, content in expected.items():
+                with open(os.path.join(output_dir, rel_path), 'rb') as f:
+                    self.assertEqual(f.read(), content)
+
+    def test_decompress_dir_include_and_exclude_filters(self):
+        """Test selective extraction with include and exclude glob patterns."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(os.path.join(source_dir, 'src'))
+            os.makedirs(os.path.join(source_dir, 'logs'))
+            for rel_path in ('src/main.py', 'src/util.py', 'src/notes.txt', 'logs/run.log'):
+                with open(os.path.join(source_dir, rel_path), 'wb') as f:
+                    f.write(rel_path.encode() * 10)
+            hashtools.compress_dir(source_dir, archive_path)
+
+            for workers in (None, 2):
+                with self.subTest(workers=workers):
+                    output_dir = os.path.join(temp_dir, f'output_{workers}')
+                    hashtools.decompress_dir(archive_path, output_dir, workers=workers,
+                                             include=['src/*'], exclude='*.txt')
+
+                    self.assertEqual(sorted(os.listdir(output_dir)), ['src'])
+                    self.assertEqual(sorted(os.listdir(os.path.join(output_dir, 'src'))), ['main.py', 'util.py'])
+                    with open(os.path.join(output_dir, 'src', 'util.py'), 'rb') as f:
+                        self.assertEqual(f.read(), b'src/util.py' * 10)
+
+    def test_decompress_dir_parallel_rejects_archive_path_traversal(self):
+        """Test path traversal protection is kept by parallel extraction."""
+        import struct
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            archive_path = os.path.join(temp_dir, 'unsafe.cjz')
+            unsafe_path = b'../escape.txt'
+            with open(archive_path, 'wb') as f:
+                f.write(b"CJZD\x02")
+                f.write(b'\x01')
+                f.write(struct.pack('>I', len(unsafe_path)))
+                f.write(unsafe_path)
+                f.write(struct.pack('>Q', 0))
+                f.write(b'\x10')
+                f.write(struct.pack('>I', 0))
+                f.write(b'\x00')
+
+            for include in (None, 'other/*'):
+                with self.subTest(include=include), self.assertRaises(hashtools.CompressionError):
+                    hashtools.decompress_dir(archive_path, os.path.join(temp_dir, 'output'),
+                                             workers=2, include=include)
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, 'escape.txt')))
+
+    def test_compress_dir_stores_incompressible_blocks_and_groups_small_files(self):
+        """Test per-block codec markers, raw storage and solid records for small files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(os.path.join(source_dir, 'notes'))
+            media = os.urandom(300 * 1024)
+            with open(os.path.join(source_dir, 'media.jpg'), 'wb') as f:
+                f.write(media)
+            for index in range(20):
+                with open(os.path.join(source_dir, 'notes', f'{index}.txt'), 'wb') as f:
+                    f.write(f'small note {index}\n'.encode() * 10)
+            open(os.path.join(source_dir, 'empty.txt'), 'wb').close()
+
+            hashtools.compress_dir(source_dir, archive_path)
+
+            records = []
+            with open(archive_path, 'rb') as archive:
+                for record_type, members, marker in _compress._iter_dir_stream_records(archive):
+                    block_markers = [chunk[:1] for chunk in self._read_record_chunks(archive)]
+                    records.append((record_type, [path for path, _ in members], marker, block_markers))
+
+            media_record = next(record for record in records if record[1] == ['media.jpg'])
+            self.assertEqual(media_record[0], _compress._DIR_RECORD_FILE)
+            self.assertEqual(set(media_record[3]), {_compress._DIR_BLOCK_STORED})
+            solid_records = [record for record in records if record[0] == _compress._DIR_RECORD_SOLID]
+            self.assertEqual(len(solid_records), 1)
+            self.assertEqual(len(solid_records[0][1]), 21)
+            self.assertEqual(solid_records[0][3], [b'\x10'])
+            # The trailing content index holds one hex SHA-256 digest per member.
+            self.assertLess(os.path.getsize(archive_path), len(media) + 1024 + 64 * 22)
+
+            for workers in (None, 2):
+                with self.subTest(workers=workers):
+                    output_dir = os.path.join(temp_dir, f'output_{workers}')
+                    hashtools.decompress_dir(archive_path, output_dir, workers=workers, exclude='notes/1*')
+                    with open(os.path.join(output_dir, 'media.jpg'), 'rb') as f:
+                        self.assertEqual(f.read(), media)
+                    with open(os.path.join(output_dir, 'notes', '7.txt'), 'rb') as f:
+                        self.assertEqual(f.read(), b'small note 7\n' * 10)
+                    self.assertEqual(os.path.getsize(os.path.join(output_dir, 'empty.txt')), 0)
+                    self.assertEqual(len(os.listdir(os.path.join(output_dir, 'notes'))), 9)
+
+    def test_compress_dir_objective_chooses_codec_per_block(self):
+        """Test objective driven per-block codec selection round-trip."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            output_dir = os.path.join(temp_dir, 'output')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(source_dir)
+            log = b''.join(b'2024-01-01 INFO request id=%d status=200\n' % index for index in range(20000))
+            with open(os.path.join(source_dir, 'app.log'), 'wb') as f:
+                f.write(log)
+
+            hashtools.compress_dir(source_dir, archive_path, objective='ratio')
+            hashtools.decompress_dir(archive_path, output_dir)
+
+            with open(os.path.join(output_dir, 'app.log'), 'rb') as f:
+                self.assertEqual(f.read(), log)
+
+    def test_decompress_dir_reads_version_2_stream_archive(self):
+        """Test archives written with per-file streaming compressors still decompress."""
+        import struct
+        import zlib
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            archive_path = os.path.join(temp_dir, 'v2.cjz')
+            output_dir = os.path.join(temp_dir, 'output')
+            content = b'version 2 streaming data\n' * 100
+            path = b'nested/v2.txt'
+            compressor = zlib.compressobj()
+            payload = compressor.compress(content) + compressor.flush()
+            with open(archive_path, 'wb') as f:
+                f.write(b"CJZD\x02")
+                f.write(b'\x01')
+                f.write(struct.pack('>I', len(path)))
+                f.write(path)
+                f.write(struct.pack('>Q', len(content)))
+                f.write(b'\x10')
+                f.write(struct.pack('>I', len(payload)))
+                f.write(payload)
+                f.write(struct.pack('>I', 0))
+                f.write(b'\x00')
+
+            hashtools.decompress_dir(archive_path, output_dir)
+
+            with open(os.path.join(output_dir, 'nested', 'v2.txt'), 'rb') as f:
+                self.assertEqual(f.read(), content)
+
+    @staticmethod
+    def _read_record_chunks(archive):
+        chunks = []
+        while True:
+            chunk_size = _compress._read_uint32(archive)
+            if chunk_size == 0:
+                return chunks
+            chunks.append(archive.read(chunk_size))
+
+    def test_compress_dir_stores_duplicate_contents_once(self):
+        """Test files with identical contents are stored once and referenced by the others."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            archive_path = os.path.join(temp_dir, 'archive.cjz')
+            os.makedirs(os.path.join(source_dir, 'copies'))
+            large = os.urandom(200 * 1024)
+            small = b'duplicated small file\n' * 20
+            for index in range(3):
+                with open(os.path.join(source_dir, 'copies', f'large{index}.bin'), 'wb') as f:
+                    f.write(large)
+                with open(os.path.join(source_dir, 'copies', f'small{index}.txt'), 'wb') as f:
+                    f.write(small)
+
+            _, stats = hashtools.compress_dir(source_dir, archive_path)
+
+            with open(archive_path, 'rb') as archive:
+                record_types = []
+                for record_type, _, _ in _compress._iter_dir_stream_records(archive):
+                    record_types.append(record_type)
+                    if record_type != _compress._DIR_RECORD_REF:
+                        self._read_record_chunks(archive)
+            self.assertEqual(record_types.count(_compress._DIR_RECORD_REF), 4)
+            self.assertEqual(stats.original_size, 3 * (len(large) + len(small)))
+            self.assertLess(os.path.getsize(archive_path), len(large) + 4096)
+
+            for workers in (None, 2):
+                with self.subTest(workers=workers):
+                    output_dir = os.path.join(temp_dir, f'output_{workers}')
+                    hashtools.decompress_dir(archive_path, output_dir, workers=workers, include='copies/*1.*')
+                    self.assertEqual(sorted(os.listdir(os.path.join(output_dir, 'copies'))),
+                                     ['large1.bin', 'small1.txt'])
+                    with open(os.path.join(output_dir, 'copies', 'large1.bin'), 'rb') as f:
+                        self.assertEqual(f.read(), large)
+                    with open(os.path.join(output_dir, 'copies', 'small1.txt'), 'rb') as f:
+                        self.assertEqual(f.read(), small)
+
+    def test_compress_dir_incremental_archive_references_base(self):
+        """Test incremental archives only store changed contents and restore through the base chain."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = os.path.join(temp_dir, 'source')
+            full_path = os.path.join(temp_dir, 'full.cjz')
+            incremental_path = os.path.join(temp_dir, 'incremental.cjz')
+            second_path = os.path.join(temp_dir, 'second.cjz')
+            os.makedirs(source_dir)
+            unchanged = os.urandom(300 * 1024)
+            with open(os.path.join(source_dir, 'unchanged.bin'), 'wb') as f:
+                f.write(unchanged)
+            with open(os.path.join(source_dir, 'changed.txt'), 'wb') as f:
+                f.write(b'first version\n')
+
+            for password in (None, 'secret'):
+                with self.subTest(password=password):
+                    hashtools.compress_dir(source_dir, full_path, password=password)
+                    with open(os.path.join(source_dir, 'changed.txt'), 'wb') as f:
+                        f.write(b'second version\n')
+                    with open(os.path.join(source_dir, 'renamed.bin'), 'wb') as f:
+                        f.write(unchanged)
+
+                    hashtools.compress_dir(source_dir, incremental_path, password=password, base_archive=full_path)
+                    hashtools.compress_dir(source_dir, second_path, password=password,
+                                           base_archive=incremental_path)
+                    self.assertLess(os.path.getsize(incremental_path), 4096)
+
+                    for archive_path in (incremental_path, second_path):
+                        output_dir = os.path.join(temp_dir, f'output_{password}_{os.path.basename(archive_path)}')
+                        hashtools.decompress_dir(archive_path, output_dir, password=password)
+                        self.assertEqual(sorted(os.listdir(output_dir)), ['changed.txt', 'renamed.bin',
+                                                                          'unchanged.bin'])
+                        for name in ('unchanged.bin', 'renamed.bin'):
+                            with open(os.path.join(output_dir, name), 'rb') as f:
+                                self.assertEqual(f.read(), unchanged)
+                        with open(os.path.join(output_dir, 'changed.txt'), 'rb') as f:
+                            self.assertEqual(f.read(), b'second version\n')
+                    os.remove(os.path.join(source_dir, 'renamed.bin'))
+
+            os.remove(full_path)
+            with self.assertRaises(hashtools.CompressionError):
+                hashtools.decompress_dir(incremental_path, os.path.join(temp_dir, 'missing_base'))
+            with self.assertRaises(FileNotFoundError):
+                hashtools.compress_dir(source_dir, second_path, base_archive=full_path)
+            with self.assertRaises(hashtools.CompressionError):
+                hashtools.compress_dir(source_dir, second_path, base_archive=second_path)
+
     def test_compress_dir_emits_info_logs(self):
         """Test directory compression logs start and finish events."""
         with tempfile.TemporaryDirectory() as temp_dir:
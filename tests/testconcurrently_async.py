@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from cereja.concurrently import AsyncProcessor, TokenBucket, amap
+
+
+class AsyncProcessorTest(unittest.TestCase):
+    def test_map_limits_concurrency_and_keeps_order(self):
+        running = 0
+        peak = 0
+
+        async def task(value):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001 * (value % 4))
+            running -= 1
+            return value * 2
+
+        async def source():
+            for value in range(100):
+                yield value
+
+        results = asyncio.run(AsyncProcessor(max_concurrency=7).run(task, source()))
+
+        self.assertEqual(results, [value * 2 for value in range(100)])
+        self.assertLessEqual(peak, 7)
+        self.assertGreater(peak, 1)
+
+    def test_amap_as_completed_with_sync_callable(self):
+        threads = set()
+
+        def task(value, offset=0):
+            threads.add(threading.current_thread())
+            time.sleep(0.02 if value == 0 else 0)
+            return value + offset
+
+        async def collect():
+            return [result async for result in amap(task, range(5), max_concurrency=5, ordered=False, offset=10)]
+
+        results = asyncio.run(collect())
+
+        self.assertEqual(sorted(results), [10, 11, 12, 13, 14])
+        self.assertEqual(results[-1], 10)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_map_retries_and_raises_or_returns_exceptions(self):
+        attempts = {}
+
+        async def flaky(value):
+            attempts[value] = attempts.get(value, 0) + 1
+            if value == 3 and attempts[value] < 3:
+                raise ConnectionError("temporary")
+            if value == 4:
+                raise ValueError("permanent")
+            return value
+
+        processor = AsyncProcessor(retries=2, retry_on=(ConnectionError,), return_exceptions=True)
+        results = asyncio.run(processor.run(flaky, range(5)))
+
+        self.assertEqual(results[:4], [0, 1, 2, 3])
+        self.assertIsInstance(results[4], ValueError)
+        self.assertEqual(attempts[3], 3)
+        self.assertEqual(attempts[4], 1)
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncProcessor().run(flaky, [4]))
+
+    def test_amap_forwards_retry_and_exception_options(self):
+        attempts = {}
+
+        async def flaky(value):
+            attempts[value] = attempts.get(value, 0) + 1
+            if value == 1 and attempts[value] < 2:
+                raise ConnectionError("temporary")
+            if value == 2:
+                raise ValueError("permanent")
+            return value
+
+        async def collect():
+            return [result async for result in amap(flaky, range(3), retries=1, retry_on=(ConnectionError,),
+                                                    return_exceptions=True)]
+
+        results = asyncio.run(collect())
+
+        self.assertEqual(results[:2], [0, 1])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(attempts, {0: 1, 1: 2, 2: 1})
+
+    def test_map_rate_limit_spaces_calls(self):
+        started = []
+
+        async def task(value):
+            started.append(time.monotonic())
+            return value
+
+        asyncio.run(AsyncProcessor(rate=50, burst=1).run(task, range(6)))
+
+        self.assertGreaterEqual(started[-1] - started[0], 5 / 50 * 0.9)
+
+    def test_map_reads_input_lazily_and_cancels_on_close(self):
+        pulled = []
+
+        def source():
+            for value in range(1000):
+                pulled.append(value)
+                yield value
+
+        async def task(value):
+            await asyncio.sleep(0)
+            return value
+
+        async def first_results():
+            results = []
+            stream = AsyncProcessor(max_concurrency=4).map(task, source())
+            async for result in stream:
+                results.append(result)
+                if len(results) == 3:
+                    break
+            await stream.aclose()
+            return results
+
+        self.assertEqual(asyncio.run(first_results()), [0, 1, 2])
+        self.assertLess(len(pulled), 10)
+
+    def test_invalid_options_raise(self):
+        with self.assertRaises(ValueError):
+            AsyncProcessor(max_concurrency=0)
+        with self.assertRaises(ValueError):
+            AsyncProcessor(retries=-1)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=100, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.01, delta=0.005)
+        self.assertAlmostEqual(bucket.reserve(), 0.02, delta=0.005)
+        with self.assertRaises(ValueError):
+            bucket.reserve(4)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,19 @@
+import os
 import threading
 import time
 import unittest
 
+from cereja.concurrently import LatencyHistogram, TokenBucket
+from cereja.concurrently._limits import _AIMDController
 from cereja.concurrently.process import MultiProcess, Processor, WorkerQueue
 
 
+def _square_with_pid(value):
+    if value == 13:
+        raise ValueError("unlucky item")
+    return value * value, os.getpid()
+
+
 class MultiProcessTest(unittest.TestCase):
     def test_map_with_on_result_waits_for_all_tasks(self):
         observed = []
@@ -25,6 +34,65 @@ class MultiProcessTest(unittest.TestCase):
         self.assertEqual(len(observed), 4)
         self.assertEqual([item for _, item in sorted(observed)], [2, 4, 6, 8])
 
+    def test_map_reuses_a_bounded_set_of_threads(self):
+        thread_names = set()
+        lock = threading.Lock()
+
+        def task(value):
+            with lock:
+                thread_names.add(threading.current_thread().name)
+            return value + 1
+
+        threads_before = threading.active_count()
+        result = MultiProcess(max_threads=3).map(task, range(500), verbose=False)
+
+        self.assertEqual(result, list(range(1, 501)))
+        self.assertLessEqual(len(thread_names), 3)
+        self.assertEqual(threading.active_count(), threads_before)
+
+    def test_map_stops_scheduling_after_first_failure(self):
+        executed = []
+
+        def task(value):
+            executed.append(value)
+            if value == 5:
+                raise ValueError("failure")
+            time.sleep(0.001)
+            return value
+
+        result = MultiProcess(max_threads=2).map(task, range(1000), verbose=False)
+
+        self.assertLess(len(executed), 20)
+        self.assertNotIn(5, result)
+        self.assertEqual(result, sorted(result))
+
+    def test_get_metrics_separates_queue_wait_from_execution(self):
+        snapshots = []
+
+        def task(value):
+            time.sleep(0.01)
+            if value == 9:
+                raise ValueError("failure")
+            return value
+
+        multi = MultiProcess(max_threads=10)
+        multi.map(task, range(10), verbose=False)
+        metrics = multi.get_metrics()
+
+        self.assertEqual((metrics["success"], metrics["failure"], metrics["in_flight"]), (9, 1, 0))
+        self.assertEqual(metrics["execution"]["count"], 10)
+        self.assertGreaterEqual(metrics["execution"]["p50"], 0.008)
+        self.assertLess(metrics["queue_wait"]["p50"], 0.005)
+        self.assertGreater(metrics["throughput"], 0)
+
+        # With a single worker every item waits for the previous one to finish.
+        starved = MultiProcess(max_threads=1, metrics_callback=snapshots.append, metrics_interval=0.01)
+        starved.map(task, range(5), verbose=False)
+        self.assertGreaterEqual(starved.get_metrics()["queue_wait"]["p50"], 0.008)
+        self.assertGreaterEqual(len(snapshots), 2)
+        self.assertEqual(snapshots[-1]["success"], 5)
+
+
 
 class WorkerQueueTest(unittest.TestCase):
     def test_get_available_response_returns_item_when_take_indx_false(self):
@@ -33,6 +101,121 @@ class WorkerQueueTest(unittest.TestCase):
         result = worker.get_available_response(timeout=2)
         self.assertEqual(result, 11)
 
+    def test_batch_size_groups_queued_items_and_keeps_order(self):
+        calls_by_thread = {}
+
+        def task(value):
+            name = threading.current_thread().name
+            calls_by_thread[name] = calls_by_thread.get(name, 0) + 1
+            return value * 10
+
+        worker = WorkerQueue(func_task=task, max_threads=2, batch_size=50)
+        for value in range(500):
+            worker.put(value)
+
+        self.assertEqual(worker.get_all_tasks_response(), [value * 10 for value in range(500)])
+        self.assertEqual(sum(calls_by_thread.values()), 500)
+        with self.assertRaises(ValueError):
+            WorkerQueue(func_task=task, batch_size=0)
+
+    def test_batch_failure_skips_only_the_failed_item(self):
+        def task(value):
+            if value == 3:
+                raise ValueError("bad item")
+            return value
+
+        worker = WorkerQueue(func_task=task, max_threads=1, batch_size=50)
+        for value in range(100):
+            worker.put(value)
+
+        self.assertEqual(worker.get_all_tasks_response(), [value for value in range(100) if value != 3])
+
+    def test_get_all_tasks_response_keeps_input_order_on_reused_workers(self):
+        def task(value):
+            time.sleep(0.001 * (value % 3))
+            return value * 10
+
+        worker = WorkerQueue(func_task=task, max_threads=4)
+        for value in range(50):
+            worker.put(value)
+
+        self.assertEqual(worker.get_all_tasks_response(), [value * 10 for value in range(50)])
+        self.assertLessEqual(len(worker._workers), 4)
+
+    def test_results_streams_in_order_while_items_are_put(self):
+        def task(value):
+            if value == 7:
+                raise ValueError("bad item")
+            time.sleep(0.002 * (3 - value % 4))
+            return value * 10
+
+        worker = WorkerQueue(func_task=task, max_threads=4, max_buffered_results=8)
+
+        def produce():
+            for value in range(100):
+                worker.put(value)
+            worker.close()
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        received = list(worker.results(timeout=5))
+        producer.join()
+
+        self.assertEqual(received, [(value, value * 10) for value in range(100) if value != 7])
+        self.assertLessEqual(len(worker._buffer), 8)
+        with self.assertRaises(RuntimeError):
+            worker.put(1)
+
+    def test_results_unordered_yields_ready_items_first(self):
+        release = threading.Event()
+
+        def task(value):
+            if value == 0:
+                release.wait(2)
+            return value
+
+        worker = WorkerQueue(func_task=task, max_threads=2)
+        worker.put(0)
+        worker.put(1)
+        worker.close()
+        stream = worker.results(ordered=False, timeout=2)
+
+        self.assertEqual(next(stream), (1, 1))
+        release.set()
+        self.assertEqual(list(stream), [(0, 0)])
+
+    def test_max_buffered_results_bounds_dispatched_items(self):
+        started = []
+        worker = WorkerQueue(func_task=started.append, max_threads=2, batch_size=10, max_buffered_results=3)
+        for value in range(20):
+            worker.put(value)
+        time.sleep(0.05)
+
+        self.assertEqual(sorted(started), [0, 1, 2])
+        stream = worker.results(timeout=2)
+        next(stream)
+        worker.close()
+        self.assertEqual(len(list(stream)), 19)
+        self.assertEqual(sorted(started), list(range(20)))
+        with self.assertRaises(ValueError):
+            WorkerQueue(func_task=started.append, max_buffered_results=0)
+
+    def test_get_metrics_reports_queued_items_and_wait(self):
+        release = threading.Event()
+        worker = WorkerQueue(func_task=lambda value: release.wait(2), max_threads=1)
+        for value in range(5):
+            worker.put(value)
+        time.sleep(0.05)
+        metrics = worker.get_metrics()
+        self.assertEqual(metrics["in_flight"], 1)
+        self.assertGreaterEqual(metrics["queued"], 3)
+
+        release.set()
+        worker.get_all_tasks_response()
+        metrics = worker.get_metrics()
+        self.assertEqual(metrics["success"], 5)
+        self.assertGreaterEqual(metrics["queue_wait"]["max"], 0.04)
+
 
 class ProcessorTest(unittest.TestCase):
     def test_stop_process_before_start_is_safe(self):
@@ -52,3 +235,167 @@ class ProcessorTest(unittest.TestCase):
         self.assertTrue(processor.stopped)
         self.assertIsNone(processor._process_result_service)
 
+
+    def test_process_executor_runs_batches_in_worker_processes(self):
+        observed = []
+        callback_threads = set()
+
+        def on_result(result):
+            callback_threads.add(threading.current_thread().name)
+            observed.append(result)
+
+        processor = Processor(num_workers=2, use_progress=False, on_result=on_result,
+                              executor="process", batch_size=4)
+        processor.process(_square_with_pid, range(30))
+
+        self.assertEqual(sorted(value for value, _ in observed), [i * i for i in range(30) if i != 13])
+        self.assertNotIn(os.getpid(), {pid for _, pid in observed})
+        self.assertEqual(callback_threads, {"PROCESS_RESULT_SERVICE"})
+        self.assertEqual(processor.get_failure_data(), [13])
+        self.assertEqual(processor.total_processed, 30)
+        self.assertEqual(processor.in_progress_count, 0)
+
+    def test_thread_executor_does_not_send_failures_to_on_result(self):
+        observed = []
+        processor = Processor(num_workers=3, use_progress=False, on_result=observed.append)
+        processor.process(_square_with_pid, [1, 13, 2])
+
+        self.assertEqual(sorted(value for value, _ in observed), [1, 4])
+        self.assertEqual(processor.get_failure_data(), [13])
+
+    def test_invalid_executor_options_raise(self):
+        with self.assertRaises(ValueError):
+            Processor(executor="fiber")
+        with self.assertRaises(ValueError):
+            Processor(executor="process", batch_size=0)
+
+    def test_process_backpressure_bounds_in_flight_items(self):
+        peak = []
+        processor = Processor(num_workers=4, max_in_progress=5, use_progress=False)
+
+        def task(value):
+            peak.append(processor.in_progress_count)
+            time.sleep(0.001)
+            return value
+
+        started = time.monotonic()
+        processor.process(task, range(200))
+
+        self.assertLessEqual(max(peak), 5)
+        self.assertEqual(processor.total_processed, 200)
+        self.assertIsNone(processor._process_result_service)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_stop_process_ends_result_service_without_polling_delay(self):
+        processor = Processor(num_workers=1, use_progress=False)
+        processor.restart_process()
+        service = processor._process_result_service
+        started = time.monotonic()
+        processor.stop_process()
+
+        self.assertFalse(service.is_alive())
+        self.assertLess(time.monotonic() - started, 0.05)
+
+    def test_rate_limit_allows_burst_then_spaces_submissions(self):
+        submitted = []
+        processor = Processor(num_workers=4, use_progress=False, rate=50, burst=3)
+        processor.process(lambda value: submitted.append(time.monotonic()), range(9))
+
+        submitted.sort()
+        self.assertLess(submitted[2] - submitted[0], 0.02)
+        self.assertGreaterEqual(submitted[-1] - submitted[0], 6 / 50 * 0.9)
+
+    def test_rate_limiter_is_shared_between_processors(self):
+        bucket = TokenBucket(rate=100)
+        started = time.monotonic()
+        threads = [
+            threading.Thread(target=Processor(use_progress=False, rate_limiter=bucket).process,
+                             args=(lambda value: value, range(10)))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.monotonic() - started, 19 / 100 * 0.9)
+
+    def test_adaptive_limit_backs_off_when_latency_grows(self):
+        running = 0
+        lock = threading.Lock()
+
+        def saturating_task(value):
+            nonlocal running
+            with lock:
+                running += 1
+                current = running
+            time.sleep(0.002 if current <= 3 else 0.02)
+            with lock:
+                running -= 1
+            return value
+
+        processor = Processor(num_workers=16, max_in_progress=16, use_progress=False, adaptive=True)
+        processor.process(saturating_task, range(300))
+
+        self.assertEqual(processor.total_processed, 300)
+        self.assertLess(processor.concurrency_limit, 16)
+
+    def test_aimd_controller_grows_and_halves(self):
+        controller = _AIMDController(initial=4, maximum=10, target_latency=1.0)
+        for _ in range(20):
+            controller.record(0.1)
+        self.assertGreater(controller.limit, 4)
+        grown = controller.limit
+        controller.record(0.1, failed=True)
+        self.assertLessEqual(controller.limit, grown * 0.5 + 1)
+        halved = controller.limit
+        # Slow completions right after a decrease belong to the same congestion event.
+        controller.record(5.0)
+        self.assertEqual(controller.limit, halved)
+
+    def test_batch_size_keeps_per_item_results_and_failures(self):
+        observed = []
+        processor = Processor(num_workers=2, use_progress=False, on_result=observed.append, batch_size=16)
+        processor.process(_square_with_pid, range(100))
+
+        self.assertEqual(sorted(value for value, _ in observed), [i * i for i in range(100) if i != 13])
+        self.assertEqual(processor.get_failure_data(), [13])
+        self.assertEqual(processor.total_processed, 100)
+
+    def test_auto_batch_size_grows_for_fine_grained_items(self):
+        processor = Processor(num_workers=2, max_in_progress=1000, use_progress=False, batch_size="auto")
+        processor.process(lambda value: value, range(5000))
+
+        self.assertEqual(processor.total_processed, 5000)
+        self.assertGreater(processor._batch_size, 16)
+        with self.assertRaises(ValueError):
+            Processor(batch_size=0)
+
+    def test_get_metrics_counts_items_of_batches(self):
+        processor = Processor(num_workers=2, use_progress=False, batch_size=8)
+        processor.process(_square_with_pid, range(40))
+        metrics = processor.get_metrics()
+
+        self.assertEqual((metrics["success"], metrics["failure"], metrics["in_flight"]), (39, 1, 0))
+        self.assertEqual(metrics["queue_wait"]["count"], 40)
+        self.assertEqual(metrics["batch_size"], 8)
+        processor.restart_process()
+        self.assertEqual(processor.get_metrics()["success"], 0)
+        processor.stop_process()
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_quantiles_are_close_to_observed_values(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.observe(value / 1000)
+        snapshot = histogram.snapshot()
+
+        self.assertEqual(snapshot["count"], 1000)
+        self.assertAlmostEqual(snapshot["p50"], 0.5, delta=0.05)
+        self.assertAlmostEqual(snapshot["p95"], 0.95, delta=0.095)
+        self.assertAlmostEqual(snapshot["p99"], 0.99, delta=0.099)
+        self.assertEqual(snapshot["buckets"][-1][1], 1000)
+        self.assertEqual([count for _, count in snapshot["buckets"]],
+                         sorted(count for _, count in snapshot["buckets"]))
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
@@ -109,6 +109,140 @@ class CryptoTest(unittest.TestCase):
                 self.assertEqual(len(first), size)
                 self.assertEqual(first, second)
     
+    def test_keystream_blocks_are_hmac_of_iv_and_counter(self):
+        """Test keystream blocks match HMAC-SHA256, including keys longer than the hash block."""
+        import hashlib
+        import hmac
+
+        iv = b"i" * 16
+        for key in (b"k" * 16, b"k" * 100):
+            with self.subTest(key_size=len(key)):
+                expected = b"".join(
+                        hmac.new(key, iv + counter.to_bytes(4, "big"), hashlib.sha256).digest()
+                        for counter in range(2, 5)
+                )
+                self.assertEqual(_crypto._generate_keystream(key, iv, 90, start_block=2), expected[:90])
+
+    def test_decrypt_file_leaves_output_untouched_on_failure(self):
+        """Test a failed decryption neither replaces the output nor leaves temporary files behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, 'data.bin')
+            restored = os.path.join(temp_dir, 'restored.bin')
+            with open(source, 'wb') as f:
+                f.write(os.urandom(_crypto._CIPHER_CHUNK_SIZE + 17))
+            with open(restored, 'wb') as f:
+                f.write(b"previous")
+            encrypted_file = hashtools.encrypt_file(source, "password")
+
+            with self.assertRaises(hashtools.CryptoError):
+                hashtools.decrypt_file(encrypted_file, "wrong", restored)
+            with open(encrypted_file, 'r+b') as f:
+                f.seek(100)
+                tampered = b'A' if f.read(1) != b'A' else b'B'
+                f.seek(100)
+                f.write(tampered)
+            with self.assertRaises(hashtools.CryptoError):
+                hashtools.decrypt_file(encrypted_file, "password", restored)
+
+            with open(restored, 'rb') as f:
+                self.assertEqual(f.read(), b"previous")
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['data.bin', 'data.bin.enc', 'restored.bin'])
+
+            hashtools.encrypt_file(source, "password", encrypted_file)
+            self.assertEqual(hashtools.decrypt_file(encrypted_file, "password", encrypted_file), encrypted_file)
+            with open(source, 'rb') as original, open(encrypted_file, 'rb') as f:
+                self.assertEqual(f.read(), original.read())
+
+    @unittest.skipUnless(os.name == "posix", "file modes are POSIX only")
+    def test_decrypt_file_output_mode_follows_umask_or_replaced_file(self):
+        """Test decrypted files get the default mode, or keep the mode of the file they replace."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, 'data.bin')
+            restored = os.path.join(temp_dir, 'restored.bin')
+            with open(source, 'wb') as f:
+                f.write(b"secret data")
+            encrypted_file = hashtools.encrypt_file(source, "password")
+
+            previous_umask = os.umask(0o022)
+            try:
+                hashtools.decrypt_file(encrypted_file, "password", restored)
+                self.assertEqual(os.stat(restored).st_mode & 0o777, 0o644)
+                os.chmod(restored, 0o640)
+                hashtools.decrypt_file(encrypted_file, "password", restored)
+                self.assertEqual(os.stat(restored).st_mode & 0o777, 0o640)
+            finally:
+                os.umask(previous_umask)
+
+    def test_apply_keystream_matches_full_keystream_at_any_offset(self):
+        """Test chunked keystream application stays compatible with the single-shot keystream."""
+        key = b"k" * 16
+        iv = b"i" * 16
+        data = os.urandom(_crypto._CIPHER_CHUNK_SIZE + 1000)
+        keystream = _crypto._generate_keystream(key, iv, len(data) + 100)
+
+        for offset in (0, 1, 31, 32, 100):
+            with self.subTest(offset=offset):
+                expected = bytes(x ^ y for x, y in zip(data, keystream[offset:]))
+                self.assertEqual(_crypto._apply_keystream(key, iv, data, offset), expected)
+
+    def test_encrypt_file_multi_chunk_is_compatible_with_decrypt(self):
+        """Test streamed file encryption produces the same format as encrypt()."""
+        original = os.urandom(_crypto._CIPHER_CHUNK_SIZE * 2 + 17)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, 'data.bin')
+            restored = os.path.join(temp_dir, 'restored.bin')
+            with open(source, 'wb') as f:
+                f.write(original)
+
+            encrypted_file = hashtools.encrypt_file(source, "password")
+            with open(encrypted_file, 'r', encoding='utf-8') as f:
+                self.assertEqual(hashtools.decrypt(f.read(), "password"), original)
+
+            hashtools.decrypt_file(encrypted_file, "password", restored)
+            with open(restored, 'rb') as f:
+                self.assertEqual(f.read(), original)
+
+    def test_stream_encryptor_round_trip_across_chunks(self):
+        """Test chunked stream encryption round-trip with partial reads."""
+        import io
+
+        original = os.urandom(1000)
+        buffer = io.BytesIO()
+        with _crypto._StreamEncryptor(buffer, "password", chunk_size=64) as encrypted:
+            encrypted.write(original[:10])
+            encrypted.write(original[10:])
+
+        reader = _crypto._StreamDecryptor(io.BytesIO(buffer.getvalue()), "password")
+        parts = []
+        while True:
+            part = reader.read(33)
+            if not part:
+                break
+            parts.append(part)
+
+        self.assertEqual(b''.join(parts), original)
+
+    def test_stream_decryptor_rejects_tampering_and_truncation(self):
+        """Test chunk authentication detects modified, truncated and wrong-password streams."""
+        import io
+
+        buffer = io.BytesIO()
+        with _crypto._StreamEncryptor(buffer, "password", chunk_size=64) as encrypted:
+            encrypted.write(b"stream data " * 50)
+        payload = buffer.getvalue()
+        tampered = bytearray(payload)
+        tampered[40] ^= 1
+        chunk_length = 5 + 64 + 32
+
+        cases = {
+            "tampered": (bytes(tampered), "password"),
+            "truncated": (payload[:32 + chunk_length * 2], "password"),
+            "wrong_password": (payload, "wrong"),
+        }
+        for name, (data, password) in cases.items():
+            with self.subTest(case=name), self.assertRaises(hashtools.CryptoError):
+                _crypto._StreamDecryptor(io.BytesIO(data), password).read()
+
     def test_special_characters(self):
         """Test encryption with special characters."""
         original = "Special chars: !@#$%^&*()_+-=[]{}|;':\",./<>?`~\n\t\r"
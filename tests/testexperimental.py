@@ -0,0 +1,103 @@
+import array
+import itertools
+import multiprocessing
+import time
+import unittest
+
+from cereja.experimental import ParallelProcess
+
+OFFSET = 0
+
+
+def _describe(value):
+    if value == -1:
+        raise ValueError("negative item")
+    if isinstance(value, (bytes, bytearray, array.array)):
+        return type(value).__name__, len(value), value[-1]
+    return value * 2 + OFFSET
+
+
+def _slow_first(value):
+    if value == 0:
+        time.sleep(0.5)
+    return value
+
+
+class ParallelProcessTest(unittest.TestCase):
+    def test_map_reuses_workers_and_applies_global_scope(self):
+        with ParallelProcess(_describe, global_scope={"OFFSET": 1}, n_proc=2, chunk_size=7) as pool:
+            self.assertEqual(pool.map(range(50)), [value * 2 + 1 for value in range(50)])
+            workers = pool._pool
+            self.assertEqual(sorted(pool.map(range(20), ordered=False)), [value * 2 + 1 for value in range(20)])
+            self.assertIs(pool._pool, workers)
+        self.assertIsNone(pool._pool)
+
+    def test_imap_is_lazy_over_unbounded_input(self):
+        with ParallelProcess(_describe, n_proc=2, chunk_size=4, max_pending_chunks=2) as pool:
+            stream = pool.imap(itertools.count())
+            self.assertEqual([next(stream) for _ in range(10)], [value * 2 for value in range(10)])
+            stream.close()
+
+    def test_ordered_imap_bounds_results_behind_a_slow_chunk(self):
+        pulled = []
+
+        def source():
+            for value in itertools.count():
+                pulled.append(value)
+                yield value
+
+        with ParallelProcess(_slow_first, n_proc=2, max_pending_chunks=3) as pool:
+            stream = pool.imap(source())
+            self.assertEqual(next(stream), 0)
+            self.assertLessEqual(len(pulled), 3)
+            stream.close()
+
+    def test_run_outside_with_block_stops_its_workers(self):
+        pool = ParallelProcess(_describe, n_proc=2)
+        self.assertEqual(pool.run(range(5)), [0, 2, 4, 6, 8])
+        self.assertIsNone(pool._pool)
+        with pool:
+            pool.run(range(3))
+            self.assertIsNotNone(pool._pool)
+        self.assertIsNone(pool._pool)
+
+    def test_large_bytes_like_items_round_trip_through_shared_memory(self):
+        items = [b"x" * 4096, bytearray(b"y" * 4096), array.array("q", range(1024)), b"small"]
+        with ParallelProcess(_describe, n_proc=2, shared_memory_threshold=1024) as pool:
+            self.assertEqual(
+                    pool.run(items),
+                    [("bytes", 4096, ord("x")), ("bytearray", 4096, ord("y")), ("array", 1024, 1023), ("bytes", 5, ord("l"))],
+            )
+
+    def test_worker_exception_is_raised_with_remote_traceback(self):
+        with ParallelProcess(_describe, n_proc=2) as pool:
+            with self.assertRaises(ValueError) as context:
+                pool.map([1, -1, 2])
+            self.assertIn("negative item", str(context.exception.__cause__))
+            self.assertEqual(pool.map([3]), [6])
+
+    def test_invalid_options_raise(self):
+        with self.assertRaises(ValueError):
+            ParallelProcess(_describe, n_proc=0)
+        with self.assertRaises(ValueError):
+            ParallelProcess(_describe, chunk_size=0)
+
+    def test_unimportable_function_without_fork_raises_type_error(self):
+        offset = 1
+
+        def closure(value):
+            return value + offset
+
+        for function in (lambda value: value, closure):
+            with self.assertRaises(TypeError) as context:
+                ParallelProcess(function, n_proc=1, context="spawn")
+            self.assertIn("module level", str(context.exception))
+        with ParallelProcess(_describe, n_proc=1, context="spawn") as pool:
+            self.assertIsNone(pool._pool)
+        if "fork" in multiprocessing.get_all_start_methods():
+            pool = ParallelProcess(lambda value: value + 1, n_proc=1, context="fork")
+            self.assertEqual(pool.run(range(3)), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
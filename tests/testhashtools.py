@@ -1,5 +1,7 @@
 import unittest
 import hashlib
+import os
+import tempfile
 from cereja import hashtools
 
 
@@ -73,6 +75,107 @@ class HashtoolsTest(unittest.TestCase):
         h = hashtools.random_hash(8)
         int(h, 16)  # Should not raise ValueError
 
+    def test_hash_file_matches_hashlib(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "data.bin")
+            content = os.urandom(300 * 1024)
+            with open(file_path, "wb") as f:
+                f.write(content)
+
+            for algorithm in ("sha256", "blake2b", "md5"):
+                with self.subTest(algorithm=algorithm):
+                    expected = hashlib.new(algorithm, content).hexdigest()
+                    self.assertEqual(hashtools.hash_file(file_path, algorithm), expected)
+                    self.assertEqual(hashtools.hash_file(file_path, algorithm, chunk_size=1000), expected)
+            with self.assertRaises(ValueError):
+                hashtools.hash_file(file_path, "not-an-algorithm")
+
+    def test_hash_dir_depends_on_contents_and_layout(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def make_tree(root, files):
+                for rel_path, content in files.items():
+                    os.makedirs(os.path.join(root, os.path.dirname(rel_path)), exist_ok=True)
+                    with open(os.path.join(root, rel_path), "wb") as f:
+                        f.write(content)
+                return root
+
+            files = {"a.txt": b"alpha", os.path.join("sub", "b.txt"): b"beta", os.path.join("sub", "c", "d"): b""}
+            first = make_tree(os.path.join(temp_dir, "first"), files)
+            second = make_tree(os.path.join(temp_dir, "second"), dict(reversed(list(files.items()))))
+            moved = make_tree(os.path.join(temp_dir, "moved"), {"b.txt": b"beta", os.path.join("sub", "a.txt"): b"alpha",
+                                                                os.path.join("sub", "c", "d"): b""})
+
+            digest = hashtools.hash_dir(first)
+            self.assertEqual(len(digest), 64)
+            self.assertEqual(hashtools.hash_dir(second, workers=4), digest)
+            self.assertNotEqual(hashtools.hash_dir(moved), digest)
+            self.assertNotEqual(hashtools.hash_dir(first, "blake2b"), digest)
+
+            os.makedirs(os.path.join(second, "empty"))
+            self.assertNotEqual(hashtools.hash_dir(second), digest)
+            with open(os.path.join(first, "a.txt"), "ab") as f:
+                f.write(b"!")
+            self.assertNotEqual(hashtools.hash_dir(first), digest)
+            with self.assertRaises(NotADirectoryError):
+                hashtools.hash_dir(os.path.join(first, "a.txt"))
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks are not supported")
+    def test_hash_dir_hashes_symlinks_as_links(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = os.path.join(temp_dir, "root")
+            os.makedirs(os.path.join(root, "real"))
+            with open(os.path.join(root, "real", "a.txt"), "wb") as f:
+                f.write(b"alpha")
+            try:
+                os.symlink("real", os.path.join(root, "linked"), target_is_directory=True)
+            except OSError:
+                self.skipTest("symlinks are not permitted")
+            os.symlink(root, os.path.join(root, "real", "cycle"), target_is_directory=True)
+            os.symlink("missing", os.path.join(root, "broken"))
+
+            digest = hashtools.hash_dir(root)
+            self.assertEqual(hashtools.hash_dir(root, workers=2), digest)
+            os.remove(os.path.join(root, "linked"))
+            os.symlink("real/", os.path.join(root, "linked"), target_is_directory=True)
+            self.assertNotEqual(hashtools.hash_dir(root), digest)
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "FIFOs are not supported")
+    def test_hash_dir_does_not_open_special_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "a.txt"), "wb") as f:
+                f.write(b"alpha")
+            with open(os.path.join(temp_dir, "pipe"), "wb"):
+                pass
+            regular = hashtools.hash_dir(temp_dir)
+            os.remove(os.path.join(temp_dir, "pipe"))
+            # a FIFO without a writer would block forever if it were opened
+            os.mkfifo(os.path.join(temp_dir, "pipe"))
+
+            digest = hashtools.hash_dir(temp_dir)
+            self.assertNotEqual(digest, regular)
+            self.assertEqual(hashtools.hash_dir(temp_dir, workers=2), digest)
+
+    def test_hash_object_is_canonical(self):
+        value = {"b": [1, 2.5, None, True], "a": {"x": b"bytes", "y": (1, "2")}, 3: {1, 2, 3}}
+        reordered = {3: {3, 2, 1}, "a": {"y": (1, "2"), "x": b"bytes"}, "b": [1, 2.5, None, True]}
+        self.assertEqual(hashtools.hash_object(value), hashtools.hash_object(reordered))
+        self.assertEqual(len(hashtools.hash_object(value, "md5")), 32)
+
+        distinct = [1, True, 1.0, "1", b"1", [1], (1,), {1}, {1: None}, None, [[1], 2], [[1, 2]], -1, 2 ** 100]
+        digests = {hashtools.hash_object(item) for item in distinct}
+        self.assertEqual(len(digests), len(distinct))
+        self.assertEqual(hashtools.hash_object(["x" * 100_000] * 10), hashtools.hash_object(["x" * 100_000] * 10))
+        with self.assertRaises(TypeError):
+            hashtools.hash_object({"value": object()})
+
+    def test_hash_object_is_type_sensitive(self):
+        # Equal values of different types, or floats with different bits, hash differently.
+        for left, right in ((1, 1.0), (1, True), (1.0, True), (0.0, -0.0), ({1: "a"}, {1.0: "a"}), (1 + 0j, 1.0)):
+            self.assertEqual(left, right)
+            self.assertNotEqual(hashtools.hash_object(left), hashtools.hash_object(right))
+        self.assertEqual(hashtools.hash_object(b"1"), hashtools.hash_object(bytearray(b"1")))
+        self.assertEqual(hashtools.hash_object(float("nan")), hashtools.hash_object(float("nan")))
+
 
 if __name__ == "__main__":
     unittest.main()
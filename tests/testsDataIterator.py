@@ -1,5 +1,14 @@
+import itertools
+import math
+import random
+import statistics
+import threading
+import time
 import unittest
+
+from cereja.mathtools import StreamingStats
 from cereja.utils import DataIterator
+from cereja.utils._utils import DataNumberIterator, DataStringIterator
 
 
 class TestDataIterator(unittest.TestCase):
@@ -45,6 +54,28 @@ class TestDataIterator(unittest.TestCase):
         batches = iterator.batch(batch_size=2)
         self.assertEqual(list(batches), [[1, 2], [3, 4], [5]])
 
+    def test_batch_streams_lazy_pipelines(self):
+        pulled = []
+
+        def source():
+            for value in itertools.count():
+                pulled.append(value)
+                yield value
+
+        batches = DataIterator(source(), lazy=True, chunk_size=8).map(lambda x: x * 2).batch(batch_size=4)
+        self.assertTrue(batches.is_lazy)
+        self.assertEqual(batches.take(2), [[0, 2, 4, 6], [8, 10, 12, 14]])
+        self.assertLessEqual(len(pulled), 16)
+
+        padded = DataIterator(range(7), lazy=True).batch(batch_size=3, fill_with=0)
+        self.assertEqual(list(padded), [[0, 1, 2], [3, 4, 5], [6, 0, 0]])
+        self.assertEqual(list(padded), [[0, 1, 2], [3, 4, 5], [6, 0, 0]])
+
+        shuffled = DataIterator(range(20)).batch(batch_size=5, shuffle_buffer=6, seed=3)
+        self.assertEqual(sorted(itertools.chain.from_iterable(shuffled)), list(range(20)))
+        with self.assertRaises(ValueError):
+            DataIterator(range(5)).batch(batch_size=2, step=1, fill_with=0)
+
     def test_cycle_elements(self):
         data = [1, 2, 3]
         iterator = DataIterator(data)
@@ -135,3 +166,192 @@ class TestDataIterator(unittest.TestCase):
         self.assertEqual(freq[1], 1)
         self.assertEqual(freq[2], 2)
         self.assertEqual(freq[3], 3)
+
+
+class TestLazyDataIterator(unittest.TestCase):
+
+    def test_chained_steps_run_in_one_chunked_pass(self):
+        pulled = []
+
+        def source():
+            for value in range(10 ** 6):
+                pulled.append(value)
+                yield str(value)
+
+        pipeline = DataIterator(source(), lazy=True, chunk_size=100).map(int).filter(lambda x: x % 2 == 0)
+        self.assertTrue(pipeline.is_lazy)
+        self.assertEqual(pipeline.map(lambda x: x * 10).take(3), [0, 20, 40])
+        self.assertEqual(len(pulled), 100)
+
+    def test_conversions_keep_the_pipeline_lazy(self):
+        numbers = DataIterator(["1", "2", "3"], lazy=True).int
+        self.assertTrue(numbers.is_lazy)
+        self.assertEqual(numbers.sum(), 6)
+        self.assertEqual((len(numbers), numbers.first, numbers.last, numbers[1]), (3, 1, 3, 2))
+        self.assertEqual(DataIterator(["a", "b"], lazy=True).str.upper().take(), ["A", "B"])
+        with self.assertRaises(TypeError):
+            DataIterator([1, 2], lazy=True).str.map(len).take()
+
+    def test_cache_replays_one_shot_sources(self):
+        pipeline = DataIterator(iter(range(5)), lazy=True, cache=True).map(lambda x: x + 1)
+        self.assertEqual(pipeline.take(2), [1, 2])
+        self.assertEqual(pipeline.take(), [1, 2, 3, 4, 5])
+        self.assertEqual(pipeline.reduce(lambda a, b: a + b, 0), 15)
+        self.assertEqual(len(pipeline), 5)
+
+        uncached = DataIterator(iter(range(5)), lazy=True)
+        with self.assertRaises(TypeError):
+            len(uncached)
+        self.assertEqual(list(uncached), [0, 1, 2, 3, 4])
+
+    def test_successive_reads_of_a_one_shot_source_lose_no_items(self):
+        pipeline = DataIterator(iter(range(10)), lazy=True, chunk_size=4).map(lambda x: x * 10)
+        self.assertFalse(pipeline.is_empty)
+        self.assertEqual(pipeline.first, 0)
+        self.assertEqual(pipeline.take(3), [0, 10, 20])
+        self.assertEqual(pipeline.take(3), [30, 40, 50])
+        self.assertEqual(next(pipeline), 60)
+        self.assertEqual(pipeline.take(), [70, 80, 90])
+        self.assertEqual(pipeline.take(), [])
+
+    def test_lazy_view_of_eager_iterator_does_not_consume_it(self):
+        eager = DataIterator([3, 1, 2])
+        self.assertEqual(eager.lazy(chunk_size=2).map(lambda x: -x).take(), [-3, -1, -2])
+        self.assertEqual(eager.take(), [3, 1, 2])
+        self.assertTrue(DataIterator([], lazy=True).is_empty)
+
+
+class TestCompactNumberIterator(unittest.TestCase):
+
+    def test_array_backend_matches_statistics_module(self):
+        rng = random.Random(7)
+        for data in ([rng.randint(-50, 50) for _ in range(1001)], [rng.uniform(-1, 1) for _ in range(1000)]):
+            iterator = DataNumberIterator(iter(data), backend="array")
+
+            self.assertEqual(iterator.sum(), sum(data) if isinstance(data[0], int) else math.fsum(data))
+            self.assertAlmostEqual(iterator.mean(), statistics.mean(data))
+            self.assertEqual(iterator.median(), statistics.median(data))
+            self.assertAlmostEqual(iterator.variance(), statistics.variance(data))
+            self.assertAlmostEqual(iterator.std_dev(), statistics.stdev(data))
+            self.assertEqual(list(iterator), data)
+            self.assertEqual((iterator[3], len(iterator)), (data[3], len(data)))
+            self.assertEqual(iterator._data.typecode, "q" if isinstance(data[0], int) else "d")
+
+    def test_integer_variance_is_exact(self):
+        data = [10 ** 9 + 1, 10 ** 9 + 2, 10 ** 9 + 4]
+        self.assertEqual(DataNumberIterator(data, backend="array").variance(), statistics.variance(data))
+
+    def test_backend_is_inherited_and_validated(self):
+        iterator = DataNumberIterator([1, 2, 3], backend="array", lazy=True).map(lambda value: value * 2)
+        self.assertEqual(iterator.backend, "array")
+        self.assertEqual(iterator.sum(), 12)
+        self.assertEqual(DataNumberIterator([2 ** 64, 1], backend="array").mean(), (2 ** 64 + 1) / 2)
+        with self.assertRaises(ValueError):
+            DataNumberIterator([1], backend="set")
+
+
+def _square(value):
+    return value * value
+
+
+def _is_even(value):
+    return value % 2 == 0
+
+
+class TestParallelDataIterator(unittest.TestCase):
+
+    def test_thread_map_and_filter_keep_order(self):
+        threads = set()
+
+        def tag(value):
+            threads.add(threading.current_thread())
+            time.sleep(0.001 * (value % 3))
+            return value * 2
+
+        data = list(range(200))
+        result = DataIterator(data).map(tag, workers=4).filter(lambda value: value % 3 == 0, workers=4)
+
+        self.assertIsInstance(result, DataIterator)
+        self.assertEqual(list(result), [value * 2 for value in data if value * 2 % 3 == 0])
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertGreater(len(threads), 1)
+
+    def test_process_steps_in_a_lazy_pipeline(self):
+        pipeline = DataIterator(iter(range(10 ** 6)), lazy=True, chunk_size=64)
+        pipeline = pipeline.map(_square, workers=2, executor="process").filter(_is_even, workers=2, executor="process")
+
+        self.assertTrue(pipeline.is_lazy)
+        self.assertEqual(pipeline.take(5), [0, 4, 16, 36, 64])
+        self.assertEqual(DataNumberIterator(range(50)).map(_square, workers=3, executor="process").sum(),
+                         sum(value * value for value in range(50)))
+
+    def test_preprocess_with_workers_matches_serial(self):
+        texts = [f"  Texto {index}, com Acentuação!  " for index in range(100)]
+        serial = DataStringIterator(texts).preprocess(is_destructive=True)
+        parallel = DataStringIterator(texts).preprocess(is_destructive=True, workers=2, executor="process")
+
+        self.assertIsInstance(parallel, DataStringIterator)
+        self.assertEqual(list(parallel), list(serial))
+
+    def test_errors_propagate_and_options_are_validated(self):
+        with self.assertRaises(ZeroDivisionError):
+            DataIterator([1, 0, 2]).map(lambda value: 1 / value, workers=2)
+        with self.assertRaises(ValueError):
+            DataIterator([1]).map(abs, executor="fiber")
+        with self.assertRaises(ValueError):
+            DataIterator([1]).filter(abs, workers=0)
+
+
+class TestStreamingSummary(unittest.TestCase):
+
+    def test_exact_summary_matches_statistics_module(self):
+        rng = random.Random(3)
+        data = [rng.randint(0, 40) for _ in range(2001)] + [rng.random() for _ in range(500)]
+        summary = DataNumberIterator(data).summary(quantiles=(0.25,))
+
+        self.assertEqual(summary["count"], len(data))
+        self.assertEqual(summary["sum"], sum(data))
+        self.assertAlmostEqual(summary["mean"], statistics.mean(data))
+        self.assertAlmostEqual(summary["variance"], statistics.variance(data))
+        self.assertAlmostEqual(summary["std_dev"], statistics.stdev(data))
+        self.assertEqual(summary["median"], statistics.median(data))
+        self.assertEqual(summary["mode"], statistics.mode(data))
+        self.assertEqual((summary["min"], summary["max"]), (min(data), max(data)))
+        self.assertAlmostEqual(summary["quantiles"][0.25], statistics.quantiles(data, n=4, method="inclusive")[0])
+
+    def test_approximate_summary_runs_over_a_stream(self):
+        rng = random.Random(5)
+        data = [rng.gauss(100, 15) for _ in range(50000)]
+        summary = DataIterator(iter(data), lazy=True).float.summary(approximate=True, quantiles=(0.95,))
+
+        self.assertIsNone(summary["mode"])
+        self.assertAlmostEqual(summary["median"], statistics.median(data), delta=0.5)
+        self.assertAlmostEqual(summary["quantiles"][0.95], statistics.quantiles(data, n=20)[-1], delta=0.5)
+        self.assertAlmostEqual(summary["mean"], statistics.mean(data))
+
+    def test_small_and_empty_inputs(self):
+        for data in ([], [4]):
+            with self.assertRaises(statistics.StatisticsError):
+                DataNumberIterator(data).summary()
+        summary = DataNumberIterator([1, 2, 3, 6]).summary()
+        self.assertEqual((summary["mean"], type(summary["mean"])), (3, int))
+        self.assertEqual(DataNumberIterator([1, 2]).summary()["mean"], 1.5)
+        stats = StreamingStats(approximate=True, exact_mode=True)
+        stats.update([3, 1, 2, 2])
+        self.assertEqual((stats.median, stats.mode), (2, 2))
+        self.assertEqual(StreamingStats().summary()["mean"], None)
+        with self.assertRaises(ValueError):
+            stats.quantile(0.9)
+
+    def test_mean_and_integer_variance_are_exact(self):
+        summary = DataNumberIterator([1e16, 1, -1e16, 5]).summary()
+        self.assertEqual(summary["mean"], 1.5)
+        self.assertEqual(summary["sum"], sum([1e16, 1, -1e16, 5]))
+        summary = DataNumberIterator([1, 2, 3]).summary()
+        self.assertEqual((summary["variance"], type(summary["variance"])), (1, int))
+        self.assertEqual((summary["mean"], type(summary["mean"])), (2, int))
+        self.assertEqual(DataNumberIterator([1, 2, 4]).summary()["variance"], statistics.variance([1, 2, 4]))
+        self.assertEqual(DataNumberIterator([0.1] * 10).summary()["mean"], statistics.mean([0.1] * 10))
+        stats = StreamingStats()
+        stats.update([1.0, float("inf")])
+        self.assertEqual(stats.mean, float("inf"))
@@ -0,0 +1,198 @@
+import array
+import itertools
+import math
+import random
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+from unittest import mock
+
+from cereja.array import _array
+from cereja.array import Matrix, determinant, dot, flatten, get_shape, iflatten, inverse, lu_decompose, pack_numbers, solve
+
+
+class PackNumbersTest(unittest.TestCase):
+    def test_typecode_follows_values(self):
+        self.assertEqual(pack_numbers(range(5)), array.array("q", range(5)))
+        self.assertEqual(pack_numbers(iter([1, 2.5])).typecode, "d")
+        self.assertEqual(pack_numbers(x if x != 5000 else 0.5 for x in range(10000)).typecode, "d")
+        self.assertEqual(pack_numbers([2 ** 70, 1]), [2 ** 70, 1])
+        self.assertEqual(pack_numbers([1, 2], backend="list"), [1, 2])
+        with self.assertRaises(TypeError):
+            pack_numbers([1.0, "2"])
+        with self.assertRaises(ValueError):
+            pack_numbers([1], backend="tuple")
+
+
+class FlattenTest(unittest.TestCase):
+    irregular = [[1, 2, 3], [], [[2, [3], 4], 6], "ab", ({"k": 1},)]
+
+    def test_irregular_depths_and_shapes(self):
+        self.assertEqual(flatten(self.irregular), [1, 2, 3, 2, 3, 4, 6, "ab", {"k": 1}])
+        self.assertEqual(flatten(self.irregular, depth=2), [1, 2, 3, 2, [3], 4, 6, "ab", {"k": 1}])
+        self.assertEqual(flatten(self.irregular, depth=0), self.irregular)
+        self.assertEqual(flatten(self.irregular, return_shapes=True)[1],
+                         {0: [5], 1: [3, 0, 2, 1], 2: [3], 3: [1], 4: []})
+        self.assertEqual(flatten([[1, [2]], 3], depth=5, return_shapes=True), ([1, 2, 3], {0: [2], 1: [2], 2: [1], 3: []}))
+
+    def test_regular_shapes(self):
+        data = [[[1, 2], [3, 4]], [[5, 6], [7, 8]]]
+        self.assertEqual(flatten(data, return_shapes=True),
+                         (list(range(1, 9)), {0: [2], 1: [2, 2], 2: [2, 2, 2, 2]}))
+        self.assertEqual(flatten(data, depth=1), [[1, 2], [3, 4], [5, 6], [7, 8]])
+        self.assertEqual(flatten(data, depth=3, return_shapes=True)[1][3], [])
+        self.assertEqual(flatten(Matrix(data)), list(range(1, 9)))
+        self.assertEqual(get_shape(data), (2, 2, 2))
+
+    def test_deep_nesting_does_not_recurse(self):
+        data = [1]
+        for _ in range(5000):
+            data = [data, 2]
+        self.assertEqual(flatten(data), [1] + [2] * 5000)
+        self.assertEqual(sum(1 for _ in iflatten(data)), 5001)
+
+    def test_iflatten_is_lazy(self):
+        stream = iflatten(([value, [value, (value,)]] for value in itertools.count()), depth=2)
+        self.assertEqual(list(itertools.islice(stream, 6)), [0, 0, (0,), 1, 1, (1,)])
+        self.assertEqual(list(iflatten(self.irregular)), flatten(self.irregular))
+        with self.assertRaises(TypeError):
+            iflatten("text")
+
+
+class CompactMatrixTest(unittest.TestCase):
+    values = [[1, 2, 3], [4, 5, 6]]
+
+    def test_matches_list_backend(self):
+        compact, plain = Matrix(self.values, backend="array"), Matrix(self.values)
+
+        self.assertIsInstance(compact._buffer, array.array)
+        self.assertEqual(compact.shape, plain.shape)
+        self.assertEqual(compact.to_list(), self.values)
+        self.assertEqual(list(compact), self.values)
+        self.assertEqual(compact.mean(), plain.mean())
+        self.assertAlmostEqual(compact.std(), plain.std())
+        self.assertEqual(compact.argmax(), plain.argmax())
+        self.assertEqual((compact + plain).to_list(), (plain + plain).to_list())
+        self.assertEqual((compact - 1).to_list(), (plain - 1).to_list())
+        self.assertEqual((compact * 2).to_list(), (plain * 2).to_list())
+        self.assertEqual((compact / compact).to_list(), (plain / plain).to_list())
+        self.assertEqual(compact.sqrt().to_list(), [[math.sqrt(x) for x in row] for row in self.values])
+        self.assertEqual(compact.dot([[1], [1], [1]]).to_list(), [[6], [15]])
+        self.assertEqual(compact[1].to_list(), [4, 5, 6])
+        self.assertEqual((compact[-1][0], compact[0, 2]), (4, 3))
+        self.assertEqual(compact.flatten().to_list(), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(compact.reshape((3, 2)).to_list(), [[1, 2], [3, 4], [5, 6]])
+        self.assertTrue(compact == plain)
+
+    def test_scalar_and_elementwise_operators_match_across_backends(self):
+        compact, plain = Matrix(self.values, backend="array"), Matrix(self.values)
+        for operation in (lambda m: m + 1, lambda m: m * plain, lambda m: m * self.values, lambda m: 2 * m):
+            self.assertEqual(operation(compact).to_list(), operation(plain).to_list())
+        self.assertEqual((plain + 1).to_list(), [[2, 3, 4], [5, 6, 7]])
+        for matrix in (compact, plain):
+            with self.assertRaises(ValueError):
+                matrix * [[1, 2], [3, 4]]
+
+    def test_results_keep_the_backend_and_widen_to_floats(self):
+        result = Matrix(self.values, backend="array") / 2
+        self.assertEqual(result.backend, "array")
+        self.assertEqual(result._buffer.typecode, "d")
+        self.assertEqual(Matrix.arange(4, backend="array").backend, "array")
+
+    def test_invalid_shapes_raise(self):
+        compact = Matrix(self.values, backend="array")
+        with self.assertRaises(ValueError):
+            compact + [[1, 2], [3, 4]]
+        with self.assertRaises(ValueError):
+            compact.reshape((4, 2))
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2], [3]], backend="array")
+        with self.assertRaises(ZeroDivisionError):
+            compact / 0
+
+
+def _fraction_determinant(rows):
+    rows = [[Fraction(value) for value in row] for row in rows]
+    result = Fraction(1)
+    for k in range(len(rows)):
+        pivot = next((i for i in range(k, len(rows)) if rows[i][k]), None)
+        if pivot is None:
+            return 0
+        if pivot != k:
+            rows[k], rows[pivot] = rows[pivot], rows[k]
+            result = -result
+        result *= rows[k][k]
+        for row in rows[k + 1:]:
+            factor = row[k] / rows[k][k]
+            row[:] = [value - factor * pivot_value for value, pivot_value in zip(row, rows[k])]
+    return result
+
+
+class LinearAlgebraTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.integers = [[rng.randint(-9, 9) for _ in range(14)] for _ in range(14)]
+
+    def test_integer_determinant_is_exact(self):
+        result = determinant(self.integers)
+        self.assertIsInstance(result, int)
+        self.assertEqual(result, _fraction_determinant(self.integers))
+        self.assertEqual(determinant([[0, 1], [1, 0]]), -1)
+        self.assertEqual(determinant([[1, 2], [2, 4]]), 0)
+        self.assertEqual(Matrix(self.integers).determinant(), result)
+
+    def test_float_determinant_uses_lu(self):
+        lu, permutation, sign = lu_decompose([[1, 2], [3, 4]])
+        self.assertEqual((permutation, sign), ([1, 0], -1))
+        self.assertAlmostEqual(determinant([[1.5, 2], [3, 4]]), 0.0)
+        self.assertAlmostEqual(determinant([[6.0, 1, 1], [4, -2, 5], [2, 8, 7]]), -306)
+        with self.assertRaises(ValueError):
+            determinant([[1, 2, 3], [4, 5, 6]])
+
+    def test_rational_determinant_is_exact(self):
+        rng = random.Random(5)
+        fractions = [[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(6)] for _ in range(6)]
+        self.assertEqual(determinant(fractions), _fraction_determinant(fractions))
+        self.assertIsInstance(determinant(fractions), Fraction)
+        singular = determinant([[Fraction(1, 2), 1], [1, 2]])
+        self.assertEqual((singular, type(singular)), (Fraction(0), Fraction))
+        self.assertEqual(determinant([[Decimal("1.5"), 2], [3, Decimal("4.1")]]), Decimal("0.15"))
+
+    def test_zero_float_determinant_is_positive_zero(self):
+        for matrix in ([[1.5, 3.0], [1.0, 2.0]], [[0.0, 0.0], [0.0, 1.0]], [[-0.0]]):
+            with self.subTest(matrix=matrix):
+                self.assertEqual(math.copysign(1, determinant(matrix)), 1)
+
+    def test_solve_and_inverse(self):
+        x = solve(self.integers, list(range(14)))
+        for row, expected in zip(self.integers, range(14)):
+            self.assertAlmostEqual(sum(a * b for a, b in zip(row, x)), expected)
+        identity = dot(self.integers, inverse(self.integers))
+        for i, row in enumerate(identity):
+            for j, value in enumerate(row):
+                self.assertAlmostEqual(value, float(i == j))
+        self.assertEqual(Matrix([[2, 1], [1, 3]]).solve([[3], [5]]).shape, (2, 1))
+        with self.assertRaises(ValueError):
+            inverse([[1, 2], [2, 4]])
+        with self.assertRaises(ValueError):
+            solve([[1, 0], [0, 1]], [1, 2, 3])
+
+    def test_dot_is_exact_and_aligned(self):
+        a = [[10 ** 20 + i for i in range(70)] for _ in range(3)]
+        b = [[j - i for j in range(130)] for i in range(70)]
+        expected = [[sum(x * y for x, y in zip(row, col)) for col in zip(*b)] for row in a]
+        self.assertEqual(dot(a, b), expected)
+        self.assertEqual(dot([[1, 2], [3, 4]], [1, 1]), [3, 7])
+        self.assertEqual((Matrix([[1, 2, 3]]) @ Matrix([[1], [2], [3]])).to_list(), [[14]])
+        with self.assertRaises(ValueError):
+            dot([[1, 2]], [[1, 2]])
+
+    def test_small_dot_does_not_flatten_for_numpy(self):
+        with mock.patch.object(_array, "numpy", object()), \
+                mock.patch.object(_array, "flatten", wraps=_array.flatten) as flatten_spy:
+            self.assertEqual(dot([[1, 2], [3, 4]], [[5, 6], [7, 8]]), [[19, 22], [43, 50]])
+        flatten_spy.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import itertools
 import unittest
 from collections import OrderedDict
 
@@ -450,6 +451,21 @@ class UtilsTest(unittest.TestCase):
         for test_value, items_per_batch, expected_error in tests_raise:
             self.assertRaises(expected_error, utils.chunk, test_value, items_per_batch)
 
+    def test_ichunk(self):
+        self.assertEqual(list(utils.ichunk(range(7), batch_size=3, fill_with=0)), [[0, 1, 2], [3, 4, 5], [6, 0, 0]])
+        self.assertEqual(list(utils.ichunk(iter([1, 2, 3, 4]), batch_size=2)), [[1, 2], [3, 4]])
+        self.assertEqual(list(utils.ichunk({"a": 1, "b": 2}, batch_size=1)), [[("a", 1)], [("b", 2)]])
+        self.assertEqual(list(utils.ichunk(itertools.count(), batch_size=2, max_batches=2)), [[0, 1], [2, 3]])
+        self.assertEqual(list(utils.ichunk([], batch_size=2)), [])
+
+        shuffled = list(utils.ichunk(range(50), batch_size=7, shuffle_buffer=10, seed=1))
+        self.assertEqual(shuffled, list(utils.ichunk(range(50), batch_size=7, shuffle_buffer=10, seed=1)))
+        self.assertNotEqual(shuffled, list(utils.ichunk(range(50), batch_size=7)))
+        self.assertEqual(sorted(itertools.chain.from_iterable(shuffled)), list(range(50)))
+
+        for batch_size, shuffle_buffer in ((0, None), ("2", None), (2, 0)):
+            self.assertRaises(ValueError, utils.ichunk, [1, 2], batch_size, shuffle_buffer=shuffle_buffer)
+
     def test_get_batch_strides(self):
         tests = [
             (
@@ -1,20 +1,27 @@
 """
 Tests for cereja.system.commons module.
 
-Covers memory_of_this, memory_usage, and run_on_terminal functions.
+Covers memory_of_this, memory_usage, run_on_terminal and
+run_commands_in_parallel functions.
 """
+import asyncio
 import importlib
 import io
 import logging
 import subprocess
 import sys
+import tempfile
+import time
 import unittest
+from pathlib import Path
 from contextlib import redirect_stdout
 
 import cereja.system.commons as system_commons
 from cereja.system.commons import (
     memory_of_this,
     memory_usage,
+    run_commands_async,
+    run_commands_in_parallel,
     run_on_terminal,
     thread_monitor,
 )
@@ -123,6 +130,91 @@ class TestRunOnTerminal(unittest.TestCase):
         self.assertIsInstance(result, bytes)
 
 
+class TestRunCommandsInParallel(unittest.TestCase):
+    """Tests for run_commands_in_parallel and run_commands_async."""
+
+    def test_returns_exit_codes_and_streams_lines_in_input_order(self):
+        """Each command yields a structured result and its lines reach the callback."""
+        lines = []
+        commands = [
+            f'"{sys.executable}" -c "import sys; print(1); print(2); sys.stderr.write(\'oops\'); sys.exit(3)"',
+            [sys.executable, "-c", "print('ok')"],
+        ]
+
+        results = run_commands_in_parallel(commands, max_workers=2, on_output=lambda *line: lines.append(line))
+
+        self.assertEqual([result.returncode for result in results], [3, 0])
+        self.assertEqual([result.ok for result in results], [False, True])
+        self.assertEqual(results[0].stdout_tail, ("1", "2"))
+        self.assertEqual(results[0].stderr_tail, ("oops",))
+        self.assertEqual(results[1].command, (sys.executable, "-c", "print('ok')"))
+        self.assertEqual(
+            sorted(lines),
+            [(0, "stderr", "oops"), (0, "stdout", "1"), (0, "stdout", "2"), (1, "stdout", "ok")],
+        )
+
+    def test_timeout_kills_command_and_its_children(self):
+        """A command running past the timeout is killed with the shell children holding its pipes."""
+        started = time.perf_counter()
+        results = run_commands_in_parallel(["sleep 10; echo late", "echo fast"], timeout=0.5)
+
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertTrue(results[0].timed_out)
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].stdout_tail, ())
+        self.assertTrue(results[1].ok)
+
+    def test_output_dir_receives_full_output_while_tail_is_bounded(self):
+        """Output files hold every line and results keep only the requested tail."""
+        with tempfile.TemporaryDirectory() as temp:
+            command = [sys.executable, "-c", "for i in range(1000): print(i)"]
+            result, = run_commands_in_parallel([command], output_dir=temp, tail_lines=3)
+
+            self.assertEqual(result.stdout_path, Path(temp, "0.stdout.log"))
+            self.assertEqual(result.stdout_path.read_text().split(), [str(i) for i in range(1000)])
+            self.assertEqual(result.stdout_tail, ("997", "998", "999"))
+
+    def test_async_runner_limits_concurrency_and_reports_start_errors(self):
+        """No more than max_workers commands run at once; missing executables become error results."""
+        commands = [[sys.executable, "-c", "import time; time.sleep(0.2)"]] * 4 + [["/nonexistent/command"]]
+        finished = []
+
+        started = time.perf_counter()
+        results = asyncio.run(run_commands_async(commands, max_workers=2, on_result=finished.append))
+
+        self.assertGreaterEqual(time.perf_counter() - started, 0.4)
+        self.assertEqual(len(finished), 5)
+        self.assertIsNone(results[-1].returncode)
+        self.assertIsNotNone(results[-1].error)
+        with self.assertRaises(ValueError):
+            run_commands_in_parallel(["echo"], max_workers=0)
+
+    def test_blocking_runner_works_inside_a_running_event_loop(self):
+        """The blocking form can be called from async code, as in Jupyter."""
+
+        async def call_from_loop():
+            return run_commands_in_parallel([[sys.executable, "-c", "print('inside')"]])
+
+        result, = asyncio.run(call_from_loop())
+        self.assertTrue(result.ok)
+        self.assertEqual(result.stdout_tail, ("inside",))
+
+    def test_cancelled_command_waits_for_its_stream_pumps(self):
+        """Cancelling a running command kills it and leaves no pump task behind."""
+
+        async def cancel_running_command():
+            task = asyncio.ensure_future(run_commands_async([[sys.executable, "-c", "import time; time.sleep(10)"]]))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return [other for other in asyncio.all_tasks() if other is not asyncio.current_task()]
+
+        started = time.perf_counter()
+        self.assertEqual(asyncio.run(cancel_running_command()), [])
+        self.assertLess(time.perf_counter() - started, 5)
+
+
 class TestModuleDiagnostics(unittest.TestCase):
     """Tests for logging ownership and thread diagnostics."""
 